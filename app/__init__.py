@@ -18,12 +18,13 @@ def create_app(config_object="config.DevConfig"):
     with app.app_context():
         from . import models  # noqa: F401
         from .models import User  # para o user_loader
+        from .services import reference_data  # noqa: F401  (hooks de invalidação do cache)
 
     @login_manager.user_loader
     def load_user(user_id):
         return User.query.get(int(user_id))
 
-    login_manager.login_view = "auth.login"
+    login_manager.login_view = "auth_local.login"
     login_manager.login_message = "Por favor, faça login para acessar a página."
 
     # Importa e registra blueprints APÓS inicializar extensões e carregar models
@@ -39,6 +40,7 @@ def create_app(config_object="config.DevConfig"):
     from .blueprints.stakeholders import bp_stakeholders
     from .blueprints.activities.routes import bp_activities
     from .blueprints.oc_api.routes import bp_oc
+    from .blueprints.lookup.routes import bp_lookup
     from app.blueprints.auth.routes import auth_local_bp
     from app.blueprints.auth_oidc.routes import bp_auth_oidc
 
@@ -53,9 +55,13 @@ def create_app(config_object="config.DevConfig"):
     app.register_blueprint(main_bp, url_prefix="/")
     app.register_blueprint(bp_activities)
     app.register_blueprint(bp_oc)
+    app.register_blueprint(bp_lookup)
     app.register_blueprint(auth_local_bp)
     app.register_blueprint(bp_auth_oidc)
 
+    from .cli import register_cli
+    register_cli(app)
+
     try:
         start_oc_callback_bridge(host="127.0.0.1", port=9090)
     except Exception as e:
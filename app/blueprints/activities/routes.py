@@ -1,28 +1,29 @@
 # app/blueprints/activities/routes.py
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required
-from sqlalchemy.orm import selectinload
 from datetime import datetime
 from app.extensions import db
 from app.forms import projects
 from app.forms import activities
-from app.models import Activity, Project, User, Client, Dealer, Equipment, Status
+from app.models import Activity, Equipment
 from app.forms.activities import ActivityForm
+from app.services.list_rows import activity_rows
+from app.services.pagination import keyset_paginate
+from app.services.reference_data import choices, rows as ref_rows
+from app.services.search import full_text
+from app.utils.streaming import stream_page
+from app.utils.http_cache import conditional
 
 bp_activities = Blueprint('activities', __name__, url_prefix='/atividades')
 
 def _fill_choices(form: ActivityForm):
-    form.project_id.choices = [(p.id, p.name) for p in db.session.query(Project).order_by(Project.name.asc()).all()]
-    form.owner_user_id.choices = [(u.id, u.full_name) for u in db.session.query(User).order_by(User.full_name.asc()).all()]
-    form.executor_user_id.choices = [(u.id, u.full_name) for u in db.session.query(User).order_by(User.full_name.asc()).all()]
-    form.client_id.choices = [(0, '— Selecione —')] + [(c.id, c.name) for c in db.session.query(Client).order_by(Client.nome_razao.asc()).all()]
-    form.dealer_id.choices = [(0, '— Selecione —')] + [(d.id, d.razao_social) for d in db.session.query(Dealer).order_by(Dealer.razao_social.asc()).all()]
-    form.equipment_ids.choices = [(e.id, e.name) for e in db.session.query(Equipment).order_by(Equipment.name.asc()).all()]
-    form.status_id.choices = [(s.id, s.nome) for s in db.session.query(Status).order_by(Status.nome.asc()).all()]
+    # Projeto, usuários, cliente, concessionário e equipamentos: typeahead (forms.fields)
+    form.status_id.choices = choices('statuses')
 
 
 @bp_activities.route('/')
 @login_required
+@conditional('activities', 'clients', 'dealers', 'users', 'projects', 'statuses')
 def list():
     q = (request.args.get('q') or '').strip()
     project_id = request.args.get('project_id', type=int)
@@ -31,18 +32,9 @@ def list():
     owner_id    = request.args.get('owner_id', type=int)
     executor_id = request.args.get('executor_id', type=int)
 
-    query = db.session.query(Activity).options(
-        selectinload(Activity.project),
-        selectinload(Activity.owner_user),
-        selectinload(Activity.executor_user),
-        selectinload(Activity.client),
-        selectinload(Activity.dealer),
-        selectinload(Activity.status),
-        selectinload(Activity.equipments),
-    )
+    # Só as colunas exibidas, com os nomes das associações via JOIN
+    query = activity_rows()
 
-    if q:
-        query = query.filter(Activity.description.ilike(f'%{q}%'))
     if project_id:
         query = query.filter(Activity.project_id == project_id)
     if status_id:
@@ -55,15 +47,16 @@ def list():
         query = query.filter(Activity.executor_user_id == executor_id)
 
 
-    activities = query.order_by(Activity.start_date.desc(), Activity.created_at.desc()).all()
+    query, order = full_text(query, Activity, q, [(Activity.start_date, True), (Activity.created_at, True)])
+    activities = keyset_paginate(query, order, Activity.id)
 
     # filtros (dropdowns)
-    projects = db.session.query(Project).order_by(Project.name.asc()).all()
-    statuses = db.session.query(Status).order_by(Status.nome.asc()).all()
-    owners    = db.session.query(User).order_by(User.full_name.asc()).all()
+    projects = ref_rows('projects')
+    statuses = ref_rows('statuses')
+    owners    = ref_rows('users')
     executors = owners  # mesma lista de usuário
 
-    return render_template(
+    return stream_page(
         'activities/list.html',
         activities=activities,
         q=q, project_id=project_id, status_id=status_id, environment=environment,
@@ -1,10 +1,13 @@
 
 # app/blueprints/auth/routes.py
+from urllib.parse import urlsplit
+
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, login_required, current_user
+from sqlalchemy import func
 from ...extensions import db
 from ...models import User
-from ...forms.auth import RegisterForm, LoginForm
+from ...forms.auth import RegisterForm, LoginForm, ResetPasswordForm
 
 # NOME ÚNICO DO BLUEPRINT: "auth_local"
 auth_local_bp = Blueprint("auth_local", __name__)
@@ -15,7 +18,7 @@ def register():
         return redirect(url_for("main.index"))
     form = RegisterForm()
     if form.validate_on_submit():
-        if User.query.filter_by(email=form.email.data.lower()).first():
+        if User.query.filter(func.lower(User.email) == form.email.data.lower().strip()).first():
             flash("E-mail já cadastrado.", "error")
         else:
             user = User(
@@ -36,20 +39,35 @@ def login():
         return redirect(url_for("main.index"))
     form = LoginForm()
     if form.validate_on_submit():
-        user = User.query.filter_by(email=form.email.data.lower()).first()
+        user = User.query.filter(func.lower(User.email) == form.email.data.lower().strip()).first()
         if user and user.check_password(form.password.data):
             login_user(user, remember=form.remember.data)
+            next_page = _next_page()
+            if user.must_reset_password:
+                flash("Defina uma nova senha para continuar.", "info")
+                return redirect(url_for("auth_local.reset_password_confirm", next=next_page))
             flash("Bem-vindo!", "success")
-            next_page = request.args.get("next") or url_for("main.index")
-            # 2ª etapa: iniciar login Deere/Okta (OIDC) e voltar para 'next'
-            try:
-                return redirect(url_for("auth_oidc.login", next=next_page))
-            except Exception:
-                # Fallback se o blueprint OIDC ainda não estiver registrado
-                return redirect(next_page)
+            return _second_step(next_page)
         flash("Credenciais Inválidas.", "error")
     return render_template("auth/login.html", form=form)
 
+def _next_page():
+    # Só caminhos deste site: 'next' vem da querystring (evita redirecionamento aberto)
+    target = (request.args.get("next") or "").strip()
+    parts = urlsplit(target)
+    if (not target.startswith("/") or target.startswith("//") or "\\" in target
+            or parts.scheme or parts.netloc):
+        return url_for("main.index")
+    return target
+
+def _second_step(next_page):
+    # 2ª etapa: iniciar login Deere/Okta (OIDC) e voltar para 'next'
+    try:
+        return redirect(url_for("auth_oidc.login", next=next_page))
+    except Exception:
+        # Fallback se o blueprint OIDC ainda não estiver registrado
+        return redirect(next_page)
+
 @auth_local_bp.route("/logout")
 @login_required
 def logout():
@@ -57,6 +75,34 @@ def logout():
     flash("Sessão encerrada.", "info")
     return redirect(url_for("auth_local.login"))
 
+@auth_local_bp.route("/reset_password/nova", methods=["GET", "POST"])
+@login_required
+def reset_password_confirm():
+    form = ResetPasswordForm()
+    if form.validate_on_submit():
+        if current_user.check_password(form.password.data):
+            flash("A nova senha deve ser diferente da atual.", "warning")
+            return render_template("auth/reset_password_confirm.html", form=form)
+        current_user.set_password(form.password.data)
+        db.session.commit()
+        flash("Senha atualizada.", "success")
+        return _second_step(_next_page())
+    return render_template("auth/reset_password_confirm.html", form=form)
+
+
+# Enquanto a senha provisória não for trocada, só a troca e o logout ficam acessíveis
+_RESET_ALLOWED_ENDPOINTS = {"auth_local.reset_password_confirm", "auth_local.logout", "static"}
+
+
+@auth_local_bp.before_app_request
+def _require_password_reset():
+    if (current_user.is_authenticated and current_user.must_reset_password
+            and request.endpoint not in _RESET_ALLOWED_ENDPOINTS):
+        # Guarda a página pedida para voltar a ela depois da troca
+        next_page = request.full_path.rstrip("?") if request.method == "GET" else None
+        return redirect(url_for("auth_local.reset_password_confirm", next=next_page))
+
+
 @auth_local_bp.route("/reset_password", methods=["GET", "POST"])
 def reset_password():
     # Lógica de redefinição de senha (se aplicável)
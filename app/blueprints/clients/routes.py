@@ -1,25 +1,36 @@
+import os
 from flask import Blueprint, jsonify, render_template, redirect, url_for, flash, request
-from flask_login import login_required
+from flask_login import login_required, current_user
 from ...extensions import db
 from ...models import Client
 from ...forms.clients import ClientForm, DeleteClientForm
+from ...services.import_jobs import get_job_or_404, submit_import
+from ...services.inventory_import import spool_upload
+from ...services.list_rows import client_rows
+from ...services.pagination import keyset_paginate
+from ...services.tabular import ACCEPTED_SUFFIXES, file_suffix
+from ...utils.text import name_key
+from ...utils.streaming import stream_page
+from ...utils.http_cache import conditional
 
 clients_bp = Blueprint("clients", __name__)
 
 @clients_bp.route("/", methods=["GET"], endpoint="list")
 @login_required
+@conditional("clients")
 def list_():
     q = request.args.get("q", "").strip()
-    query = Client.query
+    query = client_rows()
     if q:
-        query = query.filter(Client.nome_razao.ilike(f"%{q}%"))
-    clients = query.order_by(Client.created_at.desc()).all()
-    delete_forms = {c.id: DeleteClientForm() for c in clients}
-    return render_template("clients/list.html", clients=clients, q=q, delete_forms=delete_forms)
+        # "sao joao" acha "São João": compara com a coluna normalizada
+        query = query.filter(Client.nome_razao_norm.contains(name_key(q), autoescape=True))
+    clients = keyset_paginate(query, [(Client.created_at, True)], Client.id)
+    return stream_page("clients/list.html", clients=clients, q=q)
 
 
 @clients_bp.get('/<int:id>/org')
 @login_required
+@conditional("clients")
 def client_org(id):
     c = db.session.query(Client).get_or_404(id)
     return jsonify({'org_id': c.org_id or ''})
@@ -86,3 +97,30 @@ def delete_(client_id):
     else:
         flash("Não foi possível excluir o cliente (falha de validação).", "danger")
     return redirect(url_for("clients.list"))
+
+
+@clients_bp.route("/importar", methods=["GET", "POST"], endpoint="import_")
+@login_required
+def import_():
+    if request.method == "POST":
+        file = request.files.get("file")
+        suffix = file_suffix(file.filename) if file else ""
+        if suffix not in ACCEPTED_SUFFIXES:
+            flash("Selecione um arquivo .xlsx, .csv ou .tsv", "error")
+            return redirect(request.url)
+        path = spool_upload(file, suffix=suffix)
+        try:
+            job = submit_import(path, file.filename, user_id=current_user.id, kind="clients")
+        except Exception as e:
+            os.remove(path)
+            db.session.rollback()
+            flash(f"Falha ao importar: {e}", "error")
+            return redirect(request.url)
+        return redirect(url_for("clients.import_", job=job.id))
+    return render_template("clients/import.html", job_id=request.args.get("job"))
+
+
+@clients_bp.get("/importar/jobs/<job_id>", endpoint="import_status")
+@login_required
+def import_status(job_id):
+    return jsonify(get_job_or_404(job_id).to_dict())
@@ -3,19 +3,23 @@ from flask_login import login_required
 from ...extensions import db
 from ...models import Dealer
 from ...forms.dealers import DealerForm, DeleteDealerForm
+from ...services.list_rows import dealer_rows
+from ...services.pagination import keyset_paginate
+from ...utils.streaming import stream_page
+from ...utils.http_cache import conditional
 
 dealers_bp = Blueprint("dealers", __name__)
 
 @dealers_bp.route("/", methods=["GET"])
 @login_required
+@conditional("dealers")
 def list_():
     q = request.args.get("q", "").strip()
-    query = Dealer.query
+    query = dealer_rows()
     if q:
         query = query.filter(Dealer.razao_social.ilike(f"%{q}%"))
-    dealers = query.order_by(Dealer.created_at.desc()).all()
-    delete_forms = {d.id: DeleteDealerForm() for d in dealers}
-    return render_template("dealers/list.html", dealers=dealers, q=q, delete_forms=delete_forms)
+    dealers = keyset_paginate(query, [(Dealer.created_at, True)], Dealer.id)
+    return stream_page("dealers/list.html", dealers=dealers, q=q)
 
 
 @dealers_bp.route("/novo", methods=["GET", "POST"])
@@ -4,19 +4,23 @@ from app.extensions import db
 from app.forms.functional_areas import FunctionalAreaDeleteForm
 from app.models import FunctionalArea
 from app.forms import FunctionalAreaForm
+from app.services.list_rows import functional_area_rows
+from app.services.pagination import keyset_paginate
+from app.utils.streaming import stream_page
+from app.utils.http_cache import conditional
 from . import bp_functional_areas   
 
 
 @bp_functional_areas.route('/')
 @login_required
+@conditional('functional_areas')
 def list():
     q = request.args.get('q', '').strip()
-    query = FunctionalArea.query
+    query = functional_area_rows()
     if q:
         query = query.filter(FunctionalArea.name.ilike(f'%{q}%'))
-    areas = query.order_by(FunctionalArea.name.asc()).all()
-    delete_forms = {a.id: FunctionalAreaDeleteForm() for a in areas}
-    return render_template('functional_areas/list.html', areas=areas, q=q, delete_forms=delete_forms)
+    areas = keyset_paginate(query, [(FunctionalArea.name, False)], FunctionalArea.id)
+    return stream_page('functional_areas/list.html', areas=areas, q=q)
 
 
 @bp_functional_areas.route('/new', methods=['GET', 'POST'])
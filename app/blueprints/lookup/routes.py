@@ -0,0 +1,21 @@
+# app/blueprints/lookup/routes.py
+from flask import Blueprint, abort, jsonify, request
+from flask_login import login_required
+
+from app.services import typeahead
+
+bp_lookup = Blueprint("lookup", __name__, url_prefix="/api/busca")
+
+
+@bp_lookup.get("/<kind>")
+@login_required
+def search(kind):
+    """Typeahead dos selects: ``?q=`` (prefixo), ``limit=`` e ``after=`` (cursor da próxima página)."""
+    source = typeahead.SOURCES.get(kind)
+    if source is None:
+        abort(404)
+    page = typeahead.search(kind, request.args.get("q", ""), request.args.get("limit", type=int))
+    return jsonify({
+        "items": [{"id": row.id, "label": source.label(row)} for row in page],
+        "next": page.next_cursor,
+    })
@@ -1,14 +1,11 @@
 from flask import Blueprint, render_template
-from ...models import Client, Dealer, Equipment, Project
+from flask_login import login_required
+from ...services.metrics import dashboard
 
 main_bp = Blueprint("main", __name__)
 
 @main_bp.route("/")
+@login_required
 def index():
-    metrics = {
-        'clients': Client.query.count(),
-        'dealers': Dealer.query.count(),
-        'equipments': Equipment.query.count(),
-        'projects': Project.query.count(),
-    }
-    return render_template("home.html", **metrics)
+    # Um comando só, em cache até a próxima escrita nas tabelas envolvidas
+    return render_template("home.html", metrics=dashboard())
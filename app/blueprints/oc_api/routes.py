@@ -1,14 +1,12 @@
-
 # app/blueprints/oc_api/routes.py
-from flask import Blueprint, request, jsonify, session, current_app, url_for
+import json
+from flask import Blueprint, Response, request, jsonify, session, current_app, url_for
 from flask_login import login_required
-from app.services.operations_center import OperationsCenterClient
+from app.services.operations_center import CircuitOpenError, OperationsCenterClient
+from app.utils.streaming import buffered
 
 bp_oc = Blueprint("oc", __name__, url_prefix="/api/oc")
 
-# Instância da API (vai ser hidratada com tokens do session em cada requisição)
-oc_client = OperationsCenterClient()
-
 
 @bp_oc.get("/machines")
 @login_required
@@ -25,12 +23,24 @@ def machines():
         # Ainda não autenticado no Operations Center → forçar 2ª etapa (Okta/Deere)
         return jsonify({"error": "not_authorized"}), 401
 
+    # Uma instância por requisição: a resposta é gerada depois que a view
+    # retorna, e os tokens não podem ser trocados por outra requisição no meio
+    # (a sessão HTTP/pool de conexões é compartilhada no módulo)
+    oc_client = OperationsCenterClient()
     oc_client.access_token = access
     oc_client.refresh_token = refresh
 
+    items = oc_client.get_machines_by_org(org_id)
     try:
-        items = oc_client.get_machines_by_org(org_id)
-        return jsonify({"values": items}), 200
+        # A 1ª página é pedida aqui: erro de token/API ainda vira 401/502/503
+        first = next(items, None)
+
+    except CircuitOpenError as e:
+        # Upstream instável/limitando: falha rápida, sem chamar a API
+        resp = jsonify({"error": "oc_api_unavailable", "detail": str(e)})
+        resp.status_code = 503
+        resp.headers["Retry-After"] = str(max(1, int(e.retry_after)))
+        return resp
 
     except RuntimeError as e:
         # Tipicamente token ausente/expirado/refresh falhou
@@ -40,3 +50,22 @@ def machines():
         # Erros de rede/OC API → log e 502
         current_app.logger.exception("Erro ao consultar máquinas (org_id=%s)", org_id)
         return jsonify({"error": "oc_api_error", "detail": str(e)}), 502
+
+    # Demais páginas em streaming: {"values": [...]} sai conforme chegam,
+    # sem a lista inteira em memória
+    return Response(buffered(_values(first, items, org_id, current_app.logger)), mimetype="application/json")
+
+
+def _values(first, items, org_id, logger):
+    yield '{"values": ['
+    if first is not None:
+        yield json.dumps(first)
+        try:
+            for item in items:
+                yield "," + json.dumps(item)
+        except Exception as e:
+            # Status 200 já enviado: o erro vai no corpo, junto das máquinas já listadas
+            logger.exception("Erro ao paginar máquinas (org_id=%s)", org_id)
+            yield '], "error": "oc_api_error", "detail": %s}' % json.dumps(str(e))
+            return
+    yield "]}"
@@ -1,26 +1,31 @@
 from flask import render_template, redirect, url_for, flash, request
 from flask_login import login_required
 from app.extensions import db
-from app.models import Position, FunctionalArea
+from app.models import Position
 from app.forms import PositionForm
+from app.services.list_rows import position_rows
+from app.services.pagination import keyset_paginate
+from app.services.reference_data import choices
+from app.utils.streaming import stream_page
+from app.utils.http_cache import conditional
 from . import bp_positions
 
 def _fill_area_choices(form):
-    form.functional_area_id.choices = [(a.id, a.name) for a in FunctionalArea.query.order_by(FunctionalArea.name.asc()).all()]
+    form.functional_area_id.choices = choices('functional_areas')
 
 @bp_positions.route('/')
 @login_required
+@conditional('positions', 'functional_areas')
 def list():
     q = request.args.get('q', '').strip()
     area_id = request.args.get('area_id', type=int)
-    query = Position.query
+    query = position_rows()
     if q:
         query = query.filter(Position.name.ilike(f'%{q}%'))
     if area_id:
         query = query.filter(Position.functional_area_id == area_id)
-    positions = query.order_by(Position.name.asc()).all()
-    areas = FunctionalArea.query.order_by(FunctionalArea.name.asc()).all()
-    return render_template('positions/list.html', positions=positions, areas=areas, q=q, area_id=area_id)
+    positions = keyset_paginate(query, [(Position.name, False)], Position.id)
+    return stream_page('positions/list.html', positions=positions, q=q, area_id=area_id)
 
 @bp_positions.route('/new', methods=['GET', 'POST'])
 @login_required
@@ -1,45 +1,29 @@
 # app/blueprints/projects/routes.py
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required
+from sqlalchemy import func
 from ...extensions import db
-from ...models import Project, Status  # NOVO: importar Status
+from ...models import Project
 from ...forms.projects import ProjectForm, DeleteProjectForm
+from ...services.list_rows import project_rows
+from ...services.pagination import keyset_paginate
+from ...services.statuses import status_choices
+from ...utils.streaming import stream_page
+from ...utils.http_cache import conditional
 
 projects_bp = Blueprint("projects", __name__)  # assumindo url_prefix no register_blueprint
 
-# Helper: filtra status marcados para "Projetos" e retorna choices [(id, nome), ...]
-def _project_status_choices():
-    PROJECT_TAGS = ("projeto", "projetos")  # termos aceitos (case-insensitive)
-    statuses = Status.query.order_by(Status.nome.asc()).all()
-
-    def is_for_projects(s):
-        # Trata 'tipos_cadastro' como lista/array OU string, e 'tipo_cadastro' (singular) como string
-        candidates = []
-        if hasattr(s, "tipos_cadastro") and s.tipos_cadastro:
-            if isinstance(s.tipos_cadastro, (list, tuple, set)):
-                candidates = [str(x).strip().lower() for x in s.tipos_cadastro]
-            else:
-                candidates = [str(s.tipos_cadastro).lower()]
-        elif hasattr(s, "tipo_cadastro") and s.tipo_cadastro:
-            candidates = [str(s.tipo_cadastro).lower()]
-        # Critério: contém algum dos termos "projeto"/"projetos"
-        return any(any(tag in c for tag in PROJECT_TAGS) for c in candidates)
-
-    filtered = [s for s in statuses if is_for_projects(s)]
-    # 0 = opção neutra ("Selecione..."); manter coerção para int no form
-    return [(0, "— Selecione —")] + [(s.id, s.nome) for s in filtered]
-
 
 @projects_bp.route("/", methods=["GET"])
 @login_required
+@conditional("projects")
 def list_():
     q = request.args.get("q", "").strip()
-    query = Project.query
+    query = project_rows()
     if q:
         query = query.filter(Project.name.ilike(f"%{q}%"))
-    projects = query.order_by(Project.name.asc()).all()
-    delete_forms = {p.id: DeleteProjectForm() for p in projects}
-    return render_template("projects/list.html", projects=projects, delete_forms=delete_forms)
+    projects = keyset_paginate(query, [(Project.name, False)], Project.id)
+    return stream_page("projects/list.html", projects=projects)
 
 
 @projects_bp.route("/novo", methods=["GET", "POST"])
@@ -47,7 +31,7 @@ def list_():
 def create():
     form = ProjectForm()
     # Preencher choices SEMPRE antes de validar/renderizar
-    form.status_id.choices = _project_status_choices()
+    form.status_id.choices = status_choices("projetos")
 
     if form.validate_on_submit():
         name = (form.name.data or "").strip()
@@ -56,7 +40,7 @@ def create():
             return render_template("projects/form.html", form=form, mode="create")
 
         # Duplicidade por nome
-        if Project.query.filter(Project.name.ilike(name)).first():
+        if Project.query.filter(func.lower(Project.name) == name.lower()).first():
             flash("Já existe um projeto com esse nome.", "warning")
             return render_template("projects/form.html", form=form, mode="create")
 
@@ -82,7 +66,7 @@ def edit(project_id):
     p = Project.query.get_or_404(project_id)
     form = ProjectForm(obj=p)
     # Preencher choices ANTES de validar
-    form.status_id.choices = _project_status_choices()
+    form.status_id.choices = status_choices("projetos", p.status_id)
 
     # Ajustar seleção atual na tela (GET): se None, usar 0
     if request.method == "GET":
@@ -94,7 +78,7 @@ def edit(project_id):
             flash("O nome do projeto é obrigatório.", "warning")
             return render_template("projects/form.html", form=form, mode="edit", project=p)
 
-        dup = Project.query.filter(Project.id != p.id, Project.name.ilike(name)).first()
+        dup = Project.query.filter(Project.id != p.id, func.lower(Project.name) == name.lower()).first()
         if dup:
             flash("Já existe outro projeto com esse nome.", "warning")
             return render_template("projects/form.html", form=form, mode="edit", project=p)
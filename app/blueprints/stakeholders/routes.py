@@ -1,27 +1,30 @@
 
 # app/blueprints/stakeholders/routes.py
-from flask import render_template, redirect, url_for, flash, request
-from flask_login import login_required
-from sqlalchemy.orm import selectinload
+import os
+from flask import render_template, redirect, url_for, flash, request, jsonify
+from flask_login import login_required, current_user
 from app.extensions import db
-from app.models import Stakeholder, Client, Position
-from app.forms.stakeholders import StakeholderForm, DeleteStakeholderForm
+from app.models import Stakeholder
+from app.forms.stakeholders import StakeholderForm
+from app.services.import_jobs import get_job_or_404, submit_import
+from app.services.inventory_import import spool_upload
+from app.services.list_rows import stakeholder_rows
+from app.services.pagination import keyset_paginate
+from app.services.reference_data import choices, rows as ref_rows
+from app.services.tabular import ACCEPTED_SUFFIXES, file_suffix
+from app.utils.text import name_key
+from app.utils.streaming import stream_page
+from app.utils.http_cache import conditional
 from . import bp_stakeholders
 
 # Mantém o helper já existente
 def _fill_choices(form):
-    # Ordene pelo nome real de banco (nome_razao), não pela property 'name'
-    clients = Client.query.order_by(Client.nome_razao.asc()).all()
-    positions = Position.query.order_by(Position.name.asc()).all()
-    form.client_id.choices = [(0, '— Selecione —')] + [(c.id, c.name) for c in clients]
-    form.position_id.choices = [
-        (0, '— Selecione —')
-    ] + [
-        (p.id, f'{p.name} ({p.functional_area.name})') for p in positions
-    ]
+    # Cliente: typeahead (forms.fields); cargos da lista em cache (services.reference_data)
+    form.position_id.choices = choices('positions', empty=True)
 
 @bp_stakeholders.route('/')
 @login_required
+@conditional('stakeholders', 'clients', 'positions', 'functional_areas')
 def list():
     # Filtros da querystring
     q      = (request.args.get('q') or '').strip()
@@ -30,17 +33,12 @@ def list():
     client_id   = request.args.get('client_id', type=int)
     position_id = request.args.get('position_id', type=int)
 
-    # Query base + eager load para evitar N+1
-    query = (
-        Stakeholder.query.options(
-            selectinload(Stakeholder.client),
-            selectinload(Stakeholder.position).selectinload(Position.functional_area)
-        )
-    )
+    # Query base: colunas exibidas + nomes de cliente/cargo/área via JOIN (sem N+1)
+    query = stakeholder_rows()
 
     # Texto (nome)
     if q:
-        query = query.filter(Stakeholder.name.ilike(f'%{q}%'))
+        query = query.filter(Stakeholder.name_norm.contains(name_key(q), autoescape=True))
 
     # Tipo
     if tipo in ('INTERNO', 'EXTERNO'):
@@ -53,16 +51,14 @@ def list():
     if tipo == 'INTERNO' and position_id:
         query = query.filter(Stakeholder.position_id == position_id)
 
-    stakeholders = query.order_by(Stakeholder.created_at.desc()).all()
+    stakeholders = keyset_paginate(query, [(Stakeholder.created_at, True)], Stakeholder.id)
 
     # Combos da listagem (para preencher os filtros)
-    clients   = Client.query.order_by(Client.nome_razao.asc()).all()
-    positions = Position.query.order_by(Position.name.asc()).all()
+    clients   = ref_rows('clients')
+    positions = ref_rows('positions')
 
-    # Deleção por linha (já estava ok)
-    delete_forms = {s.id: DeleteStakeholderForm() for s in stakeholders}
-
-    return render_template(
+    # Deleção por linha: um único token CSRF na página (template)
+    return stream_page(
         'stakeholders/list.html',
         stakeholders=stakeholders,
         q=q,
@@ -71,7 +67,6 @@ def list():
         position_id=position_id,
         clients=clients,
         positions=positions,
-        delete_forms=delete_forms,
     )
 
 
@@ -189,3 +184,30 @@ def delete(id):
         db.session.rollback()
         flash(f'Erro ao remover: {e}', 'danger')
     return redirect(url_for('stakeholders.list'))
+
+
+@bp_stakeholders.route('/importar', methods=['GET', 'POST'])
+@login_required
+def import_():
+    if request.method == 'POST':
+        file = request.files.get('file')
+        suffix = file_suffix(file.filename) if file else ''
+        if suffix not in ACCEPTED_SUFFIXES:
+            flash('Selecione um arquivo .xlsx, .csv ou .tsv', 'error')
+            return redirect(request.url)
+        path = spool_upload(file, suffix=suffix)
+        try:
+            job = submit_import(path, file.filename, user_id=current_user.id, kind='stakeholders')
+        except Exception as e:
+            os.remove(path)
+            db.session.rollback()
+            flash(f'Falha ao importar: {e}', 'danger')
+            return redirect(request.url)
+        return redirect(url_for('stakeholders.import_', job=job.id))
+    return render_template('stakeholders/import.html', job_id=request.args.get('job'))
+
+
+@bp_stakeholders.get('/importar/jobs/<job_id>')
+@login_required
+def import_status(job_id):
+    return jsonify(get_job_or_404(job_id).to_dict())
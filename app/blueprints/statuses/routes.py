@@ -1,28 +1,25 @@
 # app/blueprints/statuses/routes.py
-from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app
+from flask import Blueprint, abort, jsonify, render_template, redirect, url_for, flash, request, current_app
 from flask_login import login_required
 from sqlalchemy import or_
 from ...extensions import db
-from ...models import Status
+from ...models import STATUS_TARGETS, Status
 from ...forms.statuses import StatusForm, DeleteStatusForm, STATUS_TARGET_CHOICES
+from ...services.list_rows import status_rows
+from ...services.pagination import keyset_paginate
+from ...services.statuses import active_statuses, targets_by_status
+from ...utils.streaming import stream_page
+from ...utils.http_cache import conditional
 
 # Assumindo url_prefix='/statuses' ao registrar o blueprint na factory
 statuses_bp = Blueprint("statuses", __name__)
 
-def _csv_to_list(csv_value: str) -> list[str]:
-    if not csv_value:
-        return []
-    return [v for v in csv_value.split(",") if v]
-
-def _list_to_csv(values: list[str]) -> str:
-    # normaliza, remove duplicados, ordena por consistência
-    return ",".join(sorted(set(values or [])))
-
 @statuses_bp.route("/", methods=["GET"])
 @login_required
+@conditional("statuses", "status_applicability")
 def list_():
     q = (request.args.get("q") or "").strip()
-    query = Status.query
+    query = status_rows()
 
     if q:
         like = f"%{q}%"
@@ -33,28 +30,31 @@ def list_():
             clauses.append(Status.descricao.ilike(like))
         query = query.filter(or_(*clauses))
 
-    # ordenação: created_at desc (se existir) senão id desc
-    order_col = getattr(Status, "created_at", getattr(Status, "id", None))
-    if order_col is not None:
-        query = query.order_by(order_col.desc())
-
-    items = query.all()
-
-    # forms de delete por linha (CSRF)
-    delete_forms = {s.id: DeleteStatusForm() for s in items}
+    # ordenação: created_at desc, paginada por cursor
+    items = keyset_paginate(query, [(Status.created_at, True)], Status.id)
 
     # Mapeamento para exibição das tags de "tipo de cadastro"
     label_map = dict(STATUS_TARGET_CHOICES)
+    tipos = targets_by_status(s.id for s in items)
 
-    return render_template(
+    # delete por linha: um único token CSRF na página (template)
+    return stream_page(
         "statuses/list.html",
         statuses=items,
         q=q,
-        delete_forms=delete_forms,
         tipos_label_map=label_map,
-        csv_to_list=_csv_to_list,
+        tipos=tipos,
     )
 
+
+@statuses_bp.get("/ativos/<target>")
+@login_required
+def active(target):
+    """Status ativos aplicáveis a um cadastro (equipamentos, projetos, feedbacks)."""
+    if target not in STATUS_TARGETS:
+        abort(404)
+    return jsonify([{"id": s.id, "nome": s.nome, "cor": s.cor} for s in active_statuses(target)])
+
 @statuses_bp.route("/novo", methods=["GET", "POST"])
 @login_required
 def create():
@@ -79,9 +79,8 @@ def create():
         if hasattr(Status, "cor"):
             s.cor = (form.cor.data or "").strip() or None
 
-        # salvar tipos de cadastro (como CSV)
-        if hasattr(Status, "tipos_cadastro"):
-            s.tipos_cadastro = _list_to_csv(form.tipos_cadastro.data)
+        # tipos de cadastro (linhas em status_applicability)
+        s.tipos_cadastro = form.tipos_cadastro.data
 
         # ativo/is_active
         if hasattr(Status, "ativo"):
@@ -110,8 +109,7 @@ def edit(status_id):
     if request.method == "GET":
         # ✅ PREENCHE APENAS NO GET (para não sobrescrever a seleção do usuário no POST)
         form.ativo.data = "1" if current_active else "0"
-        if hasattr(s, "tipos_cadastro"):
-            form.tipos_cadastro.data = _csv_to_list(getattr(s, "tipos_cadastro", ""))
+        form.tipos_cadastro.data = s.tipos_cadastro
 
     if request.method == "POST":
         # Log de depuração (opcional)
@@ -129,8 +127,7 @@ def edit(status_id):
             s.cor = (form.cor.data or "").strip() or None
 
         # atualizar tipos de cadastro
-        if hasattr(Status, "tipos_cadastro"):
-            s.tipos_cadastro = _list_to_csv(form.tipos_cadastro.data)
+        s.tipos_cadastro = form.tipos_cadastro.data
 
         ativo_val = form.ativo.data == "1"
         if hasattr(Status, "ativo"):
@@ -0,0 +1,59 @@
+# app/cli.py
+import os
+import resource
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from .services.inventory_import import import_file
+from .services.tabular import ImportFormatError
+
+
+def register_cli(app):
+    app.cli.add_command(inventory_import_command)
+
+
+@click.command('inventory-import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', type=int, default=None,
+              help='Linhas por commit (padrão: IMPORT_BATCH_SIZE).')
+@click.option('--workers', type=int, default=None,
+              help='Processos de leitura/parse (padrão: nº de CPUs - 1; 0 = tudo no próprio processo).')
+@with_appcontext
+def inventory_import_command(path, batch_size, workers):
+    """Importa uma planilha de inventário (XLSX/CSV/TSV) sem passar pelo navegador.
+
+    A leitura e o parse das linhas rodam em processos separados; este processo
+    é o único escritor e grava os lotes na ordem da planilha.
+    """
+    batch_size = batch_size or current_app.config.get('IMPORT_BATCH_SIZE', 500)
+    if workers is None:
+        # Um núcleo fica com o escritor
+        workers = max((os.cpu_count() or 1) - 1, 0)
+
+    def progress(imp):
+        total = f"/{imp.total_rows}" if imp.total_rows else ''
+        click.echo(f"\r{imp.rows_done}{total} linhas", nl=False, err=True)
+
+    started = time.perf_counter()
+    try:
+        importer = import_file(path, batch_size=batch_size, on_progress=progress, workers=workers)
+    except ImportFormatError as e:
+        raise click.ClickException(str(e))
+    elapsed = time.perf_counter() - started
+    click.echo('', err=True)
+
+    c = importer.counters
+    rate = importer.rows_done / elapsed if elapsed else 0
+    # ru_maxrss: KiB no Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    click.echo(f"Linhas processadas: {importer.rows_done} em {elapsed:.1f}s ({rate:,.0f} linhas/s)")
+    click.echo(f"Equipamentos: {c.get('created', 0)} criados, {c.get('updated', 0)} atualizados, "
+               f"{c.get('skipped', 0)} sem alteração, {c.get('errors', 0)} com erro")
+    click.echo(f"Auto-criados: {c.get('users', 0)} usuários, {c.get('clients', 0)} clientes, "
+               f"{c.get('projects', 0)} projetos, {c.get('statuses', 0)} status")
+    click.echo(f"Lote: {batch_size} linhas | processos de parse: {workers} | pico de memória: {peak_mb:.0f} MB")
+    for msg in importer.errors:
+        click.echo(f"  ! {msg}", err=True)
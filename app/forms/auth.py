@@ -19,3 +19,11 @@ class LoginForm(FlaskForm):
     password = PasswordField("Senha", validators=[DataRequired()])
     remember = BooleanField('Lembrar de mim') 
     submit = SubmitField("Entrar")
+
+
+class ResetPasswordForm(FlaskForm):
+    password = PasswordField('Nova senha', validators=[DataRequired(), Length(min=6)])
+    confirm_password = PasswordField('Confirmar nova senha', validators=[
+        DataRequired(), EqualTo('password', message='As senhas devem coincidir.')
+    ])
+    submit = SubmitField('Salvar nova senha')
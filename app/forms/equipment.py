@@ -1,6 +1,7 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, SubmitField, SelectField
 from wtforms.validators import DataRequired, Optional, Length
+from .fields import LookupSelectField
 
 class EquipmentForm(FlaskForm):
     name = StringField("Nome do Equipamento (Item)", validators=[DataRequired(), Length(max=180)])
@@ -14,10 +15,10 @@ class EquipmentForm(FlaskForm):
     category = StringField("Categoria (opcional)", validators=[Optional(), Length(max=120)])
     brand = StringField("Marca (opcional)", validators=[Optional(), Length(max=120)])
 
-    owner_id = SelectField("Owner", coerce=int)
-    current_responsible_id = SelectField("Current Responsible", coerce=int)
-    location_id = SelectField("Location (Cliente)", coerce=int)
-    project_id = SelectField("Projeto", coerce=int)
+    owner_id = LookupSelectField("Owner", kind="users")
+    current_responsible_id = LookupSelectField("Current Responsible", kind="users")
+    location_id = LookupSelectField("Location (Cliente)", kind="clients")
+    project_id = LookupSelectField("Projeto", kind="projects")
     status_id = SelectField("Status", coerce=int)
 
     notes = TextAreaField("Observações", validators=[Optional(), Length(max=5000)])
@@ -0,0 +1,63 @@
+# app/forms/fields.py
+from flask import url_for
+from wtforms import SelectField, SelectMultipleField
+from wtforms.validators import ValidationError
+
+from ..services import typeahead
+
+# Opção neutra dos selects (coerce=int); as rotas tratam 0 como "nenhum"
+EMPTY_LABEL = "— Selecione —"
+
+
+class _LookupMixin:
+    """Select cujas opções vêm do typeahead (``/api/busca/<kind>``).
+
+    Só o(s) valor(es) atual(is) é(são) renderizado(s) como ``<option>``; o
+    id enviado é validado contra o banco, não contra ``choices``.
+    """
+
+    def _lookup_setup(self, kind, blank):
+        self.lookup_kind = kind
+        self.blank = blank
+        self.choices = []
+
+    def _selected_ids(self):
+        raise NotImplementedError
+
+    def __call__(self, **kwargs):
+        found = typeahead.labels(self.lookup_kind, self._selected_ids())
+        self.choices = ([(0, EMPTY_LABEL)] if self.blank else []) + list(found.items())
+        kwargs.setdefault("data-lookup", url_for("lookup.search", kind=self.lookup_kind))
+        return super().__call__(**kwargs)
+
+
+class LookupSelectField(_LookupMixin, SelectField):
+    def __init__(self, label=None, validators=None, kind=None, blank=True, **kwargs):
+        kwargs.setdefault("coerce", int)
+        super().__init__(label, validators, **kwargs)
+        self._lookup_setup(kind, blank)
+
+    def _selected_ids(self):
+        return [self.data] if self.data else []
+
+    def pre_validate(self, form):
+        # 0/None = nada selecionado: DataRequired/Optional decidem
+        if self.data and not typeahead.labels(self.lookup_kind, [self.data]):
+            raise ValidationError(self.gettext("Not a valid choice."))
+
+
+class LookupSelectMultipleField(_LookupMixin, SelectMultipleField):
+    def __init__(self, label=None, validators=None, kind=None, **kwargs):
+        kwargs.setdefault("coerce", int)
+        super().__init__(label, validators, **kwargs)
+        self._lookup_setup(kind, blank=False)
+
+    def _selected_ids(self):
+        return list(self.data or [])
+
+    def pre_validate(self, form):
+        ids = set(self.data or [])
+        missing = ids - set(typeahead.labels(self.lookup_kind, ids))
+        if missing:
+            raise ValidationError(self.gettext("'%(value)s' is not a valid choice for this field.")
+                                  % {"value": ", ".join(str(i) for i in sorted(missing))})
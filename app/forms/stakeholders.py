@@ -2,6 +2,7 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, SubmitField, SelectField
 from wtforms.validators import DataRequired, Length, Optional, Email
+from .fields import LookupSelectField
 
 class DeleteStakeholderForm(FlaskForm):
     submit = SubmitField('Excluir')
@@ -16,7 +17,7 @@ class StakeholderForm(FlaskForm):
         choices=[('INTERNO', 'Interno'), ('EXTERNO', 'Externo')],
         validators=[DataRequired()]
     )
-    client_id   = SelectField('Cliente', coerce=int, validators=[Optional()])
+    client_id   = LookupSelectField('Cliente', kind='clients', validators=[Optional()])
     position_id = SelectField('Posição (Cargo)', coerce=int, validators=[Optional()])
 
     email = StringField('E-mail',  validators=[Optional(), Email(), Length(max=150)])
@@ -1,11 +1,20 @@
 # app/models.py
+import uuid
 from datetime import datetime
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy import text
+from sqlalchemy import func, text
 from .extensions import db
 from sqlalchemy import CheckConstraint, UniqueConstraint
 from sqlalchemy.orm import validates
+from .utils.text import name_key
+
+
+def _norm_default(source: str):
+    """Default das colunas ``*_norm`` em INSERTs sem ORM (pelo ORM, o ``@validates`` preenche)."""
+    def default(context):
+        return name_key(context.get_current_parameters().get(source))
+    return default
 
 
 class TimestampMixin:
@@ -23,18 +32,35 @@ class User(UserMixin, TimestampMixin, db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     full_name = db.Column(db.String(140), nullable=False)
+    # Nome sem acento/caixa (utils.text.name_key): buscas, deduplicação e ordenação
+    full_name_norm = db.Column(db.String(140), nullable=False, index=True, server_default='',
+                               default=_norm_default('full_name'))
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
     cpf = db.Column(db.String(14), unique=True, nullable=True)
     password_hash = db.Column(db.String(255), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     role = db.Column(db.String(50), default="user")
+    # Contas provisórias (ex.: criadas pelo importador) trocam a senha no 1º login
+    must_reset_password = db.Column(db.Boolean, nullable=False, default=False,
+                                    server_default=db.false())
+
+    __table_args__ = (
+        # Login e cadastro comparam lower(email)
+        db.Index('ix_users_email_lower', func.lower(email)),
+    )
 
     def set_password(self, password: str):
         self.password_hash = generate_password_hash(password)
+        self.must_reset_password = False
 
     def check_password(self, password: str) -> bool:
         return check_password_hash(self.password_hash, password)
 
+    @validates('full_name')
+    def _sync_full_name_norm(self, key, value):
+        self.full_name_norm = name_key(value)
+        return value
+
     def __repr__(self) -> str:
         return f"<User id={self.id} email={self.email!r}>"
 
@@ -51,6 +77,9 @@ class Client(TimestampMixin, db.Model):
 
     # Comuns
     nome_razao = db.Column(db.String(180), nullable=False, index=True)
+    # Nome sem acento/caixa (utils.text.name_key): buscas, deduplicação e ordenação
+    nome_razao_norm = db.Column(db.String(180), nullable=False, index=True, server_default='',
+                                default=_norm_default('nome_razao'))
     endereco = db.Column(db.String(300), nullable=False)
 
     # PF
@@ -76,6 +105,8 @@ class Client(TimestampMixin, db.Model):
         # OBS: Unicidade condicional (cpf p/ PF, cnpj p/ PJ) só é plenamente suportada no Postgres
         # via partial unique indexes (configure em migração específica).
         # Em SQLite, faça validação na camada de aplicação.
+        # Ordem da listagem (keyset)
+        db.Index('ix_clients_created_at_id', 'created_at', 'id'),
     )
     
     # app/models.py (dentro de class Client)
@@ -87,6 +118,11 @@ class Client(TimestampMixin, db.Model):
     def __repr__(self) -> str:
         return f"<Client id={self.id} tipo={self.tipo} nome={self.nome_razao!r}>"
 
+    @validates('nome_razao')
+    def _sync_nome_razao_norm(self, key, value):
+        self.nome_razao_norm = name_key(value)
+        return value
+
 
 # ---------------------------
 # Dealers
@@ -103,6 +139,12 @@ class Dealer(TimestampMixin, db.Model):
     representante_telefone = db.Column(db.String(30), nullable=False)
     representante_funcao = db.Column(db.String(120), nullable=False)
 
+    __table_args__ = (
+        db.Index('ix_dealers_created_at_id', 'created_at', 'id'),
+        # Typeahead por prefixo (services.typeahead)
+        db.Index('ix_dealers_razao_social_lower', func.lower(razao_social)),
+    )
+
     def __repr__(self) -> str:
         return f"<Dealer id={self.id} razao_social={self.razao_social!r}>"
 
@@ -116,9 +158,14 @@ class Project(TimestampMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(180), unique=True, nullable=False)
     description = db.Column(db.Text)
-    status_id = db.Column(db.Integer, db.ForeignKey("statuses.id"), nullable=True)
+    status_id = db.Column(db.Integer, db.ForeignKey("statuses.id"), nullable=True, index=True)
     status = db.relationship("Status", backref="projects")
 
+    __table_args__ = (
+        # Checagem de nome duplicado sem diferenciar caixa
+        db.Index('ix_projects_name_lower', func.lower(name)),
+    )
+
     def __repr__(self) -> str:
         return f"<Project id={self.id} name={self.name!r}>"
 
@@ -167,13 +214,51 @@ class Status(TimestampMixin, db.Model):
     cor = db.Column(db.String(7), nullable=True)  # ex.: '#RRGGBB'
     descricao = db.Column(db.Text, nullable=True)
     ativo = db.Column(db.Boolean, nullable=False, default=True)
-    # pode ser TEXT (csv) ou JSON/ARRAY dependendo do seu schema:
-    tipos_cadastro = db.Column(db.String(255), nullable=True)  # ajuste conforme seu design
+    # Cadastros em que o status pode ser usado (ver STATUS_TARGETS)
+    applicability = db.relationship('StatusApplicability', cascade='all, delete-orphan', lazy='select')
+
+    __table_args__ = (
+        db.Index('ix_statuses_created_at_id', 'created_at', 'id'),
+    )
+
+    @property
+    def tipos_cadastro(self) -> list[str]:
+        return sorted(a.target for a in self.applicability)
+
+    @tipos_cadastro.setter
+    def tipos_cadastro(self, values):
+        wanted = set(values or ())
+        kept = [a for a in self.applicability if a.target in wanted]
+        added = wanted - {a.target for a in kept}
+        self.applicability = kept + [StatusApplicability(target=t) for t in sorted(added)]
+
+
+# Chaves aceitas em StatusApplicability.target
+STATUS_TARGETS = ('equipamentos', 'feedbacks', 'projetos')
+
+
+class StatusApplicability(db.Model):
+    __tablename__ = 'status_applicability'
+
+    # A PK começa por target: "status de equipamentos" é uma busca no índice
+    target = db.Column(db.String(32), primary_key=True)
+    status_id = db.Column(db.Integer, db.ForeignKey('statuses.id', ondelete='CASCADE'), primary_key=True,
+                          index=True)
+
+    __table_args__ = (
+        CheckConstraint(f"target IN ({', '.join(repr(t) for t in STATUS_TARGETS)})",
+                        name='ck_status_applicability_target'),
+    )
 
 
 # ---------------------------
 # Equipment
 # ---------------------------
+# Predicado do índice único parcial de serial_number (também usado como alvo
+# do INSERT ... ON CONFLICT no importador)
+SERIAL_NUMBER_PRESENT = text("serial_number IS NOT NULL AND serial_number <> ''")
+
+
 class Equipment(TimestampMixin, db.Model):
     __tablename__ = "equipment"
 
@@ -193,18 +278,36 @@ class Equipment(TimestampMixin, db.Model):
     brand = db.Column(db.String(120))                 # opcional
     notes = db.Column(db.Text)                        # Obs
 
+    # Hash da última linha de planilha aplicada (pula linhas inalteradas na re-importação)
+    import_fingerprint = db.Column(db.String(64), nullable=True)
+
     # Associações
-    owner_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
-    current_responsible_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
-    location_id = db.Column(db.Integer, db.ForeignKey("clients.id", ondelete="SET NULL"), nullable=True)
-    project_id = db.Column(db.Integer, db.ForeignKey("projects.id", ondelete="SET NULL"), nullable=True)
-    status_id = db.Column(db.Integer, db.ForeignKey("statuses.id", ondelete="SET NULL"), nullable=True)  # <- corrigido
-
-    owner = db.relationship("User", foreign_keys=[owner_id], lazy="selectin", passive_deletes=True)
-    current_responsible = db.relationship("User", foreign_keys=[current_responsible_id], lazy="selectin", passive_deletes=True)
-    location = db.relationship("Client", lazy="selectin", passive_deletes=True)
-    project = db.relationship("Project", lazy="selectin", passive_deletes=True)
-    status = db.relationship("Status", lazy="selectin", passive_deletes=True)
+    owner_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    current_responsible_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"), nullable=True,
+                                       index=True)
+    location_id = db.Column(db.Integer, db.ForeignKey("clients.id", ondelete="SET NULL"), nullable=True, index=True)
+    project_id = db.Column(db.Integer, db.ForeignKey("projects.id", ondelete="SET NULL"), nullable=True, index=True)
+    status_id = db.Column(db.Integer, db.ForeignKey("statuses.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    # Carregamento sob demanda: cada rota declara (selectinload) o que exibe
+    owner = db.relationship("User", foreign_keys=[owner_id], lazy="select", passive_deletes=True)
+    current_responsible = db.relationship("User", foreign_keys=[current_responsible_id], lazy="select", passive_deletes=True)
+    location = db.relationship("Client", lazy="select", passive_deletes=True)
+    project = db.relationship("Project", lazy="select", passive_deletes=True)
+    status = db.relationship("Status", lazy="select", passive_deletes=True)
+
+    __table_args__ = (
+        db.Index(
+            "uq_equipment_serial_number", "serial_number", unique=True,
+            sqlite_where=SERIAL_NUMBER_PRESENT, postgresql_where=SERIAL_NUMBER_PRESENT,
+        ),
+        # Deduplicação sem SN (PN + Item) no importador e na prévia
+        db.Index('ix_equipment_pn_name', 'pn', 'name'),
+        # Ordem da listagem (keyset)
+        db.Index('ix_equipment_created_at_id', 'created_at', 'id'),
+        # Typeahead sem termo (services.typeahead): primeira página por nome, sem ordenar a tabela
+        db.Index('ix_equipment_name_id', 'name', 'id'),
+    )
 
     def __repr__(self) -> str:
         return f"<Equipment id={self.id} name={self.name!r} status_id={self.status_id}>"
@@ -237,6 +340,8 @@ class Position(db.Model):
     __tablename__ = 'positions'
     __table_args__ = (
         UniqueConstraint('name', 'functional_area_id', name='uq_positions_name_area'),
+        # Ordem da listagem (keyset): name, id (o índice único acima tem a área no meio)
+        db.Index('ix_positions_name_id', 'name', 'id'),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -244,7 +349,8 @@ class Position(db.Model):
     functional_area_id = db.Column(
         db.Integer,
         db.ForeignKey('functional_areas.id', ondelete='CASCADE'),
-        nullable=False
+        nullable=False,
+        index=True
     )
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
@@ -266,11 +372,15 @@ class Stakeholder(db.Model):
             "(tipo = 'EXTERNO' AND client_id IS NOT NULL))",
             name='ck_stakeholders_tipo_rel'
         ),
+        db.Index('ix_stakeholders_created_at_id', 'created_at', 'id'),
     )
 
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(150), nullable=False)
+    # Nome sem acento/caixa (utils.text.name_key): buscas, deduplicação e ordenação
+    name_norm = db.Column(db.String(150), nullable=False, index=True, server_default='',
+                          default=_norm_default('name'))
     tipo = db.Column(db.Enum('INTERNO', 'EXTERNO', name='tipo_stakeholder'), nullable=False)
 
     email = db.Column(db.String(150), nullable=True)
@@ -278,8 +388,8 @@ class Stakeholder(db.Model):
 
 
     # Se EXTERNO -> client_id obrigatório; Se INTERNO -> position_id obrigatório
-    client_id = db.Column(db.Integer, db.ForeignKey('clients.id', ondelete='SET NULL'), nullable=True)
-    position_id = db.Column(db.Integer, db.ForeignKey('positions.id', ondelete='SET NULL'), nullable=True)
+    client_id = db.Column(db.Integer, db.ForeignKey('clients.id', ondelete='SET NULL'), nullable=True, index=True)
+    position_id = db.Column(db.Integer, db.ForeignKey('positions.id', ondelete='SET NULL'), nullable=True, index=True)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
@@ -289,6 +399,11 @@ class Stakeholder(db.Model):
     def __repr__(self):
         return f'<Stakeholder {self.name} ({self.tipo})>'
 
+    @validates('name')
+    def _sync_name_norm(self, key, value):
+        self.name_norm = name_key(value)
+        return value
+
 
     @validates('tipo', 'client_id', 'position_id')
     def validate_tipo_rel(self, key, value):
@@ -326,7 +441,9 @@ activity_equipment = db.Table(
     'activity_equipment',
     db.Column('activity_id', db.Integer, db.ForeignKey('activities.id', ondelete='CASCADE'), primary_key=True),
     db.Column('equipment_id', db.Integer, db.ForeignKey('equipment.id', ondelete='CASCADE'), primary_key=True),
-    UniqueConstraint('activity_id', 'equipment_id', name='uq_activity_equipment')
+    UniqueConstraint('activity_id', 'equipment_id', name='uq_activity_equipment'),
+    # A PK começa por activity_id; "atividades deste equipamento" precisa do inverso
+    db.Index('ix_activity_equipment_equipment_id', 'equipment_id'),
 )
 
 class Activity(db.Model):
@@ -335,42 +452,44 @@ class Activity(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     description = db.Column(db.String(400), nullable=False)
 
-    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='SET NULL'), nullable=False)
-    project = db.relationship('Project', lazy='selectin')
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='SET NULL'), nullable=False, index=True)
+    project = db.relationship('Project', lazy='select')
 
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=True)
     duration_hours = db.Column(db.Float, nullable=True)
 
-    owner_user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=False)
-    owner_user = db.relationship('User', foreign_keys=[owner_user_id], lazy='selectin')
+    owner_user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=False, index=True)
+    owner_user = db.relationship('User', foreign_keys=[owner_user_id], lazy='select')
 
-    executor_user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=False)
-    executor_user = db.relationship('User', foreign_keys=[executor_user_id], lazy='selectin')
+    executor_user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=False,
+                                 index=True)
+    executor_user = db.relationship('User', foreign_keys=[executor_user_id], lazy='select')
 
     environment = db.Column(
         db.Enum('SIMULADO', 'CONTROLADO', 'REAL', name='tipo_ambiente'),
         nullable=False
     )
 
-    client_id = db.Column(db.Integer, db.ForeignKey('clients.id', ondelete='SET NULL'), nullable=True)
-    client = db.relationship('Client', lazy='selectin')
+    client_id = db.Column(db.Integer, db.ForeignKey('clients.id', ondelete='SET NULL'), nullable=True, index=True)
+    client = db.relationship('Client', lazy='select')
 
-    dealer_id = db.Column(db.Integer, db.ForeignKey('dealers.id', ondelete='SET NULL'), nullable=True)
-    dealer = db.relationship('Dealer', lazy='selectin')
+    dealer_id = db.Column(db.Integer, db.ForeignKey('dealers.id', ondelete='SET NULL'), nullable=True, index=True)
+    dealer = db.relationship('Dealer', lazy='select')
 
-    status_id = db.Column(db.Integer, db.ForeignKey('statuses.id', ondelete='SET NULL'), nullable=False)
-    status = db.relationship('Status', lazy='selectin')
+    status_id = db.Column(db.Integer, db.ForeignKey('statuses.id', ondelete='SET NULL'), nullable=False, index=True)
+    status = db.relationship('Status', lazy='select')
 
     # Máquinas envolvidas (CSV de VIN/Chassi)
     machines_text = db.Column(db.Text, nullable=True)
 
-    # Equipamentos ligados à atividade
+    # Equipamentos ligados à atividade (sob demanda: listar equipamentos não
+    # deve carregar as atividades de cada item, nem as relações delas)
     equipments = db.relationship(
         'Equipment',
         secondary=activity_equipment,
-        lazy='selectin',
-        backref=db.backref('activities', lazy='selectin')
+        lazy='select',
+        backref=db.backref('activities', lazy='select')
     )
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -381,6 +500,8 @@ class Activity(db.Model):
             "(environment IN ('SIMULADO','CONTROLADO','REAL'))",
             name='ck_activities_environment'
         ),
+        # Ordem da listagem (keyset): start_date desc, created_at desc, id desc
+        db.Index('ix_activities_start_date_created_at_id', 'start_date', 'created_at', 'id'),
     )
 
     def __repr__(self) -> str:
@@ -391,3 +512,122 @@ class Activity(db.Model):
         if not self.machines_text:
             return []
         return [v.strip() for v in self.machines_text.split(',') if v.strip()]
+
+
+# ============================
+# Import Jobs
+# ============================
+class ImportJob(TimestampMixin, db.Model):
+    """Estado persistido de uma importação executada em segundo plano."""
+    __tablename__ = 'import_jobs'
+
+    # staged: pré-visualização pronta, aguardando aprovação (ou descarte)
+    STATUSES = ('queued', 'running', 'staged', 'done', 'failed', 'discarded')
+
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    kind = db.Column(db.String(40), nullable=False, default='inventory')
+    filename = db.Column(db.String(255), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)
+
+    rows_done = db.Column(db.Integer, nullable=False, default=0)
+    created_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_count = db.Column(db.Integer, nullable=False, default=0)
+    error_count = db.Column(db.Integer, nullable=False, default=0)
+    # Demais contadores (auto-criados etc.) e mensagens de erro por lote
+    details = db.Column(db.JSON, nullable=True)
+    message = db.Column(db.Text, nullable=True)
+
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('queued','running','staged','done','failed','discarded')",
+            name='ck_import_jobs_status'
+        ),
+    )
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('staged', 'done', 'failed', 'discarded')
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'filename': self.filename,
+            'status': self.status,
+            'rows_done': self.rows_done,
+            'created': self.created_count,
+            'updated': self.updated_count,
+            'errors': self.error_count,
+            'details': self.details or {},
+            'message': self.message,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __repr__(self) -> str:
+        return f"<ImportJob id={self.id} status={self.status} rows={self.rows_done}>"
+
+
+class ImportStagingRow(db.Model):
+    """Linha de planilha carregada para pré-visualização, antes de ser aplicada."""
+    __tablename__ = 'import_staging_rows'
+
+    ACTIONS = ('create', 'update', 'skip', 'error')
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(32), db.ForeignKey('import_jobs.id', ondelete='CASCADE'), nullable=False)
+    row = db.Column(db.Integer, nullable=False)
+
+    # Valores normalizados por parse_row ('' quando a célula está vazia)
+    name = db.Column(db.String(180), nullable=False, default='')
+    pn = db.Column(db.String(80), nullable=False, default='')
+    model_number = db.Column(db.String(120), nullable=False, default='')
+    serial_number = db.Column(db.String(120), nullable=False, default='')
+    location = db.Column(db.String(180), nullable=False, default='')
+    machine_installed = db.Column(db.String(180), nullable=False, default='')
+    status = db.Column(db.String(80), nullable=False, default='')
+    project = db.Column(db.String(180), nullable=False, default='')
+    owner = db.Column(db.String(140), nullable=False, default='')
+    responsible = db.Column(db.String(140), nullable=False, default='')
+    notes = db.Column(db.Text, nullable=False, default='')
+    image_ref = db.Column(db.String(255), nullable=False, default='')
+    fingerprint = db.Column(db.String(64), nullable=True)
+
+    # Associações já existentes no momento do staging (NULL = será auto-criada)
+    owner_id = db.Column(db.Integer, nullable=True)
+    current_responsible_id = db.Column(db.Integer, nullable=True)
+    location_id = db.Column(db.Integer, nullable=True)
+    project_id = db.Column(db.Integer, nullable=True)
+    status_id = db.Column(db.Integer, nullable=True)
+
+    # Resultado da pré-visualização
+    target_id = db.Column(db.Integer, nullable=True)  # equipment.id casado por SN ou PN + Item
+    action = db.Column(db.String(10), nullable=True)
+    error = db.Column(db.String(255), nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_import_staging_rows_job_row', 'job_id', 'row'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ImportStagingRow job={self.job_id} row={self.row} action={self.action}>"
+
+
+# ============================
+# Cache de dados de referência
+# ============================
+class CacheVersion(db.Model):
+    """Contador de alteração (``services.change_tracking``): listas de
+    ``services.reference_data`` e ``table:<tabela>`` dos validadores HTTP."""
+    __tablename__ = 'cache_versions'
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    changed_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<CacheVersion {self.name}={self.version}>"
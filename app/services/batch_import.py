@@ -0,0 +1,108 @@
+# app/services/batch_import.py
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..extensions import db
+
+DEFAULT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 20
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+class BatchImporter:
+    """Base dos importadores: acumula registros e grava em lotes de ``batch_size``.
+
+    Cada lote tem o seu próprio commit; uma falha descarta apenas o lote em
+    que ocorreu. Os mapas em memória alterados via ``_set``, os contadores
+    de ``_count`` e o que for registrado em ``_on_rollback`` são revertidos
+    junto com o lote. Subclasses implementam ``_apply(records)``.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE,
+                 on_progress: Optional[Callable[['BatchImporter'], None]] = None):
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.rows_done = 0
+        self.total_rows: Optional[int] = None
+        self.counters: Dict[str, int] = {}
+        self.errors: List[str] = []
+        self._pending: List[Dict[str, Any]] = []
+        # Contadores, erros por linha e chaves adicionadas aos mapas no lote
+        # corrente, descartados se o lote falhar.
+        self._batch_counters: Dict[str, int] = {}
+        self._batch_errors: List[str] = []
+        self._journal: List[Tuple[dict, Any, Any]] = []
+        # Desfazimentos de estado que não está em mapas (ex.: índice de nomes)
+        self._undo: List[Callable[[], None]] = []
+
+    def _apply(self, records: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def _count(self, key: str, n: int = 1):
+        self._batch_counters[key] = self._batch_counters.get(key, 0) + n
+
+    def _set(self, mapping: dict, key, value):
+        self._journal.append((mapping, key, mapping.get(key, _MISSING)))
+        mapping[key] = value
+
+    def _on_rollback(self, undo: Callable[[], None]):
+        """Executa ``undo`` se o lote corrente falhar."""
+        self._undo.append(undo)
+
+    def _reject(self, rec: Dict[str, Any], message: str):
+        """Descarta uma linha inválida sem afetar o restante do lote."""
+        self._count('errors')
+        self._batch_errors.append(f"linha {rec.get('row', '?')}: {message}")
+
+    def _report(self, message: str):
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    # --- API pública --------------------------------------------------------
+    def add(self, record: Dict[str, Any]):
+        self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        records, self._pending = self._pending, []
+        if records:
+            self._run_batch(self._apply, records)
+            self.rows_done += len(records)
+            if self.on_progress:
+                self.on_progress(self)
+
+    def finish(self) -> Dict[str, int]:
+        self.flush()
+        return self.counters
+
+    def _run_batch(self, fn, records):
+        self._batch_counters, self._batch_errors, self._journal, self._undo = {}, [], [], []
+        try:
+            fn(records)
+            db.session.commit()
+        except Exception as exc:
+            db.session.rollback()
+            # Desfaz as chaves que apontavam para linhas revertidas
+            for mapping, key, previous in reversed(self._journal):
+                if previous is _MISSING:
+                    mapping.pop(key, None)
+                else:
+                    mapping[key] = previous
+            for undo in reversed(self._undo):
+                undo()
+            first, last = records[0].get('row'), records[-1].get('row')
+            where = f"linhas {first}-{last}" if first is not None else "lote"
+            logger.warning("Falha ao importar %s: %s", where, exc)
+            self.counters['errors'] = self.counters.get('errors', 0) + len(records)
+            self._report(f"{where}: {exc}")
+        else:
+            for k, n in self._batch_counters.items():
+                self.counters[k] = self.counters.get(k, 0) + n
+            for message in self._batch_errors:
+                self._report(message)
+        finally:
+            self._batch_counters, self._batch_errors, self._journal, self._undo = {}, [], [], []
@@ -0,0 +1,99 @@
+# app/services/change_tracking.py
+"""Contadores de alteração em ``cache_versions``.
+
+Cada nome tem ``(version, changed_at)``. ``bump`` incrementa na MESMA
+transação da escrita (uma vez por transação), então o contador só muda se a
+escrita for confirmada, e vale para todos os processos que leem o banco.
+
+Além dos nomes registrados por outros módulos (listas de
+``services.reference_data``), toda tabela alterada por flush do ORM ou por
+``session.execute(insert/update/delete)`` tem o contador ``table:<tabela>``,
+usado nos validadores HTTP (``utils.http_cache``).
+"""
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from flask import g, has_request_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import CacheVersion
+
+_BUMPED = 'change_tracking_bumped'
+_G_VERSIONS = '_change_tracking_versions'
+
+# Chamados após o commit com os nomes incrementados nele
+_commit_listeners: List[Callable[[Set[str]], None]] = []
+
+
+def table_key(table_name: str) -> str:
+    return f'table:{table_name}'
+
+
+def on_commit(listener: Callable[[Set[str]], None]):
+    _commit_listeners.append(listener)
+    return listener
+
+
+def versions() -> Dict[str, Tuple[int, Optional[datetime]]]:
+    """``{nome: (versão, alterado em)}``; lido uma vez por request."""
+    if has_request_context() and _G_VERSIONS in g:
+        return g.get(_G_VERSIONS)
+    rows = db.session.execute(select(CacheVersion.name, CacheVersion.version, CacheVersion.changed_at))
+    result = {name: (version, changed_at) for name, version, changed_at in rows}
+    if has_request_context():
+        setattr(g, _G_VERSIONS, result)
+    return result
+
+
+def bump(session: Session, names: Iterable[str]):
+    """Incrementa ``names`` na transação corrente de ``session``."""
+    bumped = session.info.setdefault(_BUMPED, set())
+    pending = set(names) - bumped
+    if not pending:
+        return
+    conn = session.connection()
+    t = CacheVersion.__table__
+    now = datetime.utcnow()
+    for name in sorted(pending):
+        result = conn.execute(t.update().where(t.c.name == name)
+                              .values(version=t.c.version + 1, changed_at=now))
+        if result.rowcount == 0:
+            conn.execute(t.insert().values(name=name, version=1, changed_at=now))
+    bumped.update(pending)
+
+
+@event.listens_for(Session, 'after_flush')
+def _after_flush(session, flush_context):
+    tables = {o.__table__.name for o in session.new} | {o.__table__.name for o in session.deleted}
+    tables.update(o.__table__.name for o in session.dirty if session.is_modified(o))
+    tables.discard(CacheVersion.__tablename__)
+    if tables:
+        bump(session, (table_key(t) for t in tables))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bulk_write(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if getattr(table, 'name', None):
+        bump(orm_execute_state.session, [table_key(table.name)])
+
+
+@event.listens_for(Session, 'after_commit')
+def _after_commit(session):
+    names = session.info.pop(_BUMPED, None)
+    if not names:
+        return
+    if has_request_context():
+        g.pop(_G_VERSIONS, None)
+    for listener in _commit_listeners:
+        listener(names)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _after_rollback(session, previous_transaction):
+    # O incremento pode ter sido desfeito junto: a próxima escrita incrementa de novo
+    session.info.pop(_BUMPED, None)
@@ -0,0 +1,142 @@
+# app/services/import_jobs.py
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+from flask import abort, current_app
+from flask_login import current_user
+
+from ..extensions import db
+from ..models import ImportJob
+from .import_staging import apply_staged, stage_file
+from .inventory_import import import_file
+from .registry_import import import_clients_file, import_stakeholders_file
+from .tabular import ImportFormatError
+
+logger = logging.getLogger(__name__)
+
+# Executores por tipo de importação: (job_id, path, batch_size, on_progress) -> importador
+RUNNERS = {
+    'inventory': lambda job_id, path, batch_size, on_progress: import_file(
+        path, batch_size=batch_size, on_progress=on_progress),
+    # Prévia: carrega o staging e para em 'staged' aguardando aprovação
+    'inventory_preview': lambda job_id, path, batch_size, on_progress: stage_file(
+        job_id, path, batch_size=batch_size, on_progress=on_progress),
+    # Aplicação de uma prévia aprovada (lê do staging, sem arquivo)
+    'inventory_staged': lambda job_id, path, batch_size, on_progress: apply_staged(
+        job_id, batch_size=batch_size, on_progress=on_progress),
+    'clients': lambda job_id, path, batch_size, on_progress: import_clients_file(
+        path, batch_size=batch_size, on_progress=on_progress),
+    'stakeholders': lambda job_id, path, batch_size, on_progress: import_stakeholders_file(
+        path, batch_size=batch_size, on_progress=on_progress),
+}
+
+# Status final por tipo (padrão: done)
+FINAL_STATUS = {'inventory_preview': 'staged'}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(app) -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # SQLite aceita um único escritor: por padrão, um job por vez
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get('IMPORT_WORKERS', 1),
+                thread_name_prefix='import-job',
+            )
+        return _executor
+
+
+def submit_import(path: str, filename: str, user_id: Optional[int] = None, kind: str = 'inventory') -> ImportJob:
+    """Registra o job (queued) e agenda o processamento do arquivo já gravado em ``path``.
+
+    O arquivo temporário passa a pertencer ao job e é removido ao final.
+    """
+    if kind not in RUNNERS:
+        raise ValueError(f"Tipo de importação desconhecido: {kind}")
+    job = ImportJob(kind=kind, filename=filename, user_id=user_id, status='queued')
+    db.session.add(job)
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    _get_executor(app).submit(_run_job, app, job.id, path)
+    return job
+
+
+def submit_staged(job: ImportJob) -> ImportJob:
+    """Agenda a aplicação de uma prévia aprovada (job em 'staged')."""
+    if job.status != 'staged':
+        raise ValueError('A prévia não está aguardando aprovação.')
+    job.kind = 'inventory_staged'
+    job.status = 'queued'
+    job.rows_done = 0
+    job.started_at = job.finished_at = None
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    _get_executor(app).submit(_run_job, app, job.id, None)
+    return job
+
+
+def get_job_or_404(job_id: str) -> ImportJob:
+    """Job do usuário logado (jobs de outros usuários não são expostos)."""
+    job = db.session.get(ImportJob, job_id)
+    if job is None or (job.user_id is not None and job.user_id != current_user.id):
+        abort(404)
+    return job
+
+
+def _sync(job_id: str, importer, **fields):
+    job = db.session.get(ImportJob, job_id)
+    if job is None:
+        return
+    counters = dict(importer.counters) if importer is not None else {}
+    if importer is not None:
+        job.rows_done = importer.rows_done
+        job.created_count = counters.pop('created', 0)
+        job.updated_count = counters.pop('updated', 0)
+        job.error_count = counters.pop('errors', 0)
+        job.details = {
+            'counters': counters,
+            'total_rows': importer.total_rows,
+            'errors': list(importer.errors),
+            **getattr(importer, 'job_details', {}),
+        }
+    for k, v in fields.items():
+        setattr(job, k, v)
+    db.session.commit()
+
+
+def _run_job(app, job_id: str, path: Optional[str]):
+    with app.app_context():
+        try:
+            job = db.session.get(ImportJob, job_id)
+            job.status = 'running'
+            job.started_at = datetime.utcnow()
+            db.session.commit()
+
+            kind = job.kind
+            runner = RUNNERS[kind]
+            importer = runner(job_id, path, app.config.get('IMPORT_BATCH_SIZE', 500),
+                              lambda imp: _sync(job_id, imp))
+            _sync(job_id, importer, status=FINAL_STATUS.get(kind, 'done'), finished_at=datetime.utcnow())
+        except ImportFormatError as e:
+            db.session.rollback()
+            _sync(job_id, None, status='failed', message=str(e), finished_at=datetime.utcnow())
+        except Exception as e:
+            logger.exception("Falha no job de importação %s", job_id)
+            db.session.rollback()
+            _sync(job_id, None, status='failed', message=f'Falha ao importar: {e}',
+                  finished_at=datetime.utcnow())
+        finally:
+            if path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
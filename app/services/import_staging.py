@@ -0,0 +1,315 @@
+# app/services/import_staging.py
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, delete, exists, func, insert, or_, select, update
+from sqlalchemy.orm import aliased
+
+from ..extensions import db
+from ..models import Client, Equipment, ImportJob, ImportStagingRow, Project, Status, User
+from .inventory_import import (
+    DEFAULT_BATCH_SIZE, MAX_REPORTED_ERRORS, InventoryImporter, _name_key, column_map, find_header,
+    name_maps, parse_row, row_fingerprint, sum_statuses,
+)
+from .name_index import FuzzyNames
+from .tabular import open_table
+
+S = ImportStagingRow.__table__
+E = Equipment.__table__
+
+# Campo da planilha -> (coluna de id no staging/equipment, mapa de nomes)
+REF_FIELDS = {
+    'owner': ('owner_id', 'users'),
+    'responsible': ('current_responsible_id', 'users'),
+    'location': ('location_id', 'clients'),
+    'project': ('project_id', 'projects'),
+    'status': ('status_id', 'statuses'),
+}
+
+# Campos de texto comparados na prévia (planilha -> coluna de equipment)
+TEXT_FIELDS = ('pn', 'model_number', 'machine_installed', 'image_ref')
+
+# Colunas do staging que formam o registro entregue ao importador
+RECORD_FIELDS = ('name', 'pn', 'model_number', 'serial_number', 'location', 'machine_installed',
+                 'status', 'project', 'owner', 'responsible', 'notes', 'image_ref')
+
+
+class StagingLoader:
+    """Carrega a planilha em ``import_staging_rows`` em lotes de INSERT.
+
+    Expõe a mesma interface de progresso do InventoryImporter (rows_done,
+    total_rows, counters, errors) para ser acompanhado como um job comum.
+    As associações são resolvidas contra os mapas de nomes já existentes;
+    o que ficar NULL será auto-criado na aplicação.
+    """
+
+    def __init__(self, job_id: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                 on_progress: Optional[Callable[['StagingLoader'], None]] = None):
+        self.job_id = job_id
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.rows_done = 0
+        self.total_rows: Optional[int] = None
+        self.counters: Dict[str, int] = {}
+        self.errors: List[str] = []
+        # Persistido em ImportJob.details (lido de novo ao aplicar)
+        self.job_details: Dict[str, Any] = {}
+        self.maps = name_maps()
+        self.fuzzy = FuzzyNames(_name_key)
+        # Nomes novos digitados de mais de um jeito: só o primeiro conta como criação
+        self.job_details['name_aliases'] = {kind: [] for kind in FuzzyNames.KINDS}
+        self._pending: List[Dict[str, Any]] = []
+
+    def add(self, row: int, rec: Optional[Dict[str, str]], error: Optional[str] = None):
+        # executemany: todas as linhas com as mesmas chaves
+        values = {'job_id': self.job_id, 'row': row, 'error': error, 'action': None}
+        values.update({f: rec[f] if rec else '' for f in RECORD_FIELDS})
+        values['fingerprint'] = row_fingerprint(rec) if rec else None
+        for field, (col, kind) in REF_FIELDS.items():
+            values[col] = self._resolve(kind, values[field])
+        if rec is None:
+            values['action'] = 'error'
+        self._pending.append(values)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def _resolve(self, kind: str, name: str) -> Optional[int]:
+        if not name:
+            return None
+        i = self.maps[kind].get(_name_key(name))
+        if i is None and kind in FuzzyNames.KINDS:
+            # Mesmo casamento aproximado do importador (erros de digitação)
+            found = self.fuzzy.match(kind, name)
+            i = self.maps[kind].get(found)
+            if found and i is None:
+                self.job_details['name_aliases'][kind].append(_name_key(name))
+            elif i is None:
+                self.fuzzy.add(kind, name)
+        return i
+
+    def flush(self):
+        rows, self._pending = self._pending, []
+        if rows:
+            db.session.execute(insert(ImportStagingRow), rows)
+            db.session.commit()
+            self.rows_done += len(rows)
+            if self.on_progress:
+                self.on_progress(self)
+
+    def finish(self):
+        self.flush()
+        classify(self.job_id)
+        summary = summarize(self.job_id, aliases=self.job_details['name_aliases'])
+        self.counters = {
+            'created': summary['actions'].get('create', 0),
+            'updated': summary['actions'].get('update', 0),
+            'skipped': summary['actions'].get('skip', 0),
+            'errors': summary['actions'].get('error', 0),
+            **{kind: len(names) for kind, names in summary['new_refs'].items() if names},
+        }
+        self.errors = [f"linha {r}: {msg}" for r, msg in summary['errors']]
+        self.job_details.update(name_matches=self.fuzzy.matches, name_review=self.fuzzy.review)
+        return self.counters
+
+
+def stage_file(job_id: str, path: str, batch_size: int = DEFAULT_BATCH_SIZE, on_progress=None) -> StagingLoader:
+    """Lê a planilha (XLSX/CSV/TSV, streaming) para o staging e calcula a prévia."""
+    with open_table(path) as table:
+        loader = StagingLoader(job_id, batch_size=batch_size, on_progress=on_progress)
+        if table.workbook is not None:
+            loader.job_details['sum_statuses'] = sum_statuses(table.workbook)
+
+        header_row, header_vals = find_header(table.rows)
+        cols = column_map(header_vals)
+        if table.max_row:
+            loader.total_rows = max(table.max_row - header_row, 0)
+        for r, row in enumerate(table.rows, start=header_row + 1):
+            rec = parse_row(row, cols)
+            if rec:
+                loader.add(r, rec)
+            elif any(v not in (None, '') for v in row):
+                loader.add(r, None, error='Linha sem Item')
+        loader.finish()
+        return loader
+
+
+# ---------------------------
+# Prévia (SQL sobre o staging)
+# ---------------------------
+def classify(job_id: str):
+    """Casa cada linha com equipment e define a ação, em poucos UPDATEs set-based."""
+    pending = and_(S.c.job_id == job_id, S.c.action.is_(None))
+
+    # 1) SN; 2) PN + Item para quem não casou pelo SN (mesma ordem do importador)
+    db.session.execute(
+        update(S).where(pending, S.c.serial_number != '')
+        .values(target_id=select(E.c.id).where(E.c.serial_number == S.c.serial_number)
+                .scalar_subquery())
+    )
+    db.session.execute(
+        update(S).where(pending, S.c.target_id.is_(None), S.c.pn != '')
+        .values(target_id=select(func.min(E.c.id)).where(E.c.pn == S.c.pn, E.c.name == S.c.name)
+                .scalar_subquery())
+    )
+
+    # 3) Linha idêntica à última aplicada -> skip; demais casadas -> update
+    same_fp = exists().where(E.c.id == S.c.target_id, E.c.import_fingerprint == S.c.fingerprint)
+    db.session.execute(update(S).where(pending, S.c.target_id.isnot(None), same_fp).values(action='skip'))
+    db.session.execute(update(S).where(pending, S.c.target_id.isnot(None)).values(action='update'))
+
+    # 4) Sem alvo: a primeira ocorrência da chave cria, as seguintes fazem merge nela
+    #    (linhas que casaram com um existente não registram o próprio SN)
+    prev = S.alias('prev')
+    earlier = exists().where(
+        prev.c.job_id == S.c.job_id,
+        prev.c.row < S.c.row,
+        prev.c.target_id.is_(None),
+        or_(and_(S.c.serial_number != '', prev.c.serial_number == S.c.serial_number),
+            and_(S.c.pn != '', prev.c.pn == S.c.pn, prev.c.name == S.c.name)),
+    )
+    db.session.execute(update(S).where(pending, earlier).values(action='update'))
+    db.session.execute(update(S).where(pending).values(action='create'))
+    db.session.commit()
+
+
+def summarize(job_id: str, limit: int = MAX_REPORTED_ERRORS,
+              aliases: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+    """Contagem por ação, associações a auto-criar e linhas com erro."""
+    job = db.session.get(ImportJob, job_id)
+    details = (job.details if job else None) or {}
+    if aliases is None:
+        aliases = details.get('name_aliases') or {}
+    actions = dict(db.session.execute(
+        select(S.c.action, func.count()).where(S.c.job_id == job_id).group_by(S.c.action)
+    ).all())
+
+    new_refs: Dict[str, Dict[str, str]] = {'users': {}, 'clients': {}, 'projects': {}, 'statuses': {}}
+    for field, (col, kind) in REF_FIELDS.items():
+        names = db.session.execute(
+            select(S.c[field]).distinct()
+            .where(S.c.job_id == job_id, S.c.action.in_(('create', 'update')), S.c[field] != '',
+                   S.c[col].is_(None))
+        ).scalars()
+        skip = set(aliases.get(kind, ()))
+        for name in names:
+            key = _name_key(name)
+            if key not in skip:
+                new_refs[kind].setdefault(key, name)
+
+    # Status da aba Sum que ainda não existem
+    sum_names = details.get('sum_statuses') or []
+    if sum_names:
+        existing = name_maps()['statuses']
+        for name in sum_names:
+            key = _name_key(name)
+            if key not in existing:
+                new_refs['statuses'].setdefault(key, name)
+
+    errors = db.session.execute(
+        select(S.c.row, S.c.error).where(S.c.job_id == job_id, S.c.action == 'error')
+        .order_by(S.c.row).limit(limit)
+    ).all()
+    return {
+        'actions': actions,
+        'new_refs': {kind: sorted(names.values()) for kind, names in new_refs.items()},
+        'errors': [tuple(e) for e in errors],
+    }
+
+
+def _diff(row) -> List[Dict[str, Any]]:
+    """Campos que a linha vai alterar, com a mesma regra de merge do importador."""
+    changes = []
+    for field in TEXT_FIELDS:
+        new, old = row[field], row[f'current_{field}']
+        if new and new != old:
+            changes.append({'field': field, 'old': old, 'new': new})
+    for field, (col, _) in REF_FIELDS.items():
+        new, old = row[field], row[f'current_{field}']
+        if new and (row[col] is None or row[col] != row[f'current_{col}']):
+            changes.append({'field': field, 'old': old, 'new': new})
+    notes, current = row['notes'], row['current_notes']
+    if notes and f"\n{notes}\n" not in f"\n{current or ''}\n":
+        changes.append({'field': 'notes', 'old': current, 'new': '\n'.join(v for v in (current, notes) if v)})
+    return changes
+
+
+def preview(job_id: str, limit: int = 200) -> Dict[str, Any]:
+    """Resumo da prévia + amostra de criações e diffs por campo das atualizações."""
+    data = summarize(job_id)
+
+    owner, resp = aliased(User), aliased(User)
+    cols = [S.c.row, S.c.target_id, *[S.c[f] for f in RECORD_FIELDS],
+            *[S.c[col] for col, _ in REF_FIELDS.values()],
+            E.c.name.label('current_name'), E.c.notes.label('current_notes'),
+            *[E.c[f].label(f'current_{f}') for f in TEXT_FIELDS],
+            *[E.c[col].label(f'current_{col}') for col, _ in REF_FIELDS.values()],
+            owner.full_name.label('current_owner'), resp.full_name.label('current_responsible'),
+            Client.nome_razao.label('current_location'), Project.name.label('current_project'),
+            Status.nome.label('current_status')]
+    q = (
+        select(*cols)
+        .select_from(S.join(E, E.c.id == S.c.target_id))
+        .outerjoin(owner, owner.id == E.c.owner_id)
+        .outerjoin(resp, resp.id == E.c.current_responsible_id)
+        .outerjoin(Client, Client.id == E.c.location_id)
+        .outerjoin(Project, Project.id == E.c.project_id)
+        .outerjoin(Status, Status.id == E.c.status_id)
+        .where(S.c.job_id == job_id, S.c.action == 'update')
+        .order_by(S.c.row)
+        .limit(limit)
+    )
+    data['updates'] = [
+        {'row': r['row'], 'target_id': r['target_id'], 'name': r['current_name'], 'changes': _diff(r)}
+        for r in db.session.execute(q).mappings()
+    ]
+    data['creates'] = db.session.execute(
+        select(S.c.row, S.c.name, S.c.pn, S.c.serial_number, S.c.location)
+        .where(S.c.job_id == job_id, S.c.action == 'create')
+        .order_by(S.c.row).limit(limit)
+    ).mappings().all()
+    return data
+
+
+# ---------------------------
+# Aplicação / descarte
+# ---------------------------
+def apply_staged(job_id: str, batch_size: int = DEFAULT_BATCH_SIZE, on_progress=None) -> InventoryImporter:
+    """Aplica as linhas aprovadas do staging pelo importador em lote e limpa o staging.
+
+    As linhas são lidas em ordem (paginação por ``row``), sem reler a planilha.
+    """
+    importer = InventoryImporter(batch_size=batch_size, on_progress=on_progress)
+    job = db.session.get(ImportJob, job_id)
+    importer.import_statuses((job.details or {}).get('sum_statuses') or [])
+
+    importer.total_rows = db.session.execute(
+        select(func.count()).where(S.c.job_id == job_id, S.c.action != 'error')
+    ).scalar()
+    # Linhas sem Item já apareceram na prévia; entram no resultado como erro
+    errors = db.session.execute(
+        select(S.c.row, S.c.error).where(S.c.job_id == job_id, S.c.action == 'error').order_by(S.c.row)
+    ).all()
+    if errors:
+        importer.counters['errors'] = len(errors)
+        importer.errors.extend(f"linha {r}: {msg}" for r, msg in errors[:MAX_REPORTED_ERRORS])
+
+    last = 0
+    while True:
+        chunk = db.session.execute(
+            select(S.c.row, *[S.c[f] for f in RECORD_FIELDS])
+            .where(S.c.job_id == job_id, S.c.action != 'error', S.c.row > last)
+            .order_by(S.c.row).limit(batch_size)
+        ).mappings().all()
+        if not chunk:
+            break
+        for r in chunk:
+            importer.add(dict(r))
+        last = chunk[-1]['row']
+    importer.finish()
+
+    discard_staged(job_id)
+    return importer
+
+
+def discard_staged(job_id: str):
+    db.session.execute(delete(S).where(S.c.job_id == job_id))
+    db.session.commit()
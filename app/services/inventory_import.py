@@ -0,0 +1,693 @@
+# app/services/inventory_import.py
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import case, literal, or_
+from werkzeug.security import generate_password_hash
+
+from ..extensions import db
+from ..models import User, Client, Project, Status, Equipment, SERIAL_NUMBER_PRESENT
+from ..utils.text import name_key as _name_key, normalize_name as _normalize_name
+from . import tabular
+from .batch_import import DEFAULT_BATCH_SIZE, MAX_REPORTED_ERRORS, BatchImporter  # noqa: F401
+from .name_index import FuzzyNames
+from .tabular import ImportFormatError, Table, open_table
+
+
+class InventoryImportError(ImportFormatError):
+    """Erro de formato da planilha (ex.: cabeçalho ausente)."""
+
+
+# Split do campo Owner: "Renato Abreu / João Obregon", "A & B", "A e B"...
+_SPLIT_RE = re.compile(r"\s*(?:/|&|,|;| e )\s*", re.IGNORECASE)
+
+# Colunas aceitas (case-insensitive) -> campo interno
+COLUMN_ALIASES = {
+    'item': ('Item',),
+    'pn': ('PN',),
+    'model_number': ('Model Number', 'Model'),
+    'serial_number': ('SN', 'Serial Number'),
+    'location': ('Location',),
+    'machine_installed': ('Machine Installed',),
+    'status': ('Status',),
+    'project': ('Project',),
+    'owner': ('Owner',),
+    'responsible': ('Current Responsible', 'Current Reponsible'),
+    'notes': ('Obs', 'Observacao', 'Observações'),
+    'image_ref': ('Imagem de Referência', 'Image', 'Image Ref'),
+}
+
+# Linhas por tarefa no parse paralelo (iter_records)
+PARSE_CHUNK_SIZE = 2000
+
+# Senha provisória dos usuários criados pelo importador (trocada no 1º login)
+PLACEHOLDER_PASSWORD = 'ChangeMe123!'
+
+
+def _email_base(name: str) -> str:
+    n = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    n = re.sub(r"[^a-zA-Z0-9\s]", "", n).strip().lower()
+    n = re.sub(r"\s+", ".", n)
+    return n or 'user'
+
+
+def row_fingerprint(rec: Dict[str, Any]) -> str:
+    """Hash estável dos valores normalizados de uma linha (ignora o nº da linha)."""
+    payload = json.dumps([[k, rec[k]] for k in sorted(rec) if k not in ('row', 'fingerprint')],
+                         ensure_ascii=False)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def placeholder_password_hash() -> str:
+    """Hash da senha provisória, calculado uma vez por processo e compartilhado."""
+    return generate_password_hash(PLACEHOLDER_PASSWORD)
+
+
+def _status_code(name: str) -> str:
+    code = re.sub(r"[^A-Za-z0-9]+", "_", _normalize_name(name)).strip("_").upper()
+    return code or 'STATUS'
+
+
+def name_maps() -> Dict[str, Dict[str, int]]:
+    """Mapas chave normalizada -> id das associações resolvidas por nome."""
+    s = db.session
+    return {
+        # Users/Clients já gravam a chave (colunas *_norm)
+        'users': {k: i for i, k in s.query(User.id, User.full_name_norm)},
+        'clients': {k: i for i, k in s.query(Client.id, Client.nome_razao_norm)},
+        'projects': {_name_key(n): i for i, n in s.query(Project.id, Project.name)},
+        'statuses': {_name_key(n): i for i, n in s.query(Status.id, Status.nome)},
+    }
+
+
+# ---------------------------
+# Leitura da planilha (XLSX/CSV/TSV, via tabular)
+# ---------------------------
+def find_header(rows: Iterable[Tuple[Any, ...]], max_rows: int = 5) -> Tuple[int, List[str]]:
+    """Localiza a linha de cabeçalho (a que contém a coluna Item) nas primeiras linhas."""
+    return tabular.find_header(rows, COLUMN_ALIASES['item'], max_rows=max_rows)
+
+
+def column_map(header_vals: List[str]) -> Dict[str, Optional[int]]:
+    return tabular.column_map(header_vals, COLUMN_ALIASES)
+
+
+def parse_row(row: Tuple[Any, ...], cols: Dict[str, Optional[int]]) -> Optional[Dict[str, str]]:
+    """Extrai e normaliza os valores de uma linha; retorna None se não houver Item."""
+    def get(field):
+        return tabular.cell(row, cols, field)
+
+    name = get('item')
+    if not name:
+        return None
+
+    # --- Split inteligente ---
+    owner_name = _normalize_name(get('owner'))
+    resp_name = _normalize_name(get('responsible'))
+    if owner_name and not resp_name:
+        parts = [p for p in _SPLIT_RE.split(owner_name) if p]
+        if len(parts) > 1:
+            owner_name, resp_name = parts[0], parts[1]
+    elif resp_name:
+        parts_r = [p for p in _SPLIT_RE.split(resp_name) if p]
+        if parts_r:
+            resp_name = parts_r[0]
+
+    return {
+        'name': name,
+        'pn': get('pn'),
+        'model_number': get('model_number'),
+        'serial_number': get('serial_number'),
+        'location': get('location'),
+        'machine_installed': get('machine_installed'),
+        'status': get('status'),
+        'project': get('project'),
+        'owner': owner_name,
+        'responsible': resp_name,
+        'notes': get('notes'),
+        'image_ref': get('image_ref'),
+    }
+
+
+def _parse_chunk(args) -> List[Dict[str, Any]]:
+    """Parse de um bloco de linhas (executado nos processos do pool)."""
+    start, rows, cols = args
+    out = []
+    for r, row in enumerate(rows, start=start):
+        rec = parse_row(row, cols)
+        if rec:
+            rec['row'] = r
+            rec['fingerprint'] = row_fingerprint(rec)
+            out.append(rec)
+    return out
+
+
+def iter_records(rows: Iterable[Tuple[Any, ...]], cols: Dict[str, Optional[int]], start: int,
+                 workers: int = 0, chunk_size: int = PARSE_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Registros normalizados das linhas, na ordem da planilha (``row`` = nº da linha).
+
+    Com ``workers`` > 1 o parse roda num pool de processos, em blocos de
+    ``chunk_size`` linhas; no máximo ``2 * workers`` blocos ficam em voo,
+    então a memória não cresce com o tamanho da planilha.
+    """
+    if workers <= 1:
+        for r, row in enumerate(rows, start=start):
+            rec = parse_row(row, cols)
+            if rec:
+                rec['row'] = r
+                yield rec
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque = deque()
+        chunk: List[Tuple[Any, ...]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                pending.append(pool.submit(_parse_chunk, (start, chunk, cols)))
+                start, chunk = start + len(chunk), []
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+        if chunk:
+            pending.append(pool.submit(_parse_chunk, (start, chunk, cols)))
+        while pending:
+            yield from pending.popleft().result()
+
+
+# ---------------------------
+# Importador
+# ---------------------------
+class InventoryImporter(BatchImporter):
+    """Importa linhas de inventário resolvendo associações contra mapas em memória.
+
+    Users, Clients, Projects, Status e as chaves de deduplicação de Equipment
+    são carregados uma única vez; cada linha custa apenas consultas a dicts.
+    As linhas são processadas em lotes de ``batch_size``, cada um com o seu
+    próprio commit: uma falha descarta apenas o lote em que ocorreu.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, on_progress=None):
+        super().__init__(batch_size=batch_size, on_progress=on_progress)
+        self._load_lookups()
+
+    # --- mapas ---------------------------------------------------------
+    def _load_lookups(self):
+        s = db.session
+        maps = name_maps()
+        self.users, self.clients = maps['users'], maps['clients']
+        self.projects, self.statuses = maps['projects'], maps['statuses']
+        self.emails = {e.lower() for (e,) in s.query(User.email)}
+        # Owner/Responsible/Location com erro de digitação casam com o cadastro existente
+        self.fuzzy = FuzzyNames(_name_key)
+        self.status_codes = {c for (c,) in s.query(Status.codigo) if c}
+
+        self.equipment_by_sn: Dict[str, int] = {}
+        self.equipment_by_pn_name: Dict[Tuple[str, str], int] = {}
+        self.equipment_names: Dict[int, str] = {}
+        # id -> fingerprint da última linha aplicada (re-importação incremental)
+        self.fingerprints: Dict[int, str] = {}
+        for i, sn, pn, name, fp in s.query(Equipment.id, Equipment.serial_number, Equipment.pn,
+                                           Equipment.name, Equipment.import_fingerprint):
+            self.equipment_names[i] = name
+            if fp:
+                self.fingerprints[i] = fp
+            if sn:
+                self.equipment_by_sn.setdefault(sn, i)
+            if pn and name:
+                self.equipment_by_pn_name.setdefault((pn, name), i)
+
+    def _unique_email(self, full_name: str) -> str:
+        base = _email_base(full_name)
+        email = f"{base}@autogen.local"
+        i = 1
+        while email in self.emails:
+            email = f"{base}{i}@autogen.local"
+            i += 1
+        self.emails.add(email)
+        return email
+
+    def _unique_status_code(self, name: str) -> str:
+        base = _status_code(name)
+        code, i = base, 1
+        while code in self.status_codes:
+            code = f"{base}_{i}"
+            i += 1
+        self.status_codes.add(code)
+        return code
+
+    # --- criação em lote das associações ---------------------------------
+    def _create_missing(self, records: List[Dict[str, str]]):
+        new_users: Dict[str, User] = {}
+        new_clients: Dict[str, Client] = {}
+        new_projects: Dict[str, Project] = {}
+        new_statuses: Dict[str, Status] = {}
+        # chave digitada -> chave do nome parecido ainda pendente neste lote
+        aliases: Dict[str, Dict[str, str]] = {'users': {}, 'clients': {}}
+
+        for rec in records:
+            for field in ('owner', 'responsible'):
+                name = rec[field]
+                key = _name_key(name)
+                if name and key not in self.users and key not in new_users \
+                        and not self._fuzzy('users', name, new_users, aliases['users']):
+                    new_users[key] = User(full_name=_normalize_name(name), email=self._unique_email(name),
+                                          password_hash=placeholder_password_hash(),
+                                          must_reset_password=True)
+                    self._add_fuzzy('users', name)
+            name = rec['location']
+            key = _name_key(name)
+            if name and key not in self.clients and key not in new_clients \
+                    and not self._fuzzy('clients', name, new_clients, aliases['clients']):
+                new_clients[key] = Client(tipo='PJ', nome_razao=_normalize_name(name),
+                                          endereco='Criado automaticamente pelo importador')
+                self._add_fuzzy('clients', name)
+            name = rec['project']
+            key = _name_key(name)
+            if name and key not in self.projects and key not in new_projects:
+                new_projects[key] = Project(name=name)
+            name = rec['status']
+            key = _name_key(name)
+            if name and key not in self.statuses and key not in new_statuses:
+                new_statuses[key] = Status(nome=name, codigo=self._unique_status_code(name))
+
+        created = [*new_users.values(), *new_clients.values(), *new_projects.values(), *new_statuses.values()]
+        if not created:
+            return
+        db.session.add_all(created)
+        db.session.flush()
+
+        for target, new, counter in (
+            (self.users, new_users, 'users'),
+            (self.clients, new_clients, 'clients'),
+            (self.projects, new_projects, 'projects'),
+            (self.statuses, new_statuses, 'statuses'),
+        ):
+            for k, obj in new.items():
+                self._set(target, k, obj.id)
+            if new:
+                self._count(counter, len(new))
+            for k, found in aliases.get(counter, {}).items():
+                self._set(target, k, new[found].id)
+
+    def _add_fuzzy(self, kind: str, name: str):
+        # Nome criado neste lote: some do índice se o lote for revertido
+        if self.fuzzy.add(kind, name):
+            self._on_rollback(lambda: self.fuzzy.remove(kind, name))
+
+    def _fuzzy(self, kind: str, name: str, pending: dict, aliases: Dict[str, str]) -> bool:
+        """Associa ``name`` a um cadastro parecido (erro de digitação), existente ou pendente no lote."""
+        key = _name_key(name)
+        if key in aliases:
+            return True
+        found = self.fuzzy.match(kind, name)
+        mapping = getattr(self, kind)
+        if found in mapping:
+            self._set(mapping, key, mapping[found])
+        elif found in pending:
+            aliases[key] = found
+        else:
+            return False
+        self._count('name_matches')
+        return True
+
+    @property
+    def job_details(self) -> Dict[str, Any]:
+        return {'name_matches': self.fuzzy.matches, 'name_review': self.fuzzy.review}
+
+    # --- API pública --------------------------------------------------------
+    def import_statuses(self, names: Iterable[Any]):
+        """Cria os Status listados (aba Sum) que ainda não existem."""
+        records = []
+        for val in names:
+            if not val:
+                continue
+            records.append({'owner': '', 'responsible': '', 'location': '', 'project': '',
+                            'status': str(val).strip()})
+        self._run_batch(self._create_missing, records)
+
+    # --- Equipment ----------------------------------------------------------
+    def _apply(self, records):
+        # Linhas idênticas à última importação não custam mais nada
+        changed = []
+        for rec in records:
+            # Calculado no parse quando ele roda em paralelo (iter_records)
+            fp = rec.get('fingerprint') or row_fingerprint(rec)
+            rec['fingerprint'] = fp
+            i = self._lookup_equipment(rec)
+            if isinstance(i, int) and self.fingerprints.get(i) == fp:
+                self._count('skipped')
+            else:
+                changed.append(rec)
+        records = changed
+        if not records:
+            return
+        self._create_missing(records)
+
+        # Linhas com SN vão para o upsert nativo (INSERT ... ON CONFLICT);
+        # as demais seguem pelo ORM. As linhas são resolvidas em ordem: um
+        # alvo pode ser um id existente, um Equipment do ORM ou o dict de
+        # valores de um equipamento novo pendente no upsert.
+        use_upsert = _upsert_insert() is not None
+
+        def upsertable(rec, i):
+            sn = rec['serial_number']
+            return use_upsert and sn and self.equipment_by_sn.get(sn) == i
+
+        # Carrega de uma vez os existentes que passarão pelo ORM
+        ids = set()
+        for rec in records:
+            i = self._lookup_equipment(rec)
+            if isinstance(i, int) and not upsertable(rec, i):
+                ids.add(i)
+        existing = {}
+        if ids:
+            existing = {e.id: e for e in Equipment.query.filter(Equipment.id.in_(ids))}
+
+        def load(i):
+            if i not in existing:
+                existing[i] = db.session.get(Equipment, i)
+            return existing[i]
+
+        # id -> única linha do lote para um existente; uma segunda linha
+        # para o mesmo equipamento leva ambas para o ORM, na ordem original.
+        single: Dict[int, Dict[str, Any]] = {}
+        new_rows, created = [], []
+        for rec in records:
+            target = self._lookup_equipment(rec)
+            if isinstance(target, int):
+                if target in single:
+                    self._merge(load(target), single.pop(target))
+                    self._count('updated')
+                elif target not in existing and upsertable(rec, target):
+                    single[target] = rec
+                    self._register_key(self.equipment_by_pn_name,
+                                       _pn_name_key(rec['pn'], self.equipment_names.get(target)),
+                                       target, target)
+                    continue
+                target = load(target)
+            if isinstance(target, dict):
+                self._merge_values(target, rec)
+                self._count('updated')
+            elif target is not None:
+                self._merge(target, rec)
+                self._count('updated')
+            elif use_upsert and rec['serial_number']:
+                values = self._new_values(rec)
+                new_rows.append(values)
+                self._register_key(self.equipment_by_sn, values['serial_number'], values, values)
+                self._register_key(self.equipment_by_pn_name, _pn_name_key(values['pn'], values['name']),
+                                   values, values)
+                self._count('created')
+            else:
+                e = Equipment(**self._new_values(rec))
+                created.append(e)
+                self._register(e, e)
+                self._count('created')
+
+        db.session.add_all(created)
+        db.session.flush()
+        for e in created:
+            self._register(e, e.id)
+            self._set(self.equipment_names, e.id, e.name)
+        for e in (*existing.values(), *created):
+            if e.import_fingerprint:
+                self._set(self.fingerprints, e.id, e.import_fingerprint)
+
+        rows = [*new_rows, *(self._new_values(rec) for rec in single.values())]
+        if single:
+            self._count('updated', len(single))
+        if rows:
+            self._upsert(rows)
+
+    def _upsert(self, rows: List[Dict[str, Any]]):
+        insert = _upsert_insert()
+        table = Equipment.__table__
+        c = table.c
+        now = datetime.utcnow()
+        for values in rows:
+            values.setdefault('created_at', now)
+            values['updated_at'] = now
+
+        stmt = insert(table)
+        ex = stmt.excluded
+        nl = literal('\n')
+        position = db.func.strpos if db.session.get_bind().dialect.name == 'postgresql' else db.func.instr
+        # Mesma semântica do merge via ORM: células vazias preservam o valor atual
+        # e a Obs só é anexada se ainda não estiver registrada.
+        notes = case(
+            (ex.notes.is_(None), c.notes),
+            (or_(c.notes.is_(None), c.notes == ''), ex.notes),
+            (position(nl + c.notes + nl, nl + ex.notes + nl) > 0, c.notes),
+            else_=c.notes + nl + ex.notes,
+        )
+        set_ = {
+            'pn': db.func.coalesce(ex.pn, c.pn),
+            'asset_tag': db.func.coalesce(db.func.nullif(c.asset_tag, ''), ex.asset_tag, c.pn),
+            'notes': notes,
+            'import_fingerprint': ex.import_fingerprint,
+            'updated_at': ex.updated_at,
+        }
+        for col in ('model_number', 'machine_installed', 'image_ref', 'location_id', 'project_id',
+                    'status_id', 'owner_id', 'current_responsible_id'):
+            set_[col] = db.func.coalesce(ex[col], c[col])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[c.serial_number],
+            index_where=SERIAL_NUMBER_PRESENT,
+            set_=set_,
+        )
+        db.session.execute(stmt, rows)
+
+        # ids das linhas gravadas, para os mapas dos próximos lotes
+        sns = [v['serial_number'] for v in rows]
+        ids = dict(db.session.query(Equipment.serial_number, Equipment.id)
+                   .filter(Equipment.serial_number.in_(sns)))
+        # Chaves do lote que apontavam para os valores pendentes passam ao id
+        written = {id(values): ids[values['serial_number']] for values in rows}
+        for mapping, key, _ in list(self._journal):
+            ref = mapping.get(key)
+            if isinstance(ref, dict) and id(ref) in written:
+                self._set(mapping, key, written[id(ref)])
+        for values in rows:
+            i = ids[values['serial_number']]
+            self._set(self.equipment_by_sn, values['serial_number'], i)
+            # O upsert não altera o nome de um equipamento já existente
+            name = self.equipment_names.get(i)
+            if name is None:
+                name = values['name']
+                self._set(self.equipment_names, i, name)
+            self._register_key(self.equipment_by_pn_name, _pn_name_key(values['pn'], name), values, i)
+            self._set(self.fingerprints, i, values['import_fingerprint'])
+
+    def _lookup_equipment(self, rec):
+        found = None
+        if rec['serial_number']:
+            found = self.equipment_by_sn.get(rec['serial_number'])
+        if found is None and rec['pn'] and rec['name']:
+            found = self.equipment_by_pn_name.get((rec['pn'], rec['name']))
+        return found
+
+    def _register_key(self, mapping, key, owner, ref):
+        # Chaves já ocupadas por outro equipamento não são sobrescritas
+        if key and (key not in mapping or mapping[key] is owner):
+            self._set(mapping, key, ref)
+
+    def _register(self, e: Equipment, ref):
+        # ref é o próprio objeto (ainda não gravado) ou o id após o flush
+        self._register_key(self.equipment_by_sn, e.serial_number, e, ref)
+        self._register_key(self.equipment_by_pn_name, (e.pn, e.name) if e.pn and e.name else None, e, ref)
+
+    def _refs(self, rec):
+        def get(mapping, name):
+            return mapping.get(_name_key(name)) if name else None
+        return {
+            'location_id': get(self.clients, rec['location']),
+            'project_id': get(self.projects, rec['project']),
+            'status_id': get(self.statuses, rec['status']),
+            'owner_id': get(self.users, rec['owner']),
+            'current_responsible_id': get(self.users, rec['responsible']),
+        }
+
+    def _new_values(self, rec) -> Dict[str, Any]:
+        pn = rec['pn']
+        return dict(
+            name=rec['name'],
+            pn=pn or None,
+            asset_tag=pn or None,
+            model_number=rec['model_number'] or None,
+            serial_number=rec['serial_number'] or None,
+            machine_installed=rec['machine_installed'] or None,
+            image_ref=rec['image_ref'] or None,
+            notes=rec['notes'] or None,
+            import_fingerprint=rec['fingerprint'],
+            **self._refs(rec),
+        )
+
+    def _merge_values(self, current: Dict[str, Any], rec):
+        """Aplica ``rec`` sobre os valores atuais (células vazias preservam o valor)."""
+        pn = rec['pn']
+        current['pn'] = pn or current.get('pn')
+        current['asset_tag'] = current.get('asset_tag') or pn or current['pn']
+        for attr in ('model_number', 'machine_installed', 'image_ref'):
+            current[attr] = rec[attr] or current.get(attr)
+        for attr, value in self._refs(rec).items():
+            if value is not None:
+                current[attr] = value
+        notes = current.get('notes')
+        # Obs já registrada numa importação anterior não é repetida
+        if rec['notes'] and f"\n{rec['notes']}\n" not in f"\n{notes or ''}\n":
+            current['notes'] = '\n'.join([v for v in [notes or '', rec['notes']] if v]).strip() or None
+        current['import_fingerprint'] = rec['fingerprint']
+
+    def _merge(self, existing: Equipment, rec):
+        values = {attr: getattr(existing, attr) for attr in _MERGED_ATTRS}
+        self._merge_values(values, rec)
+        for attr in _MERGED_ATTRS:
+            if getattr(existing, attr) != values[attr]:
+                setattr(existing, attr, values[attr])
+        if existing.id is not None:
+            self._register(existing, existing.id)
+
+
+_MERGED_ATTRS = ('pn', 'asset_tag', 'model_number', 'machine_installed', 'image_ref', 'location_id',
+                 'project_id', 'status_id', 'owner_id', 'current_responsible_id', 'notes',
+                 'import_fingerprint')
+
+
+def _pn_name_key(pn: Optional[str], name: Optional[str]):
+    return (pn, name) if pn and name else None
+
+
+def _upsert_insert():
+    """``insert`` com suporte a ON CONFLICT do dialeto em uso (SQLite/PostgreSQL), ou None."""
+    name = db.session.get_bind().dialect.name
+    if name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    if name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    return None
+
+
+def sum_statuses(wb) -> List[str]:
+    """Nomes da coluna Status da aba Sum (vazia se a aba não existir)."""
+    if 'Sum' not in wb.sheetnames:
+        return []
+    rows = wb['Sum'].iter_rows(values_only=True)
+    header = [str(v).strip().lower() if v else '' for v in next(rows, ())]
+    if 'status' not in header:
+        return []
+    col = header.index('status')
+    return [str(row[col]).strip() for row in rows if col < len(row) and row[col]]
+
+
+def _start_table(table: Table, importer: InventoryImporter) -> Tuple[int, Dict[str, Optional[int]]]:
+    """Importa os Status da aba Sum (XLSX) e localiza o cabeçalho da planilha principal.
+
+    Consome ``table.rows`` até o cabeçalho; as linhas seguintes são os dados.
+    """
+    # 1) Importar Status da aba "Sum" (se existir)
+    if table.workbook is not None:
+        importer.import_statuses(sum_statuses(table.workbook))
+
+    # 2) Cabeçalho da planilha principal (primeira aba)
+    header_row, header_vals = find_header(table.rows)
+    # Estimativa para o acompanhamento de progresso (dimensão declarada / nº de linhas)
+    if table.max_row:
+        importer.total_rows = max(table.max_row - header_row, 0)
+    return header_row, column_map(header_vals)
+
+
+def import_table(table: Table, batch_size: int = DEFAULT_BATCH_SIZE, on_progress=None) -> InventoryImporter:
+    """Importa Status (aba Sum, se existir) e equipamentos das linhas de ``table``."""
+    importer = InventoryImporter(batch_size=batch_size, on_progress=on_progress)
+    header_row, cols = _start_table(table, importer)
+    for rec in iter_records(table.rows, cols, header_row + 1):
+        importer.add(rec)
+    importer.finish()
+    return importer
+
+
+def import_workbook(wb, batch_size: int = DEFAULT_BATCH_SIZE, on_progress=None) -> InventoryImporter:
+    """Importa Status (aba Sum, se existir) e equipamentos (primeira aba)."""
+    ws = wb.active
+    table = Table(ws.iter_rows(values_only=True), max_row=ws.max_row, workbook=wb)
+    return import_table(table, batch_size=batch_size, on_progress=on_progress)
+
+
+def spool_upload(file_storage, suffix: str = '.xlsx') -> str:
+    """Copia o upload para um arquivo temporário em disco e retorna o caminho."""
+    fd, path = tempfile.mkstemp(suffix=suffix, prefix='import-')
+    with os.fdopen(fd, 'wb') as out:
+        shutil.copyfileobj(file_storage.stream, out, length=1024 * 1024)
+    return path
+
+
+def import_file(path: str, batch_size: int = DEFAULT_BATCH_SIZE, on_progress=None,
+                workers: int = 0) -> InventoryImporter:
+    """Importa um XLSX/CSV/TSV do disco em modo streaming (memória constante).
+
+    Com ``workers`` > 0, leitura e parse rodam num processo separado (com
+    ``workers`` processos de parse) enquanto este processo grava os lotes.
+    """
+    with open_table(path) as table:
+        if not workers:
+            return import_table(table, batch_size=batch_size, on_progress=on_progress)
+        importer = InventoryImporter(batch_size=batch_size, on_progress=on_progress)
+        header_row, cols = _start_table(table, importer)
+
+    for rec in _records_from_process(path, header_row, cols, workers):
+        importer.add(rec)
+    importer.finish()
+    return importer
+
+
+def _produce_records(path: str, header_row: int, cols, workers: int, out):
+    """Processo leitor: lê o arquivo e envia blocos de registros já normalizados."""
+    try:
+        with open_table(path) as table:
+            rows = islice(table.rows, header_row, None)
+            block = []
+            for rec in iter_records(rows, cols, header_row + 1, workers=workers):
+                block.append(rec)
+                if len(block) >= PARSE_CHUNK_SIZE:
+                    out.put(block)
+                    block = []
+            if block:
+                out.put(block)
+        out.put(None)
+    except Exception as exc:
+        out.put(InventoryImportError(f"Falha ao ler a planilha: {exc}"))
+
+
+def _records_from_process(path: str, header_row: int, cols, workers: int) -> Iterator[Dict[str, Any]]:
+    # Fila limitada: o leitor não se adianta mais que alguns blocos do escritor
+    out = multiprocessing.Queue(maxsize=4)
+    reader = multiprocessing.Process(target=_produce_records, args=(path, header_row, cols, workers, out),
+                                     name='inventory-reader')
+    reader.start()
+    try:
+        while True:
+            block = out.get()
+            if block is None:
+                break
+            if isinstance(block, Exception):
+                raise block
+            yield from block
+    finally:
+        if reader.is_alive():
+            reader.terminate()
+        reader.join()
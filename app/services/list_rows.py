@@ -0,0 +1,97 @@
+# app/services/list_rows.py
+"""Consultas das telas de listagem.
+
+Cada função devolve uma query que seleciona só as colunas exibidas (com os
+nomes das associações via JOIN), em ``Row`` — tuplas nomeadas, sem identity
+map nem estado do ORM. Textos longos exibidos na lista chegam truncados pelo
+próprio banco; os demais (``Equipment.notes``, ``Activity.machines_text``)
+nem são lidos.
+
+As rotas aplicam filtros sobre as colunas dos modelos normalmente e paginam
+com ``keyset_paginate`` (as colunas de ordenação estão sempre no SELECT).
+"""
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+
+from ..extensions import db
+from ..models import (Activity, Client, Dealer, Equipment, FunctionalArea, Position, Project, Stakeholder,
+                      Status, User)
+
+# Caracteres de descrições exibidos na listagem (a célula é truncada na tela)
+EXCERPT_LENGTH = 200
+
+
+def _excerpt(column):
+    return func.substr(column, 1, EXCERPT_LENGTH).label(column.key)
+
+
+def equipment_rows():
+    return (db.session.query(
+        Equipment.id, Equipment.name, Equipment.pn, Equipment.model_number, Equipment.serial_number,
+        Equipment.machine_installed, Equipment.category, Equipment.brand, Equipment.created_at,
+        Status.nome.label('status_nome'),
+    ).outerjoin(Status, Equipment.status_id == Status.id))
+
+
+def activity_rows():
+    owner, executor = aliased(User), aliased(User)
+    return (db.session.query(
+        Activity.id, Activity.description, Activity.environment, Activity.start_date, Activity.end_date,
+        Activity.created_at,
+        Client.nome_razao.label('client_name'), Dealer.razao_social.label('dealer_name'),
+        owner.full_name.label('owner_name'), executor.full_name.label('executor_name'),
+        Project.name.label('project_name'), Status.nome.label('status_nome'),
+    )
+        .outerjoin(Client, Activity.client_id == Client.id)
+        .outerjoin(Dealer, Activity.dealer_id == Dealer.id)
+        .outerjoin(owner, Activity.owner_user_id == owner.id)
+        .outerjoin(executor, Activity.executor_user_id == executor.id)
+        .outerjoin(Project, Activity.project_id == Project.id)
+        .outerjoin(Status, Activity.status_id == Status.id))
+
+
+def stakeholder_rows():
+    return (db.session.query(
+        Stakeholder.id, Stakeholder.name, Stakeholder.tipo, Stakeholder.email, Stakeholder.phone,
+        Stakeholder.created_at,
+        Client.nome_razao.label('client_name'), Position.name.label('position_name'),
+        FunctionalArea.name.label('area_name'),
+    )
+        .outerjoin(Client, Stakeholder.client_id == Client.id)
+        .outerjoin(Position, Stakeholder.position_id == Position.id)
+        .outerjoin(FunctionalArea, Position.functional_area_id == FunctionalArea.id))
+
+
+def position_rows():
+    return (db.session.query(Position.id, Position.name, Position.created_at,
+                             FunctionalArea.name.label('area_name'))
+            .outerjoin(FunctionalArea, Position.functional_area_id == FunctionalArea.id))
+
+
+def functional_area_rows():
+    return db.session.query(FunctionalArea.id, FunctionalArea.name, FunctionalArea.created_at)
+
+
+def project_rows():
+    return db.session.query(Project.id, Project.name, _excerpt(Project.description))
+
+
+def status_rows():
+    return db.session.query(Status.id, Status.codigo, Status.nome, Status.cor, Status.ativo,
+                            Status.created_at, _excerpt(Status.descricao))
+
+
+def client_rows():
+    return db.session.query(
+        Client.id, Client.org_id, Client.nome_razao, Client.endereco, Client.cpf, Client.cnpj,
+        Client.email, Client.telefone, Client.representante_email, Client.representante_telefone,
+        Client.created_at,
+    )
+
+
+def dealer_rows():
+    return db.session.query(
+        Dealer.id, Dealer.razao_social, Dealer.cnpj, Dealer.endereco, Dealer.representante_nome,
+        Dealer.representante_email, Dealer.representante_telefone, Dealer.representante_funcao,
+        Dealer.created_at,
+    )
@@ -0,0 +1,136 @@
+# app/services/metrics.py
+"""Indicadores da página inicial.
+
+Todos os números saem de UM comando (``UNION ALL`` de contagens agrupadas) e
+ficam em cache por processo. A validade segue os contadores ``table:<tabela>``
+de ``services.change_tracking``: escrita confirmada em qualquer processo muda a
+versão e a próxima visita recalcula; as do próprio processo descartam o cache
+no commit. Os recortes por data ("este mês", "em aberto") usam o dia corrente
+na chave, então o cache também vira à meia-noite.
+"""
+import threading
+from datetime import date
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Integer, String, cast, func, literal, null, or_, select, union_all
+
+from ..extensions import db
+from ..models import Activity, Client, Dealer, Equipment, Project, Status, User
+from . import change_tracking
+
+# Linhas exibidas nos agrupamentos longos (locais, executores); o resto vira "Outros"
+TOP_N = 10
+
+# Tabelas lidas pelo comando (inclui as dos rótulos)
+TABLES = ('clients', 'dealers', 'equipment', 'projects', 'statuses', 'activities', 'users')
+
+# Contagens simples (sem agrupamento)
+TOTALS = ('clients', 'dealers', 'equipment', 'projects', 'activities_open')
+
+
+class Group(NamedTuple):
+    id: Optional[int]
+    label: Optional[str]  # None: registros sem a associação (sem status, sem local...)
+    count: int
+
+
+class Dashboard(NamedTuple):
+    totals: Dict[str, int]
+    equipment_by_status: Tuple[Group, ...]
+    equipment_by_location: Tuple[Group, ...]
+    activities_by_environment: Tuple[Group, ...]
+    activities_by_status: Tuple[Group, ...]
+    open_by_executor: Tuple[Group, ...]
+    month_start: date
+    today: date
+
+
+_KEYS = [change_tracking.table_key(t) for t in TABLES]
+
+# url do banco -> (chave de validade, indicadores)
+_cache: Dict[str, Tuple[tuple, Dashboard]] = {}
+_lock = threading.Lock()
+
+
+def dashboard(today: Optional[date] = None) -> Dashboard:
+    today = today or date.today()
+    versions = change_tracking.versions()
+    stamp = (today,) + tuple(versions.get(k, (0, None))[0] for k in _KEYS)
+    url = str(db.engine.url)
+    cached = _cache.get(url)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    result = _load(today)
+    with _lock:
+        _cache[url] = (stamp, result)
+    return result
+
+
+def _stmt(month_start: date, next_month: date, today: date):
+    def row(kpi, id_col=None, label_col=None):
+        return [literal(kpi).label('kpi'),
+                (id_col if id_col is not None else cast(null(), Integer)).label('id'),
+                (cast(label_col, String) if label_col is not None else cast(null(), String)).label('label'),
+                func.count().label('n')]
+
+    in_month = (Activity.start_date >= month_start, Activity.start_date < next_month)
+    is_open = or_(Activity.end_date.is_(None), Activity.end_date >= today)
+    return union_all(
+        select(*row('clients')).select_from(Client),
+        select(*row('dealers')).select_from(Dealer),
+        select(*row('equipment')).select_from(Equipment),
+        select(*row('projects')).select_from(Project),
+        select(*row('activities_open')).select_from(Activity).where(is_open),
+        select(*row('equipment_by_status', Equipment.status_id, Status.nome))
+        .select_from(Equipment).outerjoin(Status, Equipment.status_id == Status.id)
+        .group_by(Equipment.status_id, Status.nome),
+        select(*row('equipment_by_location', Equipment.location_id, Client.nome_razao))
+        .select_from(Equipment).outerjoin(Client, Equipment.location_id == Client.id)
+        .group_by(Equipment.location_id, Client.nome_razao),
+        select(*row('activities_by_environment', None, Activity.environment))
+        .where(*in_month).group_by(Activity.environment),
+        select(*row('activities_by_status', Activity.status_id, Status.nome))
+        .select_from(Activity).outerjoin(Status, Activity.status_id == Status.id)
+        .where(*in_month).group_by(Activity.status_id, Status.nome),
+        select(*row('open_by_executor', Activity.executor_user_id, User.full_name))
+        .select_from(Activity).outerjoin(User, Activity.executor_user_id == User.id)
+        .where(is_open).group_by(Activity.executor_user_id, User.full_name),
+    )
+
+
+def _top(groups, limit=None):
+    ordered = sorted(groups, key=lambda g: (-g.count, g.label or ''))
+    if limit is None or len(ordered) <= limit:
+        return tuple(ordered)
+    rest = sum(g.count for g in ordered[limit:])
+    return tuple(ordered[:limit]) + (Group(None, 'Outros', rest),)
+
+
+def _load(today: date) -> Dashboard:
+    month_start = today.replace(day=1)
+    next_month = (month_start.replace(year=month_start.year + 1, month=1) if month_start.month == 12
+                  else month_start.replace(month=month_start.month + 1))
+    totals: Dict[str, int] = {}
+    groups: Dict[str, list] = {}
+    for kpi, id_, label, n in db.session.execute(_stmt(month_start, next_month, today)):
+        if kpi in TOTALS:
+            totals[kpi] = n
+        else:
+            groups.setdefault(kpi, []).append(Group(id_, label, n))
+    return Dashboard(
+        totals=totals,
+        equipment_by_status=_top(groups.get('equipment_by_status', ())),
+        equipment_by_location=_top(groups.get('equipment_by_location', ()), TOP_N),
+        activities_by_environment=_top(groups.get('activities_by_environment', ())),
+        activities_by_status=_top(groups.get('activities_by_status', ())),
+        open_by_executor=_top(groups.get('open_by_executor', ()), TOP_N),
+        month_start=month_start,
+        today=today,
+    )
+
+
+@change_tracking.on_commit
+def _evict(names):
+    if any(k in names for k in _KEYS):
+        with _lock:
+            _cache.clear()
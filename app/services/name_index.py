@@ -0,0 +1,191 @@
+# app/services/name_index.py
+"""Casamento aproximado de nomes (Users e Clients) nas importações.
+
+Os nomes já passam por ``_name_key`` (sem acento, espaços colapsados,
+casefold); este índice cobre o que sobra: erros de digitação como
+"Joao Slva" x "João Silva". Um índice invertido trigrama -> nomes gera os
+candidatos e a distância de edição decide.
+
+Como cada edição destrói no máximo 3 trigramas, um nome a até ``k`` edições
+compartilha ao menos um dos ``3k + 1`` trigramas mais raros da consulta:
+só as listas desses trigramas são percorridas, e a busca continua abaixo de
+1 ms com dezenas de milhares de nomes.
+"""
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..extensions import db
+from ..models import Client, User
+
+# Edições toleradas para associar automaticamente (nomes com 12+ caracteres: 2)
+FUZZY_MAX_EDITS = 1
+FUZZY_MAX_EDITS_LONG = 2
+# Até quantas edições um nome parecido é informado para revisão (e um novo é criado);
+# também limita a busca: cada edição a mais multiplica os candidatos verificados
+FUZZY_REVIEW_EDITS = 2
+# Nomes curtos demais geram candidatos pouco confiáveis
+_MIN_KEY_LENGTH = 5
+MAX_REPORTED_MATCHES = 20
+
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Distância de edição com transposições (OSA), limitada a ``limit`` (acima: ``limit + 1``).
+
+    Só a faixa diagonal |i - j| <= limit da matriz é calculada.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    prev2, prev = None, [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        cur = [over] * (len(b) + 1)
+        if i <= limit:
+            cur[0] = i
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        for j in range(lo, hi + 1):
+            cost = a[i - 1] != b[j - 1]
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if cost and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                v = min(v, prev2[j - 2] + 1)
+            cur[j] = v if v <= limit else over
+        if min(cur[lo - 1:hi + 1]) > limit:
+            return over
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _ending_changed(a: str, b: str) -> bool:
+    """Alguma palavra difere só na última letra ("Mario" x "Maria", "Paulo" x "Paula")?"""
+    ta, tb = a.split(), b.split()
+    return len(ta) == len(tb) and any(
+        x != y and len(x) == len(y) and x[:-1] == y[:-1] for x, y in zip(ta, tb))
+
+
+class TrigramIndex:
+    """Índice invertido de trigramas sobre chaves normalizadas."""
+
+    def __init__(self):
+        self._labels: List[str] = []
+        self._keys: List[str] = []
+        self._grams: List[frozenset] = []
+        self._digits: List[Tuple[str, ...]] = []
+        self._postings: Dict[str, List[int]] = {}
+        # chave -> posição nas listas acima
+        self._positions: Dict[str, int] = {}
+
+    def add(self, key: str, label: Optional[str] = None) -> bool:
+        """Indexa ``key``; False se vazia ou já indexada."""
+        if not key or key in self._positions:
+            return False
+        n = self._positions[key] = len(self._keys)
+        self._keys.append(key)
+        self._labels.append(label or key)
+        self._digits.append(tuple(_DIGITS_RE.findall(key)))
+        grams = frozenset(trigrams(key))
+        self._grams.append(grams)
+        for g in grams:
+            self._postings.setdefault(g, []).append(n)
+        return True
+
+    def remove(self, key: str):
+        """Tira ``key`` das buscas (a posição fica vaga nas listas)."""
+        n = self._positions.pop(key, None)
+        if n is None:
+            return
+        for g in self._grams[n]:
+            self._postings[g].remove(n)
+
+    def search(self, key: str, max_edits: int = FUZZY_REVIEW_EDITS) -> List[Tuple[int, str, str]]:
+        """Candidatos a até ``max_edits`` edições: (distância, chave, rótulo), do mais próximo."""
+        if len(key) < _MIN_KEY_LENGTH:
+            return []
+        grams = trigrams(key)
+        rare = sorted(grams, key=lambda g: len(self._postings.get(g, ())))
+        candidates: Set[int] = set()
+        for g in rare[:3 * max_edits + 1]:
+            candidates.update(self._postings.get(g, ()))
+        # Filtro de contagem: a até k edições, no máximo 3k trigramas diferem
+        min_shared = len(grams) - 3 * max_edits
+        digits = tuple(_DIGITS_RE.findall(key))
+        found = []
+        for n in candidates:
+            other = self._keys[n]
+            # "Owner 1" x "Owner 11": números diferentes nunca são o mesmo nome
+            if (other == key or abs(len(other) - len(key)) > max_edits or self._digits[n] != digits
+                    or len(grams & self._grams[n]) < min_shared):
+                continue
+            d = edit_distance(key, other, max_edits)
+            if d <= max_edits:
+                found.append((d, other, self._labels[n]))
+        found.sort()
+        return found
+
+
+class FuzzyNames:
+    """Casa, por similaridade, nomes de Users/Clients ausentes dos mapas exatos.
+
+    Devolve a chave normalizada do nome parecido; quem chama decide o id (o
+    importador consulta os próprios mapas, então um lote revertido não deixa
+    casamentos apontando para linhas inexistentes).
+    """
+
+    # tipo -> (nome, chave normalizada gravada, rótulo)
+    KINDS = {'users': (User.full_name, User.full_name_norm, 'Usuário'),
+             'clients': (Client.nome_razao, Client.nome_razao_norm, 'Cliente')}
+
+    def __init__(self, name_key):
+        self.name_key = name_key
+        self.indexes: Dict[str, TrigramIndex] = {}
+        for kind, (column, norm, _) in self.KINDS.items():
+            index = self.indexes[kind] = TrigramIndex()
+            for name, key in db.session.query(column, norm):
+                index.add(key, name)
+        # (tipo, chave) -> chave casada (ou None), para não repetir a busca
+        self._matched: Dict[Tuple[str, str], Optional[str]] = {}
+        self.matches: List[str] = []
+        self.review: List[str] = []
+
+    def add(self, kind: str, name: str) -> bool:
+        """Registra um nome novo (casamentos das próximas linhas); False se já existia."""
+        return self.indexes[kind].add(self.name_key(name), name)
+
+    def remove(self, kind: str, name: str):
+        """Desfaz ``add`` (nome de um lote revertido): nem ele nem os casamentos com ele valem mais."""
+        key = self.name_key(name)
+        self.indexes[kind].remove(key)
+        for memo in [m for m, found in self._matched.items() if m[0] == kind and found == key]:
+            del self._matched[memo]
+
+    def match(self, kind: str, name: str) -> Optional[str]:
+        """Chave do nome parecido o bastante com ``name``, ou None."""
+        key = self.name_key(name)
+        if (kind, key) not in self._matched:
+            self._matched[(kind, key)] = self._search(kind, key, name)
+        return self._matched[(kind, key)]
+
+    def _search(self, kind: str, key: str, name: str) -> Optional[str]:
+        label = self.KINDS[kind][2]
+        candidates = self.indexes[kind].search(key)
+        if not candidates:
+            return None
+        d, found, found_label = candidates[0]
+        allowed = FUZZY_MAX_EDITS_LONG if len(key) >= 12 else FUZZY_MAX_EDITS
+        # Dois candidatos à mesma distância: não escolhe por conta própria
+        ambiguous = len(candidates) > 1 and candidates[1][0] == d
+        if d <= allowed and not ambiguous and not _ending_changed(key, found):
+            self._report(self.matches, f"{label} {name!r} associado a {found_label!r}")
+            return found
+        self._report(self.review, f"{label} {name!r} criado; parecido com {found_label!r}")
+        return None
+
+    @staticmethod
+    def _report(target: List[str], message: str):
+        if len(target) < MAX_REPORTED_MATCHES:
+            target.append(message)
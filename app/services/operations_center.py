@@ -3,9 +3,183 @@
 import os
 import base64
 import datetime
+import email.utils
+import random
+import threading
+import time
 import urllib.parse
 import requests
-from typing import Dict, Any, List, Optional
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Iterator, Optional
+
+# Transporte HTTP (variáveis do .env, como as credenciais abaixo)
+OC_HTTP_POOL_SIZE = int(os.getenv('OC_HTTP_POOL_SIZE', '10'))          # conexões keep-alive por host
+OC_HTTP_RETRIES = int(os.getenv('OC_HTTP_RETRIES', '3'))               # novas tentativas (só GET)
+OC_HTTP_BACKOFF = float(os.getenv('OC_HTTP_BACKOFF', '0.5'))           # base do backoff exponencial (s)
+OC_HTTP_BACKOFF_MAX = float(os.getenv('OC_HTTP_BACKOFF_MAX', '8'))     # teto de cada espera (s)
+OC_HTTP_RETRY_AFTER_MAX = float(os.getenv('OC_HTTP_RETRY_AFTER_MAX', '10'))  # Retry-After maior: não espera
+OC_BREAKER_THRESHOLD = int(os.getenv('OC_BREAKER_THRESHOLD', '5'))     # falhas seguidas para abrir
+OC_BREAKER_COOLDOWN = float(os.getenv('OC_BREAKER_COOLDOWN', '30'))    # segundos aberto antes de testar
+OC_PAGE_SIZE = int(os.getenv('OC_PAGE_SIZE', '100'))                   # itens por página da Equipment API
+
+# Respostas que valem nova tentativa (sobrecarga/instabilidade do upstream)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class CircuitOpenError(Exception):
+    """Upstream marcado como indisponível: a chamada nem foi feita."""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Operations Center indisponível ({host}); tente em {retry_after:.0f}s.")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Disjuntor por host.
+
+    Após ``threshold`` falhas seguidas (erro de rede, timeout ou 5xx) fica
+    aberto por ``cooldown`` segundos e as chamadas falham na hora. Passado o
+    prazo, UMA chamada de teste segue; sucesso fecha, falha reabre. Um 429
+    com Retry-After também segura as chamadas até o prazo pedido.
+    """
+
+    def __init__(self, host: str, threshold: int = OC_BREAKER_THRESHOLD, cooldown: float = OC_BREAKER_COOLDOWN):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+
+    def before_call(self):
+        with self._lock:
+            now = time.monotonic()
+            if now < self._open_until:
+                raise CircuitOpenError(self.host, self._open_until - now)
+            if self._failures >= self.threshold:
+                if self._probing:
+                    raise CircuitOpenError(self.host, self.cooldown)
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._failures >= self.threshold:
+                self._open_until = time.monotonic() + self.cooldown
+
+    def hold(self, seconds: float):
+        with self._lock:
+            self._probing = False
+            self._open_until = max(self._open_until, time.monotonic() + seconds)
+
+
+_session: Optional[requests.Session] = None
+_breakers: Dict[str, CircuitBreaker] = {}
+_transport_lock = threading.Lock()
+
+
+def http_session() -> requests.Session:
+    """Sessão compartilhada pelo processo (pool de conexões keep-alive).
+
+    Só headers/timeouts por chamada, sem cookies nem estado: o pool do
+    urllib3 pode ser usado por várias threads ao mesmo tempo.
+    """
+    global _session
+    if _session is None:
+        with _transport_lock:
+            if _session is None:
+                session = requests.Session()
+                # max_retries=0: as novas tentativas são feitas em _request (com o disjuntor)
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=OC_HTTP_POOL_SIZE, max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def _breaker(url: str) -> CircuitBreaker:
+    host = urllib.parse.urlsplit(url).netloc
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _transport_lock:
+            breaker = _breakers.setdefault(host, CircuitBreaker(host))
+    return breaker
+
+
+def _backoff(attempt: int) -> float:
+    # "Full jitter": espera aleatória até o teto exponencial (evita rajadas sincronizadas)
+    return random.uniform(0, min(OC_HTTP_BACKOFF_MAX, OC_HTTP_BACKOFF * (2 ** attempt)))
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    value = resp.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+def _request(method: str, url: str, **kwargs) -> requests.Response:
+    """Chamada HTTP ao Operations Center pelo pool compartilhado.
+
+    GET (idempotente) é repetido até ``OC_HTTP_RETRIES`` vezes em erro de
+    rede/timeout ou status de ``RETRY_STATUSES``, com backoff exponencial com
+    jitter; o Retry-After do servidor (429/503) tem prioridade, até
+    ``OC_HTTP_RETRY_AFTER_MAX``. POST (troca/renovação de token) é enviado uma
+    vez só. Disjuntor aberto: ``CircuitOpenError`` sem chamar o upstream.
+    """
+    breaker = _breaker(url)
+    attempts = 1 + (OC_HTTP_RETRIES if method.upper() in IDEMPOTENT_METHODS else 0)
+    for attempt in range(attempts):
+        last = attempt + 1 >= attempts
+        breaker.before_call()
+        try:
+            resp = http_session().request(method, url, **kwargs)
+        except requests.RequestException:
+            breaker.record_failure()
+            if last:
+                raise
+            time.sleep(_backoff(attempt))
+            continue
+        except BaseException:
+            # Qualquer outra saída (kwarg inválido, hook/adaptador) também
+            # encerra a chamada de teste; senão o disjuntor fica preso aberto
+            breaker.record_failure()
+            raise
+
+        retry_after = _retry_after(resp)
+        wait = retry_after if retry_after is not None else _backoff(attempt)
+        if resp.status_code == 429:
+            # Limite de taxa: upstream saudável, mas as demais chamadas esperam o prazo
+            breaker.hold(wait)
+        elif resp.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        if last or resp.status_code not in RETRY_STATUSES:
+            return resp
+        if wait > OC_HTTP_RETRY_AFTER_MAX:
+            return resp
+        resp.close()
+        time.sleep(wait)
+    return resp
 
 
 class OperationsCenterClient:
@@ -39,7 +213,7 @@ class OperationsCenterClient:
     def get_metadata(self) -> Dict[str, Any]:
         self._ensure_env()
         if self._metadata_cache is None:
-            r = requests.get(self.well_known, timeout=10)
+            r = _request('GET', self.well_known, timeout=10)
             r.raise_for_status()
             self._metadata_cache = r.json()
         return self._metadata_cache
@@ -77,7 +251,7 @@ class OperationsCenterClient:
             "code": code,
             "scope": self.scopes,
         }
-        r = requests.post(token_endpoint, headers=headers, data=payload, timeout=15)
+        r = _request('POST', token_endpoint, headers=headers, data=payload, timeout=15)
         r.raise_for_status()
         self._update_tokens(r.json())
 
@@ -92,7 +266,7 @@ class OperationsCenterClient:
             "Content-Type": "application/x-www-form-urlencoded",
         }
         payload = {"grant_type": "refresh_token", "refresh_token": self.refresh_token}
-        r = requests.post(token_endpoint, headers=headers, data=payload, timeout=15)
+        r = _request('POST', token_endpoint, headers=headers, data=payload, timeout=15)
         r.raise_for_status()
         self._update_tokens(r.json())
 
@@ -114,34 +288,53 @@ class OperationsCenterClient:
         headers = {
             "authorization": f"Bearer {self.access_token}",
             "Accept": "application/vnd.deere.axiom.v3+json",
-            "No_paging": "true",
-            "x-deere-no-paging": "true",
         }
-        return requests.get(url, headers=headers, timeout=30)
+        return _request('GET', url, headers=headers, timeout=30)
 
-    def get_machines_by_org(self, org_id: str, embed_devices: bool = False) -> List[Dict[str, Any]]:
+    def get_machines_by_org(self, org_id: str, embed_devices: bool = False,
+                            page_size: int = OC_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Máquinas da organização, página a página (link ``nextPage`` da API).
+
+        Gerador: cada página é pedida quando a anterior termina de ser
+        consumida, então só uma fica em memória. Erro em qualquer página
+        levanta ``RuntimeError`` (como antes) no ponto em que ela é pedida.
+        """
         url = f"https://equipmentapi.deere.com/isg/equipment?organizationIds={org_id}"
         if embed_devices:
             url += "&embed=devices"
-        url += "&pageOffset=0&itemLimit=1000"
-        r = self._api_get(url)
-        if r.status_code != 200:
-            raise RuntimeError(f"OC API error {r.status_code}: {r.content}")
-        out: List[Dict[str, Any]] = []
-        data = r.json()
-        for m in data.get('values', []):
-            try:
-                if m.get('@type') != "Machine": continue
-                if not m.get('isSerialNumberCertified', False): continue
-                if m.get('archived') is True or m.get('decommissioned') is True or m.get('stolen') is True: continue
-                item = {
-                    "serialNumber": m.get('serialNumber'),
-                    "name": m.get('name'),
-                    "model": (m.get('model') or {}).get('name'),
-                    "type": (m.get('type') or {}).get('name'),
-                    "year": m.get('modelYear'),
-                }
-                out.append(item)
-            except Exception:
-                continue
-        return out
+        url += f"&pageOffset=0&itemLimit={page_size}"
+        seen = set()
+        while url and url not in seen:
+            seen.add(url)
+            r = self._api_get(url)
+            if r.status_code != 200:
+                raise RuntimeError(f"OC API error {r.status_code}: {r.content}")
+            data = r.json()
+            for m in data.get('values', []):
+                item = _machine_item(m)
+                if item is not None:
+                    yield item
+            url = _next_page(data)
+
+
+def _next_page(data: Dict[str, Any]) -> Optional[str]:
+    for link in data.get('links') or []:
+        if link.get('rel') == 'nextPage':
+            return link.get('uri')
+    return None
+
+
+def _machine_item(m: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        if m.get('@type') != "Machine": return None
+        if not m.get('isSerialNumberCertified', False): return None
+        if m.get('archived') is True or m.get('decommissioned') is True or m.get('stolen') is True: return None
+        return {
+            "serialNumber": m.get('serialNumber'),
+            "name": m.get('name'),
+            "model": (m.get('model') or {}).get('name'),
+            "type": (m.get('type') or {}).get('name'),
+            "year": m.get('modelYear'),
+        }
+    except Exception:
+        return None
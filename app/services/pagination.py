@@ -0,0 +1,154 @@
+# app/services/pagination.py
+"""Paginação por cursor (keyset) das telas de listagem.
+
+Em vez de ``OFFSET``, cada página guarda a chave de ordenação da primeira e
+da última linha; a página seguinte filtra ``(chave) < (última)`` e usa o
+índice da ordenação, então o custo não cresce com o número de páginas
+percorridas nem com o tamanho da tabela.
+
+O ``id`` entra sempre como desempate, para que a ordem seja total.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from flask import current_app, request, url_for
+from sqlalchemy import and_, or_, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass
+class KeysetPage:
+    items: List[Any]
+    per_page: int
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    # Demais argumentos da querystring (filtros), repassados nos links
+    args: dict = field(default_factory=dict)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def url(self, **cursor) -> str:
+        """URL da mesma listagem (mesmos filtros) com o cursor dado."""
+        return url_for(request.endpoint, **(request.view_args or {}), **self.args, **cursor)
+
+
+def _encode(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values],
+                     separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _decode(cursor: str, columns: Sequence[Any]) -> Optional[List[Any]]:
+    """Valores da chave no cursor, convertidos ao tipo das colunas (None se inválido)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(values, list) or len(values) != len(columns):
+        return None
+    out = []
+    for value, column in zip(values, columns):
+        kind = column.type.python_type
+        try:
+            if value is None:
+                out.append(None)
+            elif kind is datetime:
+                out.append(datetime.fromisoformat(value))
+            elif kind is date:
+                out.append(date.fromisoformat(value))
+            else:
+                out.append(kind(value))
+        except (TypeError, ValueError):
+            return None
+    return out
+
+
+def _after(columns: Sequence[Any], descending: Sequence[bool], values: Sequence[Any]):
+    """Linhas depois de ``values`` na ordem dada."""
+    if len(set(descending)) == 1:
+        # Direção única: comparação de tuplas, que o índice composto atende
+        key, bound = tuple_(*columns), tuple_(*values)
+        return key < bound if descending[0] else key > bound
+    clauses = []
+    for i, (column, desc) in enumerate(zip(columns, descending)):
+        step = column < values[i] if desc else column > values[i]
+        clauses.append(and_(*(c == v for c, v in zip(columns[:i], values[:i])), step))
+    return or_(*clauses)
+
+
+def page_size() -> int:
+    """``per_page`` da querystring, limitado a ``LIST_MAX_PAGE_SIZE``."""
+    config = current_app.config
+    default = config.get('LIST_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    limit = config.get('LIST_MAX_PAGE_SIZE', MAX_PAGE_SIZE)
+    size = request.args.get('per_page', type=int) or default
+    return max(1, min(size, limit))
+
+
+def keyset_paginate(query, order: Sequence[Tuple[Any, bool]], id_column,
+                    per_page: Optional[int] = None) -> KeysetPage:
+    """Página de ``query`` ordenada por ``order`` [(coluna, desc), ...] + ``id_column``.
+
+    Lê ``after``/``before`` (cursores) e ``per_page`` (se não informado) de ``request.args``.
+    """
+    columns = [c for c, _ in order] + [id_column]
+    descending = [d for _, d in order]
+    descending.append(descending[-1] if descending else False)
+    per_page = per_page or page_size()
+
+    after, before = request.args.get('after'), request.args.get('before')
+    if before and (values := _decode(before, columns)) is not None:
+        # Página anterior: percorre na ordem inversa e desvira no fim
+        rows, more = _fetch(query.filter(_after(columns, [not d for d in descending], values)),
+                            columns, [not d for d in descending], per_page)
+        rows.reverse()
+        if not more:
+            # Chegou ao início: mostra a primeira página cheia
+            rows, more = _fetch(query, columns, descending, per_page)
+            return _page(rows, columns, per_page, next_=more)
+        return _page(rows, columns, per_page, next_=True, prev=True)
+
+    if after and (values := _decode(after, columns)) is not None:
+        rows, more = _fetch(query.filter(_after(columns, descending, values)), columns, descending, per_page)
+        return _page(rows, columns, per_page, next_=more, prev=True)
+
+    rows, more = _fetch(query, columns, descending, per_page)
+    return _page(rows, columns, per_page, next_=more)
+
+
+def _fetch(query, columns, descending, per_page):
+    query = query.order_by(*(c.desc() if d else c.asc() for c, d in zip(columns, descending)))
+    rows = query.limit(per_page + 1).all()
+    return rows[:per_page], len(rows) > per_page
+
+
+def _page(rows, columns, per_page, next_=False, prev=False) -> KeysetPage:
+    def key(row):
+        return _encode([getattr(row, c.key) for c in columns])
+
+    args = {k: v for k, v in request.args.items() if k not in ('after', 'before')}
+    page = KeysetPage(items=rows, per_page=per_page, args=args)
+    if rows and next_:
+        page.next_cursor = key(rows[-1])
+    if rows and prev:
+        page.prev_cursor = key(rows[0])
+    return page
@@ -0,0 +1,151 @@
+# app/services/reference_data.py
+"""Listas de referência ``(id, rótulo)`` dos selects, em cache por processo.
+
+Cada lista (``LISTS``) tem um contador em ``cache_versions``
+(``services.change_tracking``). Todo flush que cria/exclui registros dos
+modelos observados, ou altera as colunas que a lista exibe/ordena, incrementa
+o contador na MESMA transação; escritas em massa via
+``session.execute(insert/update/delete)`` também contam. O cache de cada
+processo guarda ``(versão, linhas)`` e só consulta a tabela de novo quando a
+versão no banco muda: em vários workers, basta uma leitura de
+``cache_versions`` (memorizada por request) para saber se a lista vale.
+
+Após o commit, as listas alteradas pelo próprio processo saem do cache na hora.
+"""
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import (STATUS_TARGETS, Client, FunctionalArea, Position, Project, Status, StatusApplicability,
+                      User)
+from . import change_tracking
+
+# Opção neutra dos selects (os forms usam coerce=int)
+EMPTY_CHOICE = (0, "— Selecione —")
+
+
+class Choice(NamedTuple):
+    id: int
+    label: str
+
+
+class RefList(NamedTuple):
+    load: Callable[[], Iterable[Tuple[int, str]]]
+    # modelo -> atributos exibidos/ordenados (None: qualquer alteração conta)
+    watches: Dict[type, Optional[Tuple[str, ...]]]
+
+
+def _pairs(stmt):
+    return lambda: db.session.execute(stmt)
+
+
+def _positions():
+    rows = db.session.execute(
+        select(Position.id, Position.name, FunctionalArea.name)
+        .outerjoin(FunctionalArea, Position.functional_area_id == FunctionalArea.id)
+        .order_by(Position.name.asc(), Position.id))
+    return [(i, f'{name} ({area})' if area else name) for i, name, area in rows]
+
+
+def _statuses_for(target):
+    return _pairs(
+        select(Status.id, Status.nome)
+        .join(StatusApplicability, StatusApplicability.status_id == Status.id)
+        .where(StatusApplicability.target == target, Status.ativo.is_(True))
+        .order_by(Status.nome.asc(), Status.id))
+
+
+LISTS: Dict[str, RefList] = {
+    'users': RefList(
+        _pairs(select(User.id, User.full_name).order_by(User.full_name_norm.asc(), User.id)),
+        {User: ('full_name',)}),
+    'clients': RefList(
+        _pairs(select(Client.id, Client.nome_razao).order_by(Client.nome_razao_norm.asc(), Client.id)),
+        {Client: ('nome_razao',)}),
+    'projects': RefList(
+        _pairs(select(Project.id, Project.name).order_by(Project.name.asc(), Project.id)),
+        {Project: ('name',)}),
+    'statuses': RefList(
+        _pairs(select(Status.id, Status.nome).order_by(Status.nome.asc(), Status.id)),
+        {Status: ('nome',)}),
+    'functional_areas': RefList(
+        _pairs(select(FunctionalArea.id, FunctionalArea.name).order_by(FunctionalArea.name.asc(), FunctionalArea.id)),
+        {FunctionalArea: ('name',)}),
+    'positions': RefList(_positions, {Position: ('name', 'functional_area_id'), FunctionalArea: ('name',)}),
+}
+# Status ativos por tipo de cadastro (services.statuses.status_choices)
+for _target in STATUS_TARGETS:
+    LISTS[f'statuses:{_target}'] = RefList(
+        _statuses_for(_target), {Status: ('nome', 'ativo'), StatusApplicability: None})
+
+# tabela -> listas que dependem dela (para escritas em massa)
+_BY_TABLE: Dict[str, Set[str]] = {}
+for _name, _ref in LISTS.items():
+    for _model in _ref.watches:
+        _BY_TABLE.setdefault(_model.__tablename__, set()).add(_name)
+
+# (url do banco, lista) -> (versão, linhas)
+_cache: Dict[Tuple[str, str], Tuple[int, Tuple[Choice, ...]]] = {}
+_lock = threading.Lock()
+
+
+def rows(name: str) -> Tuple[Choice, ...]:
+    """Linhas ``Choice(id, label)`` da lista ``name``, ordenadas."""
+    ref = LISTS[name]
+    key = (str(db.engine.url), name)
+    version = change_tracking.versions().get(name, (0, None))[0]
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    loaded = tuple(Choice(i, label) for i, label in ref.load())
+    with _lock:
+        _cache[key] = (version, loaded)
+    return loaded
+
+
+def choices(name: str, empty: bool = False) -> List[Tuple[int, str]]:
+    """Choices de um ``SelectField`` (lista nova: o chamador pode alterá-la)."""
+    result = [tuple(c) for c in rows(name)]
+    return [EMPTY_CHOICE] + result if empty else result
+
+
+# ---------------------------------------------------------------------------
+# Invalidação
+# ---------------------------------------------------------------------------
+def _changed(obj, attrs) -> bool:
+    state = inspect(obj)
+    return attrs is None or any(state.attrs[a].history.has_changes() for a in attrs)
+
+
+@event.listens_for(Session, 'after_flush')
+def _after_flush(session, flush_context):
+    names: Set[str] = set()
+    for name, ref in LISTS.items():
+        for model, attrs in ref.watches.items():
+            if any(isinstance(o, model) for o in session.new) \
+                    or any(isinstance(o, model) for o in session.deleted) \
+                    or any(isinstance(o, model) and _changed(o, attrs) for o in session.dirty):
+                names.add(name)
+                break
+    if names:
+        change_tracking.bump(session, names)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bulk_write(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    names = _BY_TABLE.get(getattr(table, 'name', None))
+    if names:
+        change_tracking.bump(orm_execute_state.session, names)
+
+
+@change_tracking.on_commit
+def _evict(names: Set[str]):
+    with _lock:
+        for key in [k for k in _cache if k[1] in names]:
+            _cache.pop(key, None)
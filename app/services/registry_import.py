@@ -0,0 +1,320 @@
+# app/services/registry_import.py
+"""Carga em lote de cadastros (Clientes e Stakeholders) a partir de XLSX/CSV/TSV.
+
+Mesmo pipeline do inventário: linhas lidas em streaming (``tabular``),
+cabeçalho por aliases, associações resolvidas contra mapas em memória e
+gravação em lotes com commit próprio (``BatchImporter``).
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from ..extensions import db
+from ..models import Client, Position, Stakeholder, FunctionalArea
+from .batch_import import DEFAULT_BATCH_SIZE, BatchImporter
+from .inventory_import import _name_key
+from .tabular import cell, column_map, find_header, open_table
+
+_AMBIGUOUS = object()
+
+
+def _clean(s: str) -> str:
+    return re.sub(r"\s+", " ", s or '').strip()
+
+
+def _digits(s: str) -> str:
+    return re.sub(r"\D", "", s or '')
+
+
+class RegistryImporter(BatchImporter):
+    """Base das cargas de cadastro: colunas, validação e leitura do arquivo."""
+
+    model = None
+    # Campo interno -> aliases aceitos no cabeçalho (case-insensitive);
+    # o primeiro campo identifica a linha de cabeçalho.
+    COLUMNS: Dict[str, tuple] = {}
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, on_progress=None):
+        super().__init__(batch_size=batch_size, on_progress=on_progress)
+        self._load_lookups()
+
+    def _load_lookups(self):
+        raise NotImplementedError
+
+    def _too_long(self, values: Dict[str, Any]) -> Optional[str]:
+        columns = self.model.__table__.c
+        for attr, value in values.items():
+            length = getattr(columns[attr].type, 'length', None)
+            if isinstance(value, str) and length and len(value) > length:
+                return f"{attr} excede {length} caracteres"
+        return None
+
+    def _changed(self, obj, values: Dict[str, Any]) -> bool:
+        """Aplica os valores não vazios em ``obj``; células vazias preservam o atual."""
+        changed = False
+        for attr, value in values.items():
+            if value not in (None, '') and getattr(obj, attr) != value:
+                setattr(obj, attr, value)
+                changed = True
+        return changed
+
+    def _preload(self, targets: List[Any]) -> Dict[int, Any]:
+        ids = {t for t in targets if isinstance(t, int)}
+        if not ids:
+            return {}
+        return {o.id: o for o in self.model.query.filter(self.model.id.in_(ids))}
+
+    def import_file(self, path: str):
+        """Lê ``path`` (XLSX/CSV/TSV) e grava as linhas em lotes."""
+        first = next(iter(self.COLUMNS))
+        with open_table(path) as table:
+            header_row, header_vals = find_header(table.rows, self.COLUMNS[first])
+            cols = column_map(header_vals, self.COLUMNS)
+            if table.max_row:
+                self.total_rows = max(table.max_row - header_row, 0)
+            for r, row in enumerate(table.rows, start=header_row + 1):
+                rec = {field: cell(row, cols, field) for field in self.COLUMNS}
+                if any(rec.values()):
+                    rec['row'] = r
+                    self.add(rec)
+        self.finish()
+        return self
+
+
+# ---------------------------
+# Clientes
+# ---------------------------
+_CLIENT_TEXT = ('org_id', 'endereco', 'nacionalidade', 'estado_civil', 'profissao', 'rg',
+                'orgao_emissor_rg', 'cpf', 'email', 'telefone', 'cnpj', 'representante_nome',
+                'representante_email', 'representante_telefone', 'representante_funcao')
+
+
+class ClientImporter(RegistryImporter):
+    """Cria ou atualiza Clientes; deduplica por CNPJ/CPF (só dígitos) ou, sem documento, pelo nome."""
+
+    model = Client
+    COLUMNS = {
+        'nome_razao': ('Nome / Razão Social', 'Razão Social', 'Razao Social', 'Nome', 'Name', 'Cliente'),
+        'tipo': ('Tipo',),
+        'org_id': ('Org ID', 'OrgId', 'Org'),
+        'endereco': ('Endereço', 'Endereco', 'Address'),
+        'nacionalidade': ('Nacionalidade',),
+        'estado_civil': ('Estado Civil',),
+        'profissao': ('Profissão', 'Profissao'),
+        'rg': ('RG',),
+        'orgao_emissor_rg': ('Órgão Emissor do RG', 'Orgao Emissor', 'Órgão Emissor'),
+        'cpf': ('CPF',),
+        'email': ('E-mail', 'Email'),
+        'telefone': ('Telefone', 'Phone'),
+        'cnpj': ('CNPJ',),
+        'representante_nome': ('Representante Legal', 'Representante'),
+        'representante_email': ('E-mail do Representante', 'Email Representante'),
+        'representante_telefone': ('Telefone do Representante', 'Telefone Representante'),
+        'representante_funcao': ('Função/Cargo do Representante', 'Função do Representante'),
+    }
+
+    def _load_lookups(self):
+        self.by_doc: Dict[str, Any] = {}
+        self.by_name: Dict[str, Any] = {}
+        for i, key, cpf, cnpj in db.session.query(Client.id, Client.nome_razao_norm, Client.cpf, Client.cnpj):
+            for doc in (_digits(cnpj), _digits(cpf)):
+                if doc:
+                    self.by_doc.setdefault(doc, i)
+            self.by_name.setdefault(key, i)
+
+    @staticmethod
+    def _tipo(rec) -> Optional[str]:
+        tipo = _name_key(rec['tipo']).upper()
+        if not tipo:
+            return 'PF' if rec['cpf'] and not rec['cnpj'] else 'PJ'
+        if tipo in ('PF', 'PESSOA FISICA'):
+            return 'PF'
+        if tipo in ('PJ', 'PESSOA JURIDICA'):
+            return 'PJ'
+        return None
+
+    def _lookup(self, rec):
+        doc = _digits(rec['cnpj']) or _digits(rec['cpf'])
+        if doc:
+            return doc, self.by_doc.get(doc)
+        return None, self.by_name.get(_name_key(rec['nome_razao']))
+
+    def _apply(self, records):
+        valid = []
+        for rec in records:
+            nome = _clean(rec['nome_razao'])
+            tipo = self._tipo(rec)
+            values = {attr: rec[attr] or None for attr in _CLIENT_TEXT}
+            values['nome_razao'] = nome
+            error = (
+                'Nome / Razão Social vazio' if not nome
+                else f"Tipo inválido: {rec['tipo']!r} (use PF ou PJ)" if tipo is None
+                else self._too_long(values)
+            )
+            if error:
+                self._reject(rec, error)
+                continue
+            # Tipo só é alterado quando informado na planilha
+            values['tipo'] = tipo if rec['tipo'] else None
+            valid.append((rec, values, tipo))
+
+        existing = self._preload([self._lookup(rec)[1] for rec, _, _ in valid])
+        created = []
+        for rec, values, tipo in valid:
+            doc, target = self._lookup(rec)
+            if isinstance(target, int):
+                target = existing[target]
+            if target is None:
+                if not values['endereco']:
+                    self._reject(rec, 'Endereço vazio (obrigatório para novos clientes)')
+                    continue
+                values['tipo'] = tipo
+                target = Client(**values)
+                created.append(target)
+                self._count('created')
+            elif self._changed(target, values):
+                self._count('updated')
+            else:
+                self._count('skipped')
+            if doc:
+                self._set(self.by_doc, doc, target)
+            key = target.nome_razao_norm
+            if key not in self.by_name:
+                self._set(self.by_name, key, target)
+
+        db.session.add_all(created)
+        db.session.flush()
+        # Próximos lotes enxergam os novos clientes pelo id
+        for mapping, key, _ in list(self._journal):
+            ref = mapping.get(key)
+            if isinstance(ref, Client):
+                self._set(mapping, key, ref.id)
+
+
+# ---------------------------
+# Stakeholders
+# ---------------------------
+class StakeholderImporter(RegistryImporter):
+    """Cria ou atualiza Stakeholders; deduplica pelo e-mail ou, sem e-mail, por nome + vínculo.
+
+    Cliente e Cargo são resolvidos pelo nome (Cargo + Área quando o mesmo
+    cargo existe em mais de uma área); não são criados automaticamente.
+    """
+
+    model = Stakeholder
+    COLUMNS = {
+        'name': ('Nome', 'Name', 'Stakeholder'),
+        'tipo': ('Tipo',),
+        'email': ('E-mail', 'Email'),
+        'phone': ('Telefone', 'Phone'),
+        'client': ('Cliente', 'Client'),
+        'position': ('Cargo', 'Posição', 'Posicao', 'Position'),
+        'area': ('Área', 'Area', 'Área Funcional', 'Functional Area'),
+    }
+
+    def _load_lookups(self):
+        s = db.session
+        self.clients = {}
+        for i, key in s.query(Client.id, Client.nome_razao_norm):
+            self.clients.setdefault(key, i)
+        self.positions: Dict[Any, Any] = {}
+        for i, name, area in (s.query(Position.id, Position.name, FunctionalArea.name)
+                              .join(FunctionalArea, Position.functional_area_id == FunctionalArea.id)):
+            key = _name_key(name)
+            self.positions[(key, _name_key(area))] = i
+            self.positions[key] = _AMBIGUOUS if key in self.positions else i
+
+        self.by_email: Dict[str, Any] = {}
+        self.by_name: Dict[Any, Any] = {}
+        for i, name, email, tipo, client_id, position_id in s.query(
+                Stakeholder.id, Stakeholder.name_norm, Stakeholder.email, Stakeholder.tipo,
+                Stakeholder.client_id, Stakeholder.position_id):
+            if email:
+                self.by_email.setdefault(email.lower(), i)
+            self.by_name.setdefault(self._name_key(name, tipo, client_id, position_id), i)
+
+    @staticmethod
+    def _name_key(name, tipo, client_id, position_id):
+        return _name_key(name), tipo, client_id if tipo == 'EXTERNO' else position_id
+
+    def _resolve(self, rec):
+        """(tipo, client_id, position_id) ou uma mensagem de erro."""
+        client_id = position_id = None
+        if rec['client']:
+            client_id = self.clients.get(_name_key(rec['client']))
+            if client_id is None:
+                return f"Cliente não encontrado: {rec['client']!r}"
+        if rec['position']:
+            key = _name_key(rec['position'])
+            position_id = self.positions.get((key, _name_key(rec['area']))) if rec['area'] \
+                else self.positions.get(key)
+            if position_id is _AMBIGUOUS:
+                return f"Cargo {rec['position']!r} existe em mais de uma área; informe a Área"
+            if position_id is None:
+                return f"Cargo não encontrado: {rec['position']!r}"
+
+        tipo = _name_key(rec['tipo']).upper() or ('EXTERNO' if client_id else 'INTERNO')
+        if tipo not in ('INTERNO', 'EXTERNO'):
+            return f"Tipo inválido: {rec['tipo']!r} (use INTERNO ou EXTERNO)"
+        if tipo == 'EXTERNO' and client_id is None:
+            return 'Stakeholder EXTERNO requer um Cliente'
+        if tipo == 'INTERNO' and position_id is None:
+            return 'Stakeholder INTERNO requer um Cargo'
+        # Interno não guarda cliente (mesma regra do formulário)
+        return tipo, (client_id if tipo == 'EXTERNO' else None), position_id
+
+    def _lookup(self, rec, tipo, client_id, position_id):
+        email = rec['email'].lower()
+        if email:
+            return self.by_email.get(email)
+        return self.by_name.get(self._name_key(rec['name'], tipo, client_id, position_id))
+
+    def _apply(self, records):
+        valid = []
+        for rec in records:
+            name = _clean(rec['name'])
+            resolved = self._resolve(rec) if name else 'Nome vazio'
+            values = {'name': name, 'email': rec['email'] or None, 'phone': rec['phone'] or None}
+            error = resolved if isinstance(resolved, str) else self._too_long(values)
+            if error:
+                self._reject(rec, error)
+                continue
+            valid.append((rec, values, resolved))
+
+        existing = self._preload([self._lookup(rec, *resolved) for rec, _, resolved in valid])
+        created = []
+        for rec, values, (tipo, client_id, position_id) in valid:
+            target = self._lookup(rec, tipo, client_id, position_id)
+            if isinstance(target, int):
+                target = existing[target]
+            if target is None:
+                target = Stakeholder(**values)
+                created.append(target)
+                self._count('created')
+            else:
+                changed = self._changed(target, values)
+                changed |= (target.tipo, target.client_id, target.position_id) != (tipo, client_id, position_id)
+                self._count('updated' if changed else 'skipped')
+            # Tipo primeiro: o validador do model aceita o vínculo obrigatório
+            # ainda pendente, inclusive ao trocar INTERNO <-> EXTERNO
+            target.tipo = tipo
+            target.client_id = client_id
+            target.position_id = position_id
+            if values['email']:
+                self._set(self.by_email, values['email'].lower(), target)
+            self._set(self.by_name, self._name_key(target.name, tipo, client_id, position_id), target)
+
+        db.session.add_all(created)
+        db.session.flush()
+        for mapping, key, _ in list(self._journal):
+            ref = mapping.get(key)
+            if isinstance(ref, Stakeholder):
+                self._set(mapping, key, ref.id)
+
+
+def import_clients_file(path: str, batch_size: int = DEFAULT_BATCH_SIZE, on_progress=None) -> ClientImporter:
+    return ClientImporter(batch_size=batch_size, on_progress=on_progress).import_file(path)
+
+
+def import_stakeholders_file(path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                             on_progress=None) -> StakeholderImporter:
+    return StakeholderImporter(batch_size=batch_size, on_progress=on_progress).import_file(path)
@@ -0,0 +1,86 @@
+# app/services/search.py
+"""Busca textual das listagens de equipamentos e atividades.
+
+SQLite usa tabelas FTS5 (``equipment_fts``, ``activities_fts``) e PostgreSQL
+uma coluna gerada ``search_vector`` (tsvector) com índice GIN; ambas são
+criadas e mantidas pela migração ``f7c1d3e9a254`` (triggers no SQLite, coluna
+GENERATED no Postgres). Cada palavra digitada vira um prefixo ("joa" acha
+"João") e o resultado vem ordenado por relevância.
+
+Sem o índice (banco criado com ``db.create_all()``, outro SGBD), cai no
+``ILIKE '%q%'`` de antes, mantendo a ordenação padrão da tela.
+"""
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import Float, func, inspect, literal_column, or_, table, column, text
+
+from ..extensions import db
+from ..models import Activity, Equipment
+
+# Modelo -> (tabela FTS5, colunas indexadas)
+SEARCHABLE = {
+    Equipment: ('equipment_fts', ('name', 'pn', 'serial_number')),
+    Activity: ('activities_fts', ('description',)),
+}
+TS_CONFIG = 'simple'
+# Palavras consideradas por busca (o resto é ignorado)
+MAX_TERMS = 8
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# (url do banco, tabela) -> índice disponível?
+_available: Dict[Tuple[str, str], bool] = {}
+
+
+def terms(q: str) -> List[str]:
+    return _WORD_RE.findall(q or '')[:MAX_TERMS]
+
+
+def _has_index(model) -> bool:
+    engine = db.engine
+    key = (str(engine.url), model.__tablename__)
+    if key not in _available:
+        insp = inspect(engine)
+        if engine.dialect.name == 'sqlite':
+            _available[key] = insp.has_table(SEARCHABLE[model][0])
+        elif engine.dialect.name == 'postgresql':
+            _available[key] = any(c['name'] == 'search_vector' for c in insp.get_columns(model.__tablename__))
+        else:
+            _available[key] = False
+    return _available[key]
+
+
+def _fallback(query, model, q: str):
+    like = f"%{q}%"
+    return query.filter(or_(*(getattr(model, name).ilike(like) for name in SEARCHABLE[model][1])))
+
+
+def full_text(query, model, q: str, order: Sequence[Tuple[Any, bool]]):
+    """Filtra ``query`` (sobre ``model``) por ``q``; devolve (query, ordenação para ``keyset_paginate``).
+
+    Com o índice, a ordenação passa a ser pela relevância (coluna ``rank`` no resultado).
+    """
+    words = terms(q)
+    if not words:
+        return query, order
+    if not _has_index(model):
+        return _fallback(query, model, q), order
+
+    if db.engine.dialect.name == 'sqlite':
+        fts_name = SEARCHABLE[model][0]
+        fts = table(fts_name, column('rowid'))
+        # Termos entre aspas (sem operadores FTS5), cada um como prefixo; AND implícito
+        match = ' '.join('"%s"*' % w.replace('"', '""') for w in words)
+        # bm25: menor = mais relevante
+        rank = literal_column(f'bm25({fts_name})', Float).label('rank')
+        query = (query.join(fts, fts.c.rowid == model.id)
+                 .filter(text(f'{fts_name} MATCH :fts_match').bindparams(fts_match=match))
+                 .add_columns(rank))
+        return query, [(rank, False)]
+
+    tsquery = func.to_tsquery(TS_CONFIG, ' & '.join(f"{w}:*" for w in words))
+    vector = literal_column(f'{model.__tablename__}.search_vector')
+    # ts_rank: maior = mais relevante; o negativo mantém a mesma direção do SQLite
+    rank = (-func.ts_rank(vector, tsquery)).cast(Float).label('rank')
+    query = query.filter(vector.op('@@')(tsquery)).add_columns(rank)
+    return query, [(rank, False)]
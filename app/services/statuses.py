@@ -0,0 +1,55 @@
+# app/services/statuses.py
+"""Status aplicáveis a cada tipo de cadastro.
+
+A aplicabilidade fica em ``status_applicability`` (uma linha por status e
+cadastro, PK ``(target, status_id)``), então "status ativos de equipamentos"
+é uma busca no índice, sem ``LIKE`` sobre CSV nem filtro em Python.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..extensions import db
+from ..models import STATUS_TARGETS, Status, StatusApplicability
+from .reference_data import choices
+
+
+def active_statuses(target: str):
+    """``Row(id, nome, cor)`` dos status ativos aplicáveis a ``target``, por nome."""
+    if target not in STATUS_TARGETS:
+        raise ValueError(f"Tipo de cadastro desconhecido: {target!r}")
+    return (db.session.query(Status.id, Status.nome, Status.cor)
+            .join(StatusApplicability, StatusApplicability.status_id == Status.id)
+            .filter(StatusApplicability.target == target, Status.ativo.is_(True))
+            .order_by(Status.nome.asc())
+            .all())
+
+
+def status_choices(target: str, current_id: Optional[int] = None) -> List[Tuple[int, str]]:
+    """Choices ``[(id, nome), ...]`` para ``target``.
+
+    ``current_id`` (status já gravado no registro em edição) entra na lista
+    mesmo que tenha sido desativado ou desmarcado para ``target``, para o
+    formulário não rejeitar o valor atual.
+    """
+    if target not in STATUS_TARGETS:
+        raise ValueError(f"Tipo de cadastro desconhecido: {target!r}")
+    # Mesma consulta de active_statuses, em cache (services.reference_data)
+    result = choices(f'statuses:{target}', empty=True)
+    if current_id and all(i != current_id for i, _ in result):
+        current = db.session.get(Status, current_id)
+        if current is not None:
+            result.append((current.id, current.nome))
+    return result
+
+
+def targets_by_status(status_ids: Iterable[int]) -> Dict[int, List[str]]:
+    """Cadastros de cada status (para a listagem), numa única consulta."""
+    ids = list(status_ids)
+    result: Dict[int, List[str]] = {i: [] for i in ids}
+    if not ids:
+        return result
+    rows = (db.session.query(StatusApplicability.status_id, StatusApplicability.target)
+            .filter(StatusApplicability.status_id.in_(ids))
+            .order_by(StatusApplicability.target))
+    for status_id, target in rows:
+        result[status_id].append(target)
+    return result
@@ -0,0 +1,155 @@
+# app/services/tabular.py
+"""Fontes de linhas das importações: XLSX (primeira aba) e CSV/TSV.
+
+Todas entregam tuplas de valores, uma por linha, sob demanda (generators):
+a memória não cresce com o tamanho do arquivo.
+"""
+import codecs
+import csv
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from openpyxl import load_workbook
+
+
+class ImportFormatError(Exception):
+    """Arquivo de importação ilegível ou fora do formato esperado."""
+
+
+# Extensões aceitas -> delimitador fixo (None = detectar no conteúdo)
+DELIMITED_SUFFIXES = {'.csv': None, '.tsv': '\t'}
+ACCEPTED_SUFFIXES = ('.xlsx', *DELIMITED_SUFFIXES)
+
+# Amostra usada para detectar encoding e delimitador
+_SAMPLE_SIZE = 64 * 1024
+
+
+def file_suffix(filename: str) -> str:
+    return os.path.splitext(filename or '')[1].lower()
+
+
+def is_delimited(path: str) -> bool:
+    return file_suffix(path) in DELIMITED_SUFFIXES
+
+
+class Table:
+    """Linhas de um arquivo aberto por :func:`open_table`.
+
+    ``rows`` é um iterador de passada única a partir da linha 1;
+    ``max_row`` é uma estimativa (para o progresso) e ``workbook`` só
+    existe para XLSX (abas auxiliares, como a Sum do inventário).
+    """
+
+    def __init__(self, rows: Iterator[Tuple[Any, ...]], max_row: Optional[int] = None, workbook=None):
+        self.rows = rows
+        self.max_row = max_row
+        self.workbook = workbook
+
+
+@contextmanager
+def open_table(path: str) -> Iterator[Table]:
+    """Abre um XLSX (primeira aba, read-only) ou CSV/TSV para leitura em streaming."""
+    if is_delimited(path):
+        rows = _iter_delimited(path)
+        try:
+            yield Table(rows, max_row=_count_lines(path))
+        finally:
+            rows.close()
+        return
+
+    try:
+        wb = load_workbook(path, read_only=True, data_only=True)
+    except Exception as exc:
+        raise ImportFormatError(f'Planilha XLSX inválida: {exc}') from exc
+    try:
+        ws = wb.active
+        yield Table(ws.iter_rows(values_only=True), max_row=ws.max_row, workbook=wb)
+    finally:
+        wb.close()
+
+
+def _detect_encoding(sample: bytes) -> str:
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # Incremental: tolera um caractere multibyte cortado no fim da amostra
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        # Exportações do Excel em pt-BR
+        return 'cp1252'
+
+
+def _detect_delimiter(path: str, text: str) -> str:
+    fixed = DELIMITED_SUFFIXES.get(file_suffix(path))
+    if fixed:
+        return fixed
+    try:
+        return csv.Sniffer().sniff(text, delimiters=',;\t|').delimiter
+    except csv.Error:
+        return ','
+
+
+def _iter_delimited(path: str) -> Iterator[Tuple[str, ...]]:
+    with open(path, 'rb') as fh:
+        sample = fh.read(_SAMPLE_SIZE)
+    encoding = _detect_encoding(sample)
+    delimiter = _detect_delimiter(path, sample.decode(encoding, errors='ignore'))
+
+    with open(path, newline='', encoding=encoding, errors='replace') as fh:
+        try:
+            for row in csv.reader(fh, delimiter=delimiter):
+                yield tuple(row)
+        except csv.Error as exc:
+            raise ImportFormatError(f'CSV inválido: {exc}') from exc
+
+
+def _count_lines(path: str) -> int:
+    """Nº de quebras de linha (estimativa: células podem conter quebras)."""
+    n = 0
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b''):
+            n += chunk.count(b'\n')
+    return n
+
+
+# ---------------------------
+# Cabeçalho
+# ---------------------------
+def find_header(rows: Iterable[Tuple[Any, ...]], required: Sequence[str],
+                max_rows: int = 5) -> Tuple[int, List[str]]:
+    """Localiza, nas primeiras linhas, o cabeçalho que contém uma das colunas ``required``.
+
+    Consome de ``rows`` apenas até o cabeçalho: o mesmo iterador segue
+    com as linhas de dados.
+    """
+    wanted = {a.lower() for a in required}
+    for r, row in enumerate(rows, start=1):
+        vals = [str(v).strip() if v is not None else '' for v in row]
+        if any(v.lower() in wanted for v in vals):
+            return r, vals
+        if r >= max_rows:
+            break
+    raise ImportFormatError(f'Cabeçalho não localizado (coluna {required[0]}).')
+
+
+def column_map(header_vals: List[str], aliases: Dict[str, Sequence[str]]) -> Dict[str, Optional[int]]:
+    """Campo interno -> índice da coluna (primeiro alias presente, case-insensitive)."""
+    index = {v.lower(): i for i, v in enumerate(header_vals)}
+
+    def col(names):
+        for a in names:
+            if a.lower() in index:
+                return index[a.lower()]
+        return None
+
+    return {field: col(names) for field, names in aliases.items()}
+
+
+def cell(row: Tuple[Any, ...], cols: Dict[str, Optional[int]], field: str) -> str:
+    """Valor da coluna mapeada para ``field`` como texto sem espaços nas pontas ('' se ausente)."""
+    c = cols.get(field)
+    if c is None or c >= len(row) or row[c] is None:
+        return ''
+    return str(row[c]).strip()
@@ -0,0 +1,92 @@
+# app/services/typeahead.py
+"""Busca incremental (typeahead) dos selects de tabelas grandes.
+
+Em vez de renderizar a tabela inteira como ``<option>``, os formulários
+mostram só o valor atual e o navegador consulta ``/api/busca/<kind>?q=&limit=``
+(``blueprints/lookup``). Usuários, clientes, concessionários e projetos são
+buscados por prefixo numa coluna/expressão indexada (nome normalizado ou
+``lower(nome)``); equipamentos usam o índice textual de ``services.search``
+(nome, PN, SN, cada palavra como prefixo). As páginas seguintes vêm por
+cursor (``keyset_paginate``).
+"""
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy import and_, func
+
+from ..extensions import db
+from ..models import Client, Dealer, Equipment, Project, User
+from ..utils.text import name_key
+from .pagination import KeysetPage, keyset_paginate
+from .search import full_text
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+
+class Source(NamedTuple):
+    model: Any
+    columns: tuple
+    # Expressão indexada comparada por prefixo (None: índice textual)
+    key: Any
+    normalize: Callable[[str], str]
+    label: Callable[[Any], str]
+
+
+def _lower(q: str) -> str:
+    return (q or '').strip().lower()
+
+
+def _equipment_label(row) -> str:
+    extras = [f'PN {row.pn}' if row.pn else '', f'SN {row.serial_number}' if row.serial_number else '']
+    return ' · '.join([row.name] + [e for e in extras if e])
+
+
+SOURCES: Dict[str, Source] = {
+    'users': Source(User, (User.id, User.full_name), User.full_name_norm, name_key,
+                    lambda r: r.full_name),
+    'clients': Source(Client, (Client.id, Client.nome_razao), Client.nome_razao_norm, name_key,
+                      lambda r: r.nome_razao),
+    'dealers': Source(Dealer, (Dealer.id, Dealer.razao_social), func.lower(Dealer.razao_social), _lower,
+                      lambda r: r.razao_social),
+    'projects': Source(Project, (Project.id, Project.name), func.lower(Project.name), _lower,
+                       lambda r: r.name),
+    'equipment': Source(Equipment, (Equipment.id, Equipment.name, Equipment.pn, Equipment.serial_number),
+                        None, str.strip, _equipment_label),
+}
+
+
+def _prefix(expr, key: str):
+    if db.engine.dialect.name == 'sqlite':
+        # Faixa [key, key + U+FFFF): atendida pelo índice (no SQLite, LIKE 'x%' não usa índice)
+        return and_(expr >= key, expr < key + '\uffff')
+    return expr.startswith(key, autoescape=True)
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    return max(1, min(limit or DEFAULT_LIMIT, MAX_LIMIT))
+
+
+def search(kind: str, q: str, limit: Optional[int] = None) -> KeysetPage:
+    """Página de ``kind`` cujo nome começa por ``q`` (lê o cursor ``after`` da querystring)."""
+    source = SOURCES[kind]
+    query = db.session.query(*source.columns)
+    if source.key is None:
+        query, order = full_text(query, source.model, q, [(source.model.name, False)])
+    else:
+        sort_key = source.key.label('sort_key')
+        query = query.add_columns(sort_key)
+        key = source.normalize(q)
+        if key:
+            query = query.filter(_prefix(source.key, key))
+        order = [(sort_key, False)]
+    return keyset_paginate(query, order, source.model.id, per_page=clamp_limit(limit))
+
+
+def labels(kind: str, ids: Iterable[int]) -> Dict[int, str]:
+    """``{id: rótulo}`` dos ids existentes (os inexistentes ficam de fora)."""
+    ids = {i for i in ids if i}
+    if not ids:
+        return {}
+    source = SOURCES[kind]
+    rows = db.session.query(*source.columns).filter(source.model.id.in_(ids))
+    return {row.id: source.label(row) for row in rows}
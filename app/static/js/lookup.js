@@ -0,0 +1,68 @@
+// app/static/js/lookup.js
+// Typeahead dos <select data-lookup="/api/busca/<kind>">: o HTML traz só o valor
+// atual; as opções vêm da API conforme o usuário digita (prefixo do nome).
+(function () {
+  const LIMIT = 20;
+
+  function option(value, label) {
+    const opt = document.createElement('option');
+    opt.value = value;
+    opt.textContent = label;
+    return opt;
+  }
+
+  function enhance(select) {
+    const search = document.createElement('input');
+    search.type = 'search';
+    search.placeholder = 'Digite para buscar...';
+    search.className = 'input input-bordered input-sm w-full mb-1';
+    select.parentNode.insertBefore(search, select);
+
+    const more = document.createElement('button');
+    more.type = 'button';
+    more.className = 'btn btn-ghost btn-xs mt-1';
+    more.textContent = 'Carregar mais';
+    more.hidden = true;
+    select.parentNode.insertBefore(more, select.nextSibling);
+
+    let next = null;
+    let timer = null;
+    let loaded = false;
+
+    async function load(append) {
+      const url = new URL(select.dataset.lookup, window.location.origin);
+      url.searchParams.set('q', search.value.trim());
+      url.searchParams.set('limit', LIMIT);
+      if (append && next) url.searchParams.set('after', next);
+      const res = await fetch(url.toString(), { headers: { 'Accept': 'application/json' } });
+      if (!res.ok) return;
+      const data = await res.json();
+
+      if (!append) {
+        // Mantém a opção neutra (valor 0) e o que já está selecionado
+        for (const opt of Array.from(select.options)) {
+          if (!opt.selected && opt.value !== '0') opt.remove();
+        }
+      }
+      const present = new Set(Array.from(select.options).map(o => o.value));
+      for (const item of data.items) {
+        if (!present.has(String(item.id))) select.appendChild(option(item.id, item.label));
+      }
+      next = data.next;
+      more.hidden = !next;
+      loaded = true;
+    }
+
+    search.addEventListener('input', () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => load(false), 250);
+    });
+    select.addEventListener('focus', () => { if (!loaded) load(false); });
+    search.addEventListener('focus', () => { if (!loaded) load(false); });
+    more.addEventListener('click', () => load(true));
+  }
+
+  document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('select[data-lookup]').forEach(enhance);
+  });
+})();
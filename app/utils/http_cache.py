@@ -0,0 +1,77 @@
+# app/utils/http_cache.py
+import hashlib
+import os
+import time
+from functools import lru_cache, wraps
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+from flask_wtf.csrf import generate_csrf
+
+from ..services import change_tracking
+
+# Arquivos que mudam a página renderizada (não uploads/bancos dentro de app/)
+_CODE_SUFFIXES = ('.py', '.html', '.js', '.css')
+
+
+def conditional(*tables: str):
+    """ETag de um GET a partir dos contadores ``table:<tabela>``.
+
+    O validador sai de uma leitura de ``cache_versions`` (já memorizada no
+    request); se o navegador manda o mesmo ETag, a resposta é ``304`` e a view
+    nem roda. Sem ``Last-Modified``/``If-Modified-Since``: uma data não capta
+    a troca de usuário nem um deploy, que também mudam a página. Vai ABAIXO de
+    ``@login_required``. ``tables`` são todas as tabelas cujos dados aparecem
+    na resposta (inclusive os JOINs e os combos de filtro).
+    """
+    keys = [change_tracking.table_key(t) for t in tables]
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Mensagens flash pendentes: a página precisa ser renderizada (e consumi-las)
+            if request.method != 'GET' or '_flashes' in session:
+                return view(*args, **kwargs)
+            etag = _etag(keys)
+            if request.if_none_match.contains_weak(etag):
+                resp = current_app.response_class(status=304)
+            else:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(etag, weak=True)
+            # Guardar só no navegador do usuário, sempre revalidando
+            resp.headers['Cache-Control'] = 'private, no-cache'
+            resp.vary.add('Cookie')
+            return resp
+        return wrapper
+    return decorator
+
+
+def _etag(keys) -> str:
+    versions = change_tracking.versions()
+    # Além dos dados, a página depende de quem vê (usuário, token CSRF da
+    # sessão nos forms de exclusão) e do código/templates em execução.
+    # generate_csrf cria o token agora se a sessão ainda não tem: senão o ETag
+    # da primeira página sairia sem ele e a primeira revalidação nunca casaria
+    generate_csrf()
+    parts = [request.full_path, str(current_user.get_id()), session.get('csrf_token') or '', _code_version()]
+    parts += [f'{k}={versions.get(k, (0, None))[0]}' for k in keys]
+    time_limit = current_app.config.get('WTF_CSRF_TIME_LIMIT')
+    if time_limit:
+        # Tokens CSRF assinados expiram: a página em cache também
+        parts.append(str(int(time.time() // time_limit)))
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _code_version() -> str:
+    # Maior mtime dos arquivos do pacote: muda a cada deploy, igual em todos os workers
+    latest = 0.0
+    for root, dirs, files in os.walk(current_app.root_path):
+        dirs[:] = [d for d in dirs if d != '__pycache__']
+        for name in files:
+            if not name.endswith(_CODE_SUFFIXES):
+                continue
+            latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+    return str(int(latest))
@@ -0,0 +1,35 @@
+# app/utils/streaming.py
+from flask import get_flashed_messages, stream_template
+from flask_wtf.csrf import generate_csrf
+
+# Caracteres acumulados antes de cada envio (evita milhares de writes minúsculos)
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def stream_page(template_name: str, **context):
+    """Renderiza ``template_name`` em streaming (``stream_template``).
+
+    O cabeçalho e o início da tabela chegam ao navegador enquanto o resto é
+    gerado, e a página nunca existe inteira em memória. Usado nas listagens:
+    os dados já vêm carregados (``keyset_paginate``), o template só itera.
+    """
+    # Os headers (e o cookie da sessão) saem antes do corpo: tudo que grava na
+    # sessão precisa acontecer agora, não quando o template for gerado. O token
+    # CSRF fica em cache no request (csrf_token() no template devolve o mesmo)
+    # e as mensagens flash são consumidas antes do base.html exibi-las.
+    generate_csrf()
+    get_flashed_messages(with_categories=True)
+    return buffered(stream_template(template_name, **context))
+
+
+def buffered(parts):
+    """Agrupa as partes de um corpo em streaming em blocos de ~``STREAM_CHUNK_SIZE``."""
+    buffer, size = [], 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= STREAM_CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
@@ -0,0 +1,22 @@
+# app/utils/text.py
+"""Normalização de nomes para comparação, busca e ordenação.
+
+``name_key`` é a forma gravada nas colunas ``*_norm`` (Users, Clients,
+Stakeholders) e usada como chave pelos importadores: "São  João" e
+"sao joao" viram a mesma chave.
+"""
+import re
+import unicodedata
+
+
+def normalize_name(s: str) -> str:
+    """Remove acentos (NFKD) e colapsa espaços, preservando a caixa."""
+    s = (s or '').strip()
+    s = unicodedata.normalize('NFKD', s)
+    s = ''.join(c for c in s if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", s)
+
+
+def name_key(s: str) -> str:
+    """Chave de comparação: sem acento, espaços colapsados, casefold."""
+    return normalize_name(s).casefold()
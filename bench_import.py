@@ -0,0 +1,261 @@
+"""Benchmark da importação de inventário com planilhas sintéticas.
+
+Gera uma planilha no layout de /equipamentos/importar (linha de título,
+cabeçalho, dados e aba Sum opcional), importa num SQLite novo e reporta
+linhas/s, pico de memória (RSS) e nº de comandos SQL de cada passada.
+
+Exemplos:
+    python bench_import.py --rows 20000
+    python bench_import.py --rows 50000 --dup-ratio 0.2 --new-name-ratio 0.05 --passes 2
+    python bench_import.py --rows 20000 --via route      # upload + job, como no navegador
+    python bench_import.py --rows 20000 --format csv --keep planilha.csv
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import tempfile
+import time
+
+HEADER = ["Item", "PN", "Model Number", "SN", "Location", "Machine Installed", "Status", "Project",
+          "Owner", "Current Responsible", "Obs", "Imagem de Referência"]
+
+
+# ---------------------------
+# Planilha sintética
+# ---------------------------
+def pools(size):
+    """Nomes já cadastrados no banco antes da importação (ver ``seed``)."""
+    return {
+        'users': [f"Owner {i}" for i in range(size)],
+        'clients': [f"Cliente {i}" for i in range(size)],
+        'projects': [f"Projeto {i}" for i in range(max(size // 5, 1))],
+        'statuses': [f"Status {i}" for i in range(8)],
+    }
+
+
+def synthetic_rows(rows, dup_ratio=0.1, new_name_ratio=0.02, split_ratio=0.1, no_sn_ratio=0.1,
+                   pool_size=200, seed=1):
+    """Linhas de dados (listas na ordem de ``HEADER``).
+
+    - ``dup_ratio``: linhas que repetem a chave (SN ou PN + Item) de uma linha anterior;
+    - ``new_name_ratio``: Owner/Responsible/Location/Project/Status fora dos já cadastrados;
+    - ``split_ratio``: Owner no formato "A / B" com Current Responsible vazio;
+    - ``no_sn_ratio``: itens sem SN (deduplicados por PN + Item).
+    """
+    rnd = random.Random(seed)
+    names = pools(pool_size)
+    keys = []
+
+    def pick(kind, i, prefix):
+        if rnd.random() < new_name_ratio:
+            return f"{prefix} Novo {i}"
+        return rnd.choice(names[kind])
+
+    for i in range(rows):
+        if keys and rnd.random() < dup_ratio:
+            item, pn, sn = rnd.choice(keys)
+        else:
+            item, pn = f"Item {i % 997}", f"PN-{i:07d}"
+            sn = '' if rnd.random() < no_sn_ratio else f"SN{i:08d}"
+            keys.append((item, pn, sn))
+
+        owner, responsible = pick('users', i, 'Owner'), pick('users', i, 'Resp')
+        if rnd.random() < split_ratio:
+            owner, responsible = f"{owner} / {responsible}", ''
+        yield [item, pn, f"M{rnd.randint(1, 50)}", sn, pick('clients', i, 'Cliente'),
+               f"Máquina {rnd.randint(1, 300)}", pick('statuses', i, 'Status'), pick('projects', i, 'Projeto'),
+               owner, responsible, f"Obs {rnd.randint(1, 20)}" if rnd.random() < 0.3 else '', '']
+
+
+def write_workbook(path, rows, statuses, fmt='xlsx'):
+    if fmt == 'csv':
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            w = csv.writer(f)
+            w.writerow(["Tech Stack Equipment Inventory"])
+            w.writerow(HEADER)
+            w.writerows(rows)
+        return path
+
+    from openpyxl import Workbook
+    # Workbook normal (não write_only): grava a <dimension> da aba, como o Excel
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Inventory"
+    ws.append(["Tech Stack Equipment Inventory"])
+    ws.append(HEADER)
+    for row in rows:
+        ws.append(row)
+    if statuses:
+        s = wb.create_sheet("Sum")
+        s.append(["Status"])
+        for name in statuses:
+            s.append([name])
+    wb.save(path)
+    return path
+
+
+# ---------------------------
+# Execução (processo próprio: RSS sem a geração da planilha)
+# ---------------------------
+def seed(pool_size):
+    from app.extensions import db
+    from app.models import Client, Project, Status, User
+    from app.services.inventory_import import placeholder_password_hash
+
+    names = pools(pool_size)
+    pw = placeholder_password_hash()
+    db.session.execute(User.__table__.insert(), [
+        {'full_name': 'Benchmark', 'email': 'bench@example.com', 'password_hash': pw},
+        *({'full_name': n, 'email': f"user{i}@example.com", 'password_hash': pw}
+          for i, n in enumerate(names['users'])),
+    ])
+    db.session.execute(Client.__table__.insert(),
+                       [{'tipo': 'PJ', 'nome_razao': n, 'endereco': 'Benchmark'} for n in names['clients']])
+    db.session.execute(Project.__table__.insert(), [{'name': n} for n in names['projects']])
+    db.session.execute(Status.__table__.insert(),
+                       [{'nome': n, 'codigo': f"BENCH_{i}"} for i, n in enumerate(names['statuses'])])
+    db.session.commit()
+
+
+def _import_via_route(app, path, filename):
+    from app.models import User
+
+    client = app.test_client()
+    with app.app_context():
+        user_id = User.query.filter_by(email='bench@example.com').one().id
+    with client.session_transaction() as s:
+        s['_user_id'] = str(user_id)
+        s['_fresh'] = True
+    with open(path, 'rb') as f:
+        res = client.post('/equipamentos/importar', data={'file': (f, filename)},
+                          headers={'Accept': 'application/json'}, content_type='multipart/form-data')
+    if res.status_code != 202:
+        raise RuntimeError(f"Upload recusado: HTTP {res.status_code} {res.get_data(as_text=True)[:200]}")
+    status_url = res.get_json()['status_url']
+    while True:
+        job = client.get(status_url).get_json()
+        if job['status'] in ('done', 'failed'):
+            break
+        time.sleep(0.1)
+    if job['status'] == 'failed':
+        raise RuntimeError(job['message'])
+    return {'created': job['created'], 'updated': job['updated'], 'errors': job['errors'],
+            **job['details'].get('counters', {})}, job['rows_done']
+
+
+def run(opts, path, result):
+    """Importa ``path`` ``opts.passes`` vezes num SQLite novo e envia as métricas."""
+    db_path = os.path.join(opts.workdir, 'bench.db')
+
+    class BenchConfig:
+        SECRET_KEY = 'bench'
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        WTF_CSRF_ENABLED = False
+        IMPORT_BATCH_SIZE = opts.batch_size
+        IMPORT_WORKERS = 1
+
+    from sqlalchemy import event
+
+    from app import create_app
+    from app.extensions import db
+    from app.services.inventory_import import import_file
+
+    app = create_app(BenchConfig)
+    statements = {'n': 0}
+    with app.app_context():
+        db.create_all()
+        seed(opts.pool_size)
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda *args, **kw: statements.__setitem__('n', statements['n'] + 1))
+
+    passes = []
+    for _ in range(opts.passes):
+        statements['n'] = 0
+        started = time.perf_counter()
+        if opts.via == 'route':
+            counters, rows = _import_via_route(app, path, os.path.basename(path))
+        else:
+            with app.app_context():
+                importer = import_file(path, batch_size=opts.batch_size, workers=opts.workers)
+                counters, rows = dict(importer.counters), importer.rows_done
+        elapsed = time.perf_counter() - started
+        passes.append({
+            'rows': rows,
+            'seconds': round(elapsed, 3),
+            'rows_per_sec': round(rows / elapsed, 1) if elapsed else None,
+            'sql_statements': statements['n'],
+            # ru_maxrss: KiB no Linux
+            'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'counters': counters,
+        })
+    result.put(passes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--dup-ratio', type=float, default=0.1)
+    parser.add_argument('--new-name-ratio', type=float, default=0.02)
+    parser.add_argument('--split-ratio', type=float, default=0.1)
+    parser.add_argument('--no-sn-ratio', type=float, default=0.1)
+    parser.add_argument('--pool-size', type=int, default=200,
+                        help='usuários/clientes já cadastrados antes da importação')
+    parser.add_argument('--no-sum', action='store_true', help='não gera a aba Sum')
+    parser.add_argument('--format', choices=('xlsx', 'csv'), default='xlsx')
+    parser.add_argument('--via', choices=('service', 'route'), default='service',
+                        help='service: import_file direto; route: upload em /equipamentos/importar + job')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=0, help='processos de leitura/parse (só --via service)')
+    parser.add_argument('--passes', type=int, default=1, help='passadas sobre o mesmo banco (2ª = re-importação)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--keep', metavar='ARQUIVO', help='salva a planilha gerada')
+    parser.add_argument('--json', action='store_true', help='saída em JSON')
+    opts = parser.parse_args(argv)
+
+    opts.workdir = tempfile.mkdtemp(prefix='bench-import-')
+    try:
+        started = time.perf_counter()
+        rows = synthetic_rows(opts.rows, opts.dup_ratio, opts.new_name_ratio, opts.split_ratio,
+                              opts.no_sn_ratio, opts.pool_size, opts.seed)
+        statuses = [] if opts.no_sum else pools(opts.pool_size)['statuses'] + ['Status Sum Novo']
+        path = write_workbook(os.path.join(opts.workdir, f"inventario.{opts.format}"), rows, statuses,
+                              opts.format)
+        generated = time.perf_counter() - started
+        file_mb = os.path.getsize(path) / 1024 / 1024
+        if opts.keep:
+            shutil.copyfile(path, opts.keep)
+
+        # spawn: processo limpo, o pico de RSS não inclui a geração
+        ctx = multiprocessing.get_context('spawn')
+        result = ctx.Queue()
+        proc = ctx.Process(target=run, args=(opts, path, result))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            raise SystemExit(f"Benchmark falhou (exit {proc.exitcode})")
+        passes = result.get(timeout=5)
+    finally:
+        shutil.rmtree(opts.workdir, ignore_errors=True)
+
+    if opts.json:
+        print(json.dumps({'options': {k: v for k, v in vars(opts).items() if k != 'workdir'},
+                          'file_mb': round(file_mb, 2), 'passes': passes}, indent=2))
+        return
+    print(f"Planilha: {opts.rows} linhas ({opts.format}, {file_mb:.1f} MB) gerada em {generated:.1f}s | "
+          f"via {opts.via} | lote {opts.batch_size} | workers {opts.workers}")
+    for i, p in enumerate(passes, start=1):
+        c = p['counters']
+        print(f"Passada {i}: {p['rows']} linhas em {p['seconds']:.2f}s ({p['rows_per_sec']:,.0f} linhas/s) | "
+              f"SQL: {p['sql_statements']} | pico RSS: {p['peak_rss_mb']:.0f} MB | "
+              f"{c.get('created', 0)} criados, {c.get('updated', 0)} atualizados, "
+              f"{c.get('skipped', 0)} sem alteração, {c.get('errors', 0)} com erro")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,13 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", DEFAULT_SQLITE)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     WTF_CSRF_TIME_LIMIT = None
+    # Linhas por lote (commit) no importador de inventário
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+    # Threads do pool de importação em segundo plano (SQLite: mantenha 1)
+    IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "1"))
+    # Linhas por página nas listagens (?per_page= até o máximo)
+    LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "50"))
+    LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "200"))
 
 class DevConfig(Config):
     DEBUG = True
@@ -0,0 +1,25 @@
+"""lower(razao_social) index on dealers for typeahead prefix search
+
+Revision ID: 5a8d2f4c1e73
+Revises: 2b135428b3b1
+Create Date: 2026-01-29 14:02:51.318406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a8d2f4c1e73'
+down_revision = '2b135428b3b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Índice de expressão (o autogenerate não os compara)
+    op.create_index('ix_dealers_razao_social_lower', 'dealers', [sa.text('lower(razao_social)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_dealers_razao_social_lower', table_name='dealers')
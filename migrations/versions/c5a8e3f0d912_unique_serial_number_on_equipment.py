@@ -0,0 +1,43 @@
+"""unique partial index on equipment.serial_number
+
+Revision ID: c5a8e3f0d912
+Revises: b7e4d2a91c05
+Create Date: 2026-01-14 10:21:48.113907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a8e3f0d912'
+down_revision = 'b7e4d2a91c05'
+branch_labels = None
+depends_on = None
+
+SERIAL_NUMBER_PRESENT = sa.text("serial_number IS NOT NULL AND serial_number <> ''")
+
+
+def upgrade():
+    bind = op.get_bind()
+    # SN vazio passa a ser NULL (fora do índice)
+    bind.execute(sa.text("UPDATE equipment SET serial_number = NULL WHERE TRIM(serial_number) = ''"))
+
+    dups = bind.execute(sa.text(
+        "SELECT serial_number, COUNT(*) FROM equipment "
+        "WHERE serial_number IS NOT NULL GROUP BY serial_number HAVING COUNT(*) > 1"
+    )).fetchall()
+    if dups:
+        sample = ', '.join(f"{sn} ({n}x)" for sn, n in dups[:10])
+        raise RuntimeError(
+            f"Nº de série duplicado em equipment; resolva antes de migrar: {sample}"
+        )
+
+    op.create_index(
+        'uq_equipment_serial_number', 'equipment', ['serial_number'], unique=True,
+        sqlite_where=SERIAL_NUMBER_PRESENT, postgresql_where=SERIAL_NUMBER_PRESENT,
+    )
+
+
+def downgrade():
+    op.drop_index('uq_equipment_serial_number', table_name='equipment')
@@ -0,0 +1,79 @@
+"""full-text search for equipment and activities (FTS5 / tsvector)
+
+Revision ID: f7c1d3e9a254
+Revises: e4b2c7d9a016
+Create Date: 2026-01-22 09:41:17.206583
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c1d3e9a254'
+down_revision = 'e4b2c7d9a016'
+branch_labels = None
+depends_on = None
+
+# tabela -> (tabela FTS5, colunas indexadas)
+SEARCHABLE = {
+    'equipment': ('equipment_fts', ('name', 'pn', 'serial_number')),
+    'activities': ('activities_fts', ('description',)),
+}
+
+
+def _sqlite_upgrade(bind, source, fts, cols):
+    col_list = ', '.join(cols)
+    new_vals = ', '.join(f'new.{c}' for c in cols)
+    old_vals = ', '.join(f'old.{c}' for c in cols)
+    # Tabela de conteúdo externo: o FTS guarda só o índice, o texto fica em `source`
+    bind.execute(sa.text(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({col_list}, content='{source}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')"
+    ))
+    bind.execute(sa.text(
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {source} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END"
+    ))
+    bind.execute(sa.text(
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {source} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); END"
+    ))
+    # Só quando uma coluna indexada muda (o importador atualiza hash/obs o tempo todo)
+    bind.execute(sa.text(
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {col_list} ON {source} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col_list}) VALUES ('delete', old.id, {old_vals}); "
+        f"INSERT INTO {fts}(rowid, {col_list}) VALUES (new.id, {new_vals}); END"
+    ))
+    bind.execute(sa.text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def _postgresql_upgrade(bind, source, cols):
+    document = " || ' ' || ".join(f"coalesce({c}, '')" for c in cols)
+    bind.execute(sa.text(
+        f"ALTER TABLE {source} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple', {document})) STORED"
+    ))
+    bind.execute(sa.text(f"CREATE INDEX ix_{source}_search_vector ON {source} USING gin (search_vector)"))
+
+
+def upgrade():
+    bind = op.get_bind()
+    for source, (fts, cols) in SEARCHABLE.items():
+        if bind.dialect.name == 'sqlite':
+            _sqlite_upgrade(bind, source, fts, cols)
+        elif bind.dialect.name == 'postgresql':
+            _postgresql_upgrade(bind, source, cols)
+        # Outros bancos: a busca continua no ILIKE
+
+
+def downgrade():
+    bind = op.get_bind()
+    for source, (fts, cols) in SEARCHABLE.items():
+        if bind.dialect.name == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                bind.execute(sa.text(f"DROP TRIGGER IF EXISTS {fts}_{suffix}"))
+            bind.execute(sa.text(f"DROP TABLE IF EXISTS {fts}"))
+        elif bind.dialect.name == 'postgresql':
+            bind.execute(sa.text(f"DROP INDEX IF EXISTS ix_{source}_search_vector"))
+            bind.execute(sa.text(f"ALTER TABLE {source} DROP COLUMN IF EXISTS search_vector"))
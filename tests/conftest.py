@@ -0,0 +1,36 @@
+# tests/conftest.py
+import os
+
+import flask_migrate
+import pytest
+
+from app import create_app
+from app.extensions import db
+from config import Config
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
+
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    """App com um SQLite novo por módulo, esquema criado pelas migrações (``flask db upgrade``)."""
+    path = tmp_path_factory.mktemp('db') / 'test.db'
+
+    class TestConfig(Config):
+        TESTING = True
+        WTF_CSRF_ENABLED = False
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path.as_posix()}'
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        flask_migrate.upgrade(directory=MIGRATIONS_DIR)
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def ctx(app):
+    with app.app_context():
+        yield
+        db.session.remove()
@@ -0,0 +1,50 @@
+# tests/test_http_cache.py
+"""Revalidação das listagens (``utils.http_cache.conditional``): só pelo ETag."""
+import pytest
+
+from app.extensions import db
+from app.models import Status, User
+
+URL = '/statuses/'
+
+
+@pytest.fixture(scope='module')
+def users(app):
+    with app.app_context():
+        found = [User(full_name=f'Usuário {i}', email=f'cache{i}@example.com', password_hash='x') for i in (1, 2)]
+        # Um status gravado: a tabela da listagem tem data de alteração
+        db.session.add_all(found + [Status(nome='Ativo', codigo='AT')])
+        db.session.commit()
+        return [u.id for u in found]
+
+
+def _client(app, user_id):
+    test_client = app.test_client()
+    with test_client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return test_client
+
+
+def test_same_etag_is_not_modified(app, users):
+    client = _client(app, users[0])
+    first = client.get(URL)
+    assert first.status_code == 200
+    assert first.headers.get('ETag')
+    assert 'Last-Modified' not in first.headers
+    again = client.get(URL, headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_if_modified_since_alone_renders(app, users):
+    # Uma data não capta deploy nem troca de usuário: sem ETag, a página é renderizada
+    client = _client(app, users[0])
+    response = client.get(URL, headers={'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+    assert response.status_code == 200
+
+
+def test_other_user_gets_a_new_page(app, users):
+    etag = _client(app, users[0]).get(URL).headers['ETag']
+    response = _client(app, users[1]).get(URL, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
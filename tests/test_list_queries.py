@@ -0,0 +1,133 @@
+# tests/test_list_queries.py
+"""Comandos SQL e linhas lidas por página de listagem.
+
+Cada registro da listagem aponta para associações próprias (cliente, status,
+usuários... distintos), então um carregamento por linha (N+1) aparece como
+comandos a mais. Medidas com o cache de listas já aquecido: comandos e linhas
+lidas são os mesmos com poucos ou muitos registros, a página tem um teto fixo
+de comandos (a paginação limita o N+1 ao tamanho da página, o teto o pega) e
+as linhas ficam limitadas ao tamanho da página.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
+from app.extensions import db
+from app.models import (STATUS_TARGETS, Activity, CacheVersion, Client, Dealer, Equipment, FunctionalArea,
+                        Position, Project, Stakeholder, Status, User)
+
+PER_PAGE = 10
+
+LIST_URLS = {
+    'inventory': '/equipamentos/',
+    'activities': '/atividades/',
+    'clients': '/clientes/',
+    'dealers': '/concessionarios/',
+    'functional_areas': '/areas_funcionais/',
+    'stakeholders': '/stakeholders/',
+    'projects': '/projetos/',
+    'statuses': '/statuses/',
+    'positions': '/cargos/',
+}
+
+
+def _seed(start, stop):
+    for i in range(start, stop):
+        user = User(full_name=f'Usuário {i}', email=f'user{i}@example.com', password_hash='x')
+        client = Client(tipo='PJ', nome_razao=f'Cliente {i}', endereco='Rua A')
+        dealer = Dealer(razao_social=f'Concessionário {i}', cnpj=f'{i:014d}', endereco='Rua B',
+                        representante_nome='Rep', representante_email=f'rep{i}@example.com',
+                        representante_telefone='0', representante_funcao='Gerente')
+        status = Status(nome=f'Status {i}', codigo=f'ST{i}')
+        status.tipos_cadastro = list(STATUS_TARGETS)
+        project = Project(name=f'Projeto {i}', description='x' * 500, status=status)
+        area = FunctionalArea(name=f'Área {i}')
+        position = Position(name=f'Cargo {i}', functional_area=area)
+        equipment = Equipment(name=f'Equipamento {i}', pn=f'PN{i}', serial_number=f'SN{i}', status=status,
+                              location=client, owner=user, current_responsible=user, project=project)
+        activity = Activity(description=f'Atividade {i}', project=project, start_date=date(2026, 1, 1),
+                            owner_user=user, executor_user=user, environment='REAL', client=client,
+                            dealer=dealer, status=status, equipments=[equipment])
+        stakeholder = Stakeholder(name=f'Stakeholder {i}', tipo='EXTERNO', client=client, position=position)
+        db.session.add_all([user, client, dealer, status, project, area, position, equipment, activity, stakeholder])
+    db.session.commit()
+
+
+@pytest.fixture(scope='module')
+def client(app):
+    with app.app_context():
+        admin = User(full_name='Admin', email='admin@example.com', password_hash='x')
+        db.session.add(admin)
+        db.session.commit()
+        admin_id = admin.id
+    test_client = app.test_client()
+    with test_client.session_transaction() as session:
+        session['_user_id'] = str(admin_id)
+        session['_fresh'] = True
+    return test_client
+
+
+def _measure(app, client, url):
+    """(comandos, linhas lidas, objetos ORM carregados) de um GET já aquecido."""
+    client.get(url).get_data()  # aquece o cache das listas de referência
+    statements, loaded = [], []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    def on_load(target, context):
+        loaded.append(target)
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        event.listen(Mapper, 'load', on_load)
+        try:
+            response = client.get(url)
+            response.get_data()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+            event.remove(Mapper, 'load', on_load)
+        assert response.status_code == 200
+        # Linhas de cada SELECT: o mesmo comando repetido sobre o mesmo estado do banco
+        conn = db.session.connection()
+        rows = sum(len(conn.exec_driver_sql(sql, params).all()) for sql, params in statements
+                   if sql.lstrip().upper().startswith('SELECT'))
+        db.session.remove()
+    return len(statements), rows, len(loaded)
+
+
+@pytest.fixture(scope='module')
+def measurements(app, client):
+    """Medidas de cada listagem com 2×PER_PAGE e com 6×PER_PAGE registros."""
+    result = {}
+    seeded = 0
+    for n in (2 * PER_PAGE, 6 * PER_PAGE):
+        with app.app_context():
+            _seed(seeded, n)
+        seeded = n
+        for name, url in LIST_URLS.items():
+            result[(name, n)] = _measure(app, client, f'{url}?per_page={PER_PAGE}')
+    return result
+
+
+@pytest.mark.parametrize('name', sorted(LIST_URLS))
+def test_statement_count_does_not_grow(measurements, name):
+    small, large = measurements[(name, 2 * PER_PAGE)], measurements[(name, 6 * PER_PAGE)]
+    assert small[0] == large[0], f'{name}: {small[0]} comandos com {2 * PER_PAGE} registros, {large[0]} com {6 * PER_PAGE}'
+    assert small[1] == large[1], f'{name}: {small[1]} linhas com {2 * PER_PAGE} registros, {large[1]} com {6 * PER_PAGE}'
+
+
+@pytest.mark.parametrize('name', sorted(LIST_URLS))
+def test_loaded_rows_are_bounded(app, measurements, name):
+    statements, rows, objects = measurements[(name, 6 * PER_PAGE)]
+    with app.app_context():
+        versions = CacheVersion.query.count()
+    # Usuário logado, contadores de cache_versions, página + 1 (detecção da
+    # próxima) e, no máximo, os tipos de cadastro de cada status da página
+    limit = 1 + versions + (PER_PAGE + 1) * (1 + len(STATUS_TARGETS))
+    assert statements <= 4, f'{name}: {statements} comandos'
+    assert rows <= limit, f'{name}: {rows} linhas (limite {limit})'
+    # Listagens leem colunas (Row), não entidades: só o usuário logado vira objeto do ORM
+    assert objects <= 1, f'{name}: {objects} objetos carregados'
@@ -0,0 +1,58 @@
+# tests/test_password_reset.py
+"""Troca obrigatória de senha: a página pedida é mantida, só se for deste site."""
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from flask import url_for
+
+from app.extensions import db
+from app.models import User
+
+
+@pytest.fixture
+def client(app):
+    with app.app_context():
+        user = User(full_name='Importado', email=f'importado{User.query.count()}@example.com')
+        user.set_password('provisoria')
+        user.must_reset_password = True
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+    test_client = app.test_client()
+    with test_client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return test_client
+
+
+def _location(response):
+    parts = urlsplit(response.headers['Location'])
+    return parts.path, {k: v[0] for k, v in parse_qs(parts.query).items()}
+
+
+def test_forced_reset_keeps_requested_page(client):
+    path, args = _location(client.get('/clientes/?page=2'))
+    assert path == '/reset_password/nova'
+    assert args['next'] == '/clientes/?page=2'
+
+
+def test_forced_reset_on_post_has_no_next(client):
+    path, args = _location(client.post('/clientes/novo'))
+    assert path == '/reset_password/nova'
+    assert 'next' not in args
+
+
+@pytest.mark.parametrize('next_page, expected', [
+    ('/clientes/?page=2', '/clientes/?page=2'),
+    ('https://example.org/', '/'),
+    ('//example.org/', '/'),
+    ('/\\example.org/', '/'),
+])
+def test_reset_returns_to_safe_next(app, client, next_page, expected):
+    response = client.post('/reset_password/nova', query_string={'next': next_page},
+                           data={'password': 'nova-senha', 'confirm_password': 'nova-senha'})
+    path, args = _location(response)
+    # Segue para a 2ª etapa (OIDC), que volta para 'next'
+    with app.test_request_context():
+        assert path == url_for('auth_oidc.login')
+    assert args['next'] == expected
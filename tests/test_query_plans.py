@@ -0,0 +1,115 @@
+# tests/test_query_plans.py
+"""``EXPLAIN QUERY PLAN`` das listagens, do typeahead e das buscas por ``lower()``.
+
+Falha se o SQLite percorrer uma tabela inteira sem índice (``SCAN <tabela>``)
+ou ordenar em uma B-tree temporária (``USE TEMP B-TREE FOR ORDER BY``): a
+página deve sair direto do índice da ordenação, como em produção.
+"""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event, func
+
+from app.extensions import db
+from app.models import Activity, Client, Dealer, Equipment, FunctionalArea, Position, Project, Stakeholder, Status, User
+from app.services import list_rows, typeahead
+from app.services.pagination import _encode, keyset_paginate
+
+# (consulta, ordem, id) como nas rotas de listagem
+LISTS = {
+    'inventory': (list_rows.equipment_rows, lambda: [(Equipment.created_at, True)], lambda: Equipment.id),
+    'activities': (list_rows.activity_rows,
+                   lambda: [(Activity.start_date, True), (Activity.created_at, True)], lambda: Activity.id),
+    'clients': (list_rows.client_rows, lambda: [(Client.created_at, True)], lambda: Client.id),
+    'dealers': (list_rows.dealer_rows, lambda: [(Dealer.created_at, True)], lambda: Dealer.id),
+    'projects': (list_rows.project_rows, lambda: [(Project.name, False)], lambda: Project.id),
+    'statuses': (list_rows.status_rows, lambda: [(Status.created_at, True)], lambda: Status.id),
+    'functional_areas': (list_rows.functional_area_rows, lambda: [(FunctionalArea.name, False)],
+                         lambda: FunctionalArea.id),
+    'positions': (list_rows.position_rows, lambda: [(Position.name, False)], lambda: Position.id),
+    'stakeholders': (list_rows.stakeholder_rows, lambda: [(Stakeholder.created_at, True)], lambda: Stakeholder.id),
+}
+
+
+# Valor de cursor de cada tipo de coluna de ordenação
+_SAMPLE = {int: 1, str: 'm', date: date(2026, 1, 1), datetime: datetime(2026, 1, 1)}
+
+
+def _plan(sql, params):
+    rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}', params).all()
+    return [row[3] for row in rows]
+
+
+def _problems(plan):
+    return [step for step in plan
+            if (step.startswith('SCAN ') and ' USING ' not in step and 'VIRTUAL TABLE' not in step)
+            or (step.startswith('USE TEMP B-TREE FOR') and 'ORDER BY' in step)]
+
+
+def _captured_selects(run):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        run()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    return statements
+
+
+@pytest.mark.parametrize('name', sorted(LISTS))
+@pytest.mark.parametrize('cursor', [None, 'after'])
+def test_list_query_uses_index(app, ctx, name, cursor):
+    query, order, id_column = LISTS[name]
+    # Página seguinte: o filtro (chave) < (cursor) também precisa do índice
+    columns = [c for c, _ in order()] + [id_column()]
+    args = f'?after={_encode([_SAMPLE[c.type.python_type] for c in columns])}' if cursor else ''
+
+    def run():
+        with app.test_request_context(f'/{args}'):
+            keyset_paginate(query(), order(), id_column())
+
+    statements = _captured_selects(run)
+    assert statements
+    if cursor:
+        assert any(' < ' in sql or ' > ' in sql for sql, _ in statements), 'cursor ignorado'
+    for sql, params in statements:
+        plan = _plan(sql, params)
+        assert not _problems(plan), f'{name}: {plan}\n{sql}'
+
+
+@pytest.mark.parametrize('stmt', [
+    lambda: db.session.query(User.id).filter(func.lower(User.email) == 'admin@example.com'),
+    lambda: db.session.query(Project.id).filter(func.lower(Project.name) == 'projeto'),
+], ids=['users.lower(email)', 'projects.lower(name)'])
+def test_lower_lookups_use_expression_index(ctx, stmt):
+    compiled = stmt().statement.compile(db.engine)
+    plan = _plan(str(compiled), tuple(compiled.params.values()))
+    assert not _problems(plan), plan
+    assert any('USING INDEX' in step for step in plan), plan
+
+
+@pytest.mark.parametrize('kind', sorted(typeahead.SOURCES))
+@pytest.mark.parametrize('q', ['', 'ab'], ids=['sem-termo', 'com-termo'])
+@pytest.mark.parametrize('cursor', [None, 'after'])
+def test_typeahead_uses_index(app, ctx, kind, q, cursor):
+    # Todas as fontes ordenam por (nome, id) sem termo; o cursor é (texto, id)
+    args = f'&after={_encode(["m", 1])}' if cursor else ''
+
+    def run():
+        with app.test_request_context(f'/api/busca/{kind}?q={q}{args}'):
+            typeahead.search(kind, q)
+
+    statements = _captured_selects(run)
+    assert statements
+    for sql, params in statements:
+        plan = _plan(sql, params)
+        problems = _problems(plan)
+        if kind == 'equipment' and q:
+            # Com termo, a ordem é a relevância do índice textual: só os resultados do MATCH são ordenados
+            problems = [step for step in problems if not step.startswith('USE TEMP B-TREE')]
+        assert not problems, f'{kind}: {plan}\n{sql}'